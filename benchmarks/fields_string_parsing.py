@@ -0,0 +1,56 @@
+"""
+Benchmark of the X-Fields / _fields string parsing on the deep nested field strings.
+
+Usage: python benchmarks/fields_string_parsing.py [depth] [width]
+"""
+from __future__ import print_function, unicode_literals
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pyston.utils import RFS, FRFS, parse_fields_string  # noqa: E402
+
+
+def get_nested_fields_string(depth, width, prefix='f'):
+    fields = ['{}{}'.format(prefix, i) for i in range(width)]
+    if depth:
+        fields.append('{}_rel({})'.format(prefix, get_nested_fields_string(depth - 1, width, prefix + 'r')))
+        fields.append('{}_path__{}'.format(prefix, '__'.join('{}p{}'.format(prefix, i) for i in range(depth))))
+    return ','.join(fields)
+
+
+def clear_caches():
+    parse_fields_string.cache_clear()
+    FRFS.create_from_string.cache_clear()
+
+
+def run(name, stmt, setup=clear_caches, number=1000):
+    timer = timeit.Timer(stmt, setup=setup)
+    duration = min(timer.repeat(repeat=5, number=number)) / number
+    print('{:<40} {:>10.2f} us'.format(name, duration * 10 ** 6))
+
+
+def main(depth=8, width=5):
+    fields_string = get_nested_fields_string(depth, width)
+    print('fields string length: {}, depth: {}, width: {}'.format(len(fields_string), depth, width))
+
+    def parse_uncached():
+        clear_caches()
+        parse_fields_string(fields_string)
+
+    def rfs_uncached():
+        clear_caches()
+        RFS.create_from_string(fields_string)
+
+    run('parse_fields_string (uncached)', parse_uncached)
+    run('parse_fields_string (cached)', lambda: parse_fields_string(fields_string))
+    run('RFS.create_from_string (uncached)', rfs_uncached)
+    run('RFS.create_from_string (cached parse)', lambda: RFS.create_from_string(fields_string))
+    run('FRFS.create_from_string (cached)', lambda: FRFS.create_from_string(fields_string))
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:3]))
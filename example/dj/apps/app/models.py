@@ -30,6 +30,7 @@ class User(models.Model):
 class Issue(models.Model):
 
     created_at = models.DateTimeField(verbose_name=_('created at'), null=False, blank=False, auto_now_add=True)
+    updated_at = models.DateTimeField(verbose_name=_('updated at'), null=False, blank=False, auto_now=True)
     name = models.CharField(verbose_name=_('name'), max_length=100, null=False, blank=False)
     watched_by = models.ManyToManyField('app.User', verbose_name=_('watched by'), blank=True,
                                         related_name='watched_issues')
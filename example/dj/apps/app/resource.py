@@ -1,5 +1,7 @@
 from __future__ import unicode_literals
 
+from pyston.cache import IdempotencyCache, SerializedObjCache
+from pyston.paginator import CursorPaginator
 from pyston.resource import BaseModelResource, BaseResource
 
 from .models import Issue, User
@@ -14,11 +16,32 @@ class IssueResource(BaseModelResource):
     detailed_fields = ('id', 'created_at', '_obj_name', 'name', ('created_by', ('id', 'contract',)), 'solver',
                        'leader', 'watched_by')
     general_fields = ('id', '_obj_name', 'name', 'created_by', 'watched_by')
+    last_modified_field = 'updated_at'
+    allowed_methods = ('get', 'post', 'put', 'patch', 'delete', 'head', 'options')
+    allow_bulk_create = True
+    allow_bulk_update = True
+    allow_bulk_delete = True
+
+
+class CachedIssueResource(IssueResource):
+
+    register = False
+    serialized_obj_cache = SerializedObjCache('updated_at')
+
+
+class CursorIssueResource(IssueResource):
+
+    register = False
+    paginator = CursorPaginator
 
 
 class UserResource(BaseModelResource):
 
     model = User
+    allowed_methods = ('get', 'post', 'put', 'patch', 'delete', 'head', 'options')
+    allow_bulk_create = True
+    idempotency_cache = IdempotencyCache()
+    options_headers_on_demand = True
 
 
 class ExtraResource(BaseResource):
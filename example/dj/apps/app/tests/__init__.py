@@ -6,3 +6,19 @@ from .cors import *
 from .standard_operations import *
 from .compatibility import *
 from .serializer import *
+from .conditional_requests import *
+from .serialized_obj_cache import *
+from .serialization_memo import *
+from .paginator import *
+from .bulk_operations import *
+from .partial_update import *
+from .form_classes import *
+from .instance_resolution import *
+from .url_files import *
+from .idempotency import *
+from .exports import *
+from .permissions import *
+from .request_cache import *
+from .options_headers import *
+from .head_requests import *
+from .content_negotiation import *
@@ -0,0 +1,212 @@
+from __future__ import unicode_literals
+
+import json
+
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test.client import RequestFactory
+
+from pyston.exception import NotAllowedException
+
+from app.models import Issue, User
+from app.resource import IssueResource, UserResource
+
+from .test_case import PystonTestCase
+
+
+class DeniedUserResource(UserResource):
+
+    register = False
+
+    def has_post_permission(self, obj=None, via=None, **kwargs):
+        return obj is None or not obj.email.startswith('denied')
+
+
+class BulkCreateUserResource(UserResource):
+
+    register = False
+    use_bulk_create = True
+
+    def _can_bulk_create_objs(self):
+        # Database of tests does not return ids from bulk insert, therefore bulk create is forced
+        return True
+
+
+class DeniedDeleteIssueResource(IssueResource):
+
+    register = False
+
+    def has_delete_permission(self, obj=None, via=None, **kwargs):
+        return obj is None or obj.name != 'denied'
+
+
+class BulkQueriesIssueResource(IssueResource):
+
+    register = False
+    use_bulk_update = True
+    use_queryset_delete = True
+
+
+class BulkOperationsTestCase(PystonTestCase):
+
+    def test_create_users_in_bulk(self):
+        users_data = self.get_users_data(flat=True)
+        resp = self.post(self.USER_API_URL, data=self.serialize(users_data))
+        self.assert_valid_JSON_created_response(resp)
+        self.assert_equal(len(self.deserialize(resp)), self.DATA_AMOUNT)
+        self.assert_equal(
+            [user_data['email'] for user_data in self.deserialize(resp)],
+            [user_data['email'] for user_data in users_data]
+        )
+        self.assert_equal(User.objects.count(), self.DATA_AMOUNT)
+
+    def test_create_issues_with_related_objects_in_bulk(self):
+        issues_data = [issue_data for _, issue_data in self.get_issues_data()]
+        resp = self.post(self.ISSUE_API_URL, data=self.serialize(issues_data))
+        self.assert_valid_JSON_created_response(resp)
+        self.assert_equal(Issue.objects.count(), self.DATA_AMOUNT)
+        self.assert_equal(User.objects.count(), 2 * self.DATA_AMOUNT)
+        for issue_data in self.deserialize(resp):
+            self.assert_equal(Issue.objects.get(pk=issue_data['id']).name, issue_data['name'])
+
+    def test_create_users_in_bulk_returns_errors_with_index(self):
+        users_data = self.get_users_data(flat=True)
+        users_data[3] = {}
+        users_data[5] = 'invalid'
+        resp = self.post(self.USER_API_URL, data=self.serialize(users_data))
+        self.assert_http_bad_request(resp)
+        errors = self.deserialize(resp)['messages']['errors']
+        self.assert_equal([error['_index'] for error in errors], [3, 5])
+        self.assert_equal(User.objects.count(), 0)
+
+    def test_create_existing_user_in_bulk_returns_error(self):
+        resp = self.post(self.USER_API_URL, data=self.serialize(self.get_user_data()))
+        users_data = [{'id': self.get_pk(resp), 'email': 'another@test.cz'}, self.get_user_data()]
+        resp = self.post(self.USER_API_URL, data=self.serialize(users_data))
+        self.assert_http_bad_request(resp)
+        self.assert_equal([error['_index'] for error in self.deserialize(resp)['messages']['errors']], [0])
+        self.assert_equal(User.objects.count(), 1)
+
+    def test_create_users_with_duplicate_values_in_bulk_returns_error(self):
+        users_data = self.get_users_data(flat=True)
+        users_data[4]['email'] = users_data[1]['email']
+        resp = self.post(self.USER_API_URL, data=self.serialize(users_data))
+        self.assert_http_bad_request(resp)
+        errors = self.deserialize(resp)['messages']['errors']
+        self.assert_equal([error['_index'] for error in errors], [4])
+        self.assert_in('email', errors[0])
+        self.assert_equal(User.objects.count(), 0)
+
+    def test_create_users_in_bulk_without_permission_returns_forbidden(self):
+        users_data = self.get_users_data(flat=True)
+        users_data[2]['email'] = 'denied@test.cz'
+        request = RequestFactory().post(self.USER_API_URL, data=json.dumps(users_data),
+                                        content_type='application/json', HTTP_ACCEPT='application/json')
+        self.assert_http_forbidden(DeniedUserResource.as_view()(request))
+        self.assert_equal(User.objects.count(), 0)
+
+        with self.assert_raises(NotAllowedException):
+            DeniedUserResource(request)._bulk_create(users_data)
+
+    def test_bulk_create_should_be_enabled_only_explicitly(self):
+        request = RequestFactory().post(self.USER_API_URL)
+        self.assert_false(UserResource(request)._can_bulk_create_objs())
+        BulkCreateResource = type(str('BulkCreateResource'), (UserResource,), {'register': False,
+                                                                              'use_bulk_create': True})
+        self.assert_equal(BulkCreateResource(request)._can_bulk_create_objs(),
+                          getattr(connection.features, 'can_return_ids_from_bulk_insert', False))
+
+    def test_users_should_be_saved_with_bulk_create(self):
+        resource = BulkCreateUserResource(RequestFactory().post(self.USER_API_URL))
+        objs = [User(email=user_data['email']) for user_data in self.get_users_data(flat=True)]
+        with self.assertNumQueries(1):
+            resource._save_objs(objs, [None] * len(objs), False)
+        self.assert_equal(set(User.objects.values_list('email', flat=True)), {obj.email for obj in objs})
+
+    def create_issues(self):
+        resp = self.post(self.ISSUE_API_URL,
+                         data=self.serialize([issue_data for _, issue_data in self.get_issues_data()]))
+        self.assert_valid_JSON_created_response(resp)
+        return [issue_data['id'] for issue_data in self.deserialize(resp)]
+
+    def test_update_issues_in_bulk(self):
+        issue_pks = self.create_issues()
+        resp = self.put(self.ISSUE_API_URL, data=self.serialize([
+            {'id': pk, 'name': 'changed issue %s' % pk} for pk in issue_pks
+        ]))
+        self.assert_valid_JSON_response(resp)
+        self.assert_equal([issue_data['name'] for issue_data in self.deserialize(resp)],
+                          ['changed issue %s' % pk for pk in issue_pks])
+        for issue in Issue.objects.all():
+            self.assert_equal(issue.name, 'changed issue %s' % issue.pk)
+
+    def test_update_issues_in_bulk_returns_errors_with_index(self):
+        issue_pks = self.create_issues()
+        resp = self.put(self.ISSUE_API_URL, data=self.serialize([
+            {'id': issue_pks[0], 'name': 'changed issue'}, {'id': issue_pks[1], 'name': ''}, {'id': 'invalid'},
+            {'name': 'changed issue'}
+        ]))
+        self.assert_http_bad_request(resp)
+        self.assert_equal([error['_index'] for error in self.deserialize(resp)['messages']['errors']], [1, 2, 3])
+        self.assert_false(Issue.objects.filter(name='changed issue').exists())
+
+    def delete_with_data(self, url, data):
+        return self.c.delete(url, data=data, content_type='application/json', HTTP_ACCEPT='application/json')
+
+    def test_delete_issues_in_bulk(self):
+        issue_pks = self.create_issues()
+        resp = self.delete_with_data(self.ISSUE_API_URL, self.serialize(issue_pks[:3] + [{'id': issue_pks[3]}]))
+        self.assert_http_accepted(resp)
+        self.assert_equal(set(Issue.objects.values_list('pk', flat=True)), set(issue_pks[4:]))
+
+    def test_delete_issues_in_bulk_returns_errors_with_index(self):
+        issue_pks = self.create_issues()
+        resp = self.delete_with_data(self.ISSUE_API_URL, self.serialize([issue_pks[0], 0, 'invalid']))
+        self.assert_http_bad_request(resp)
+        self.assert_equal([error['_index'] for error in self.deserialize(resp)['messages']['errors']], [1, 2])
+        self.assert_equal(Issue.objects.count(), self.DATA_AMOUNT)
+
+    def test_delete_issues_in_bulk_without_permission_returns_forbidden(self):
+        issue_pks = self.create_issues()
+        Issue.objects.filter(pk=issue_pks[1]).update(name='denied')
+        request = RequestFactory().delete(self.ISSUE_API_URL, data=json.dumps(issue_pks[:3]),
+                                          content_type='application/json', HTTP_ACCEPT='application/json')
+        self.assert_http_forbidden(DeniedDeleteIssueResource.as_view()(request))
+        self.assert_equal(Issue.objects.count(), self.DATA_AMOUNT)
+
+    def delete_issues_with_recorded_model_delete(self, resource_class, issue_pks):
+        deleted_pks = []
+        model_delete = Issue.delete
+
+        def delete(issue, *args, **kwargs):
+            deleted_pks.append(issue.pk)
+            return model_delete(issue, *args, **kwargs)
+
+        Issue.delete = delete
+        try:
+            resource_class(RequestFactory().delete(self.ISSUE_API_URL))._bulk_delete(issue_pks)
+        finally:
+            Issue.delete = model_delete
+        self.assert_false(Issue.objects.filter(pk__in=issue_pks).exists())
+        return deleted_pks
+
+    def test_issues_should_be_deleted_in_bulk_with_model_delete_by_default(self):
+        issue_pks = self.create_issues()
+        self.assert_equal(self.delete_issues_with_recorded_model_delete(IssueResource, issue_pks[:3]),
+                          issue_pks[:3])
+
+    def test_issues_should_be_deleted_in_bulk_with_queryset_delete_only_explicitly(self):
+        issue_pks = self.create_issues()
+        self.assert_equal(self.delete_issues_with_recorded_model_delete(BulkQueriesIssueResource, issue_pks[:3]), [])
+
+    def test_bulk_update_should_be_used_only_with_django_queryset_bulk_update(self):
+        request = RequestFactory().put(self.ISSUE_API_URL)
+        self.assert_false(IssueResource(request)._can_bulk_update_objs())
+        self.assert_equal(BulkQueriesIssueResource(request)._can_bulk_update_objs(), hasattr(QuerySet, 'bulk_update'))
+
+        Issue.objects.bulk_update = lambda *args, **kwargs: None
+        try:
+            self.assert_equal(BulkQueriesIssueResource(request)._can_bulk_update_objs(),
+                              hasattr(QuerySet, 'bulk_update'))
+        finally:
+            del Issue.objects.bulk_update
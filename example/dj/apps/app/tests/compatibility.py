@@ -1,12 +1,15 @@
 from unittest.case import TestCase
 
+from django.apps.registry import Apps
 from django.core.exceptions import FieldError
+from django.db import models
 
-from germanium.tools import assert_true, assert_false, assert_raises, assert_equal, assert_is_none
+from germanium.tools import assert_true, assert_false, assert_raises, assert_equal, assert_is_none, assert_is
 
 from pyston.utils.compatibility import (
     is_relation, is_one_to_one, is_many_to_many, is_many_to_one, is_reverse_many_to_many, is_reverse_many_to_one,
-    is_reverse_one_to_one, get_model_from_relation, get_model_from_relation_or_none, get_reverse_field_name
+    is_reverse_one_to_one, get_model_from_relation, get_model_from_relation_or_none, get_reverse_field_name,
+    get_model_index, get_concrete_field, FieldDoesNotExist
 )
 
 from app.models import Issue, User
@@ -153,3 +156,33 @@ class CompatibilityTestCase(TestCase):
         assert_equal(get_reverse_field_name(User, 'created_issues'), 'created_by')
         assert_equal(get_reverse_field_name(User, 'solving_issue'), 'solver')
         assert_equal(get_reverse_field_name(User, 'leading_issue'), 'leader')
+
+    def test_model_index(self):
+        model_index = get_model_index(Issue)
+        assert_is(model_index, get_model_index(Issue))
+
+        field_info = model_index.get_field_info('created_by')
+        assert_is(field_info, model_index.get_field_info('created_by'))
+        assert_is(field_info.field, Issue._meta.get_field('created_by'))
+        assert_true(field_info.is_many_to_one)
+        assert_is(field_info.related_model, User)
+        assert_equal(field_info.reverse_field_name, 'created_issues')
+        assert_is_none(model_index.get_field_info('invalid'))
+        assert_false(model_index.get_field_info('name').is_relation)
+
+        assert_is(get_concrete_field(Issue, 'leader'), Issue._meta.get_field('leader'))
+        assert_raises(FieldDoesNotExist, get_concrete_field, Issue, 'watched_by')
+        assert_is(get_model_index(User).get_related_object('solving_issue'), User._meta.get_field('solving_issue'))
+        assert_is_none(get_model_index(User).get_related_object('watched_issues'))
+
+    def test_model_indexes_should_be_cleared_when_new_model_is_prepared(self):
+        model_index = get_model_index(Issue)
+
+        class IndexedModel(models.Model):
+
+            class Meta:
+                app_label = 'app'
+                apps = Apps()
+
+        assert_false(get_model_index(Issue) is model_index)
+        assert_is(get_model_index(Issue), get_model_index(Issue))
@@ -0,0 +1,79 @@
+from __future__ import unicode_literals
+
+from germanium.anotations import data_provider
+
+from app.models import Issue
+
+from .test_case import PystonTestCase
+
+
+class ConditionalRequestsTestCase(PystonTestCase):
+
+    @data_provider('get_issues_data')
+    def test_read_issue_with_etag_returns_not_modified(self, number, data):
+        resp = self.post(self.ISSUE_API_URL, data=self.serialize(data))
+        self.assert_valid_JSON_created_response(resp)
+        pk = self.get_pk(resp)
+
+        resp = self.get('%s%s/' % (self.ISSUE_API_URL, pk))
+        self.assert_valid_JSON_response(resp)
+        self.assert_true(resp.has_header('ETag'))
+        self.assert_true(resp.has_header('Last-Modified'))
+
+        resp = self.get('%s%s/' % (self.ISSUE_API_URL, pk), headers={'HTTP_IF_NONE_MATCH': resp['ETag']})
+        self.assert_equal(resp.status_code, 304)
+        self.assert_equal(resp.content.decode('utf-8'), '')
+        self.assert_true(resp.has_header('ETag'))
+        self.assert_true(resp.has_header('Cache-Control'))
+
+    @data_provider('get_issues_data')
+    def test_read_changed_issue_with_etag_returns_content(self, number, data):
+        resp = self.post(self.ISSUE_API_URL, data=self.serialize(data))
+        pk = self.get_pk(resp)
+        etag = self.get('%s%s/' % (self.ISSUE_API_URL, pk))['ETag']
+
+        resp = self.put('%s%s/' % (self.ISSUE_API_URL, pk), data=self.serialize({'name': 'changed name'}))
+        self.assert_valid_JSON_response(resp)
+
+        resp = self.get('%s%s/' % (self.ISSUE_API_URL, pk), headers={'HTTP_IF_NONE_MATCH': etag})
+        self.assert_valid_JSON_response(resp)
+        self.assert_not_equal(resp['ETag'], etag)
+
+    @data_provider('get_issues_data')
+    def test_read_issues_with_etag_returns_not_modified(self, number, data):
+        resp = self.post(self.ISSUE_API_URL, data=self.serialize(data))
+        self.assert_valid_JSON_created_response(resp)
+
+        resp = self.get(self.ISSUE_API_URL)
+        etag = resp['ETag']
+        resp = self.get(self.ISSUE_API_URL, headers={'HTTP_IF_NONE_MATCH': etag})
+        self.assert_equal(resp.status_code, 304)
+
+        resp = self.get(self.ISSUE_API_URL, headers={'HTTP_IF_NONE_MATCH': etag, 'HTTP_X_FIELDS': 'id'})
+        self.assert_valid_JSON_response(resp)
+
+        Issue.objects.all().delete()
+        resp = self.get(self.ISSUE_API_URL, headers={'HTTP_IF_NONE_MATCH': etag})
+        self.assert_valid_JSON_response(resp)
+
+    @data_provider('get_issues_data')
+    def test_read_issue_with_if_modified_since_returns_not_modified(self, number, data):
+        resp = self.post(self.ISSUE_API_URL, data=self.serialize(data))
+        pk = self.get_pk(resp)
+
+        last_modified = self.get('%s%s/' % (self.ISSUE_API_URL, pk))['Last-Modified']
+        resp = self.get('%s%s/' % (self.ISSUE_API_URL, pk), headers={'HTTP_IF_MODIFIED_SINCE': last_modified})
+        self.assert_equal(resp.status_code, 304)
+
+        resp = self.get('%s%s/' % (self.ISSUE_API_URL, pk),
+                        headers={'HTTP_IF_MODIFIED_SINCE': 'Sat, 29 Oct 1994 19:43:31 GMT'})
+        self.assert_valid_JSON_response(resp)
+
+    @data_provider('get_users_data')
+    def test_resource_without_validators_does_not_return_etag(self, number, data):
+        resp = self.post(self.USER_API_URL, data=self.serialize(data))
+        pk = self.get_pk(resp)
+
+        resp = self.get('%s%s/' % (self.USER_API_URL, pk), headers={'HTTP_IF_NONE_MATCH': '*'})
+        self.assert_valid_JSON_response(resp)
+        self.assert_false(resp.has_header('ETag'))
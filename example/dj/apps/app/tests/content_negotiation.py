@@ -0,0 +1,50 @@
+from __future__ import unicode_literals
+
+from django.test.client import RequestFactory
+
+from germanium.anotations import data_provider
+
+from pyston.converters import (get_converter_name_from_request, get_converter_name_from_mime_types,
+                               get_default_converter_name)
+from pyston.resource import BaseResource
+from pyston.utils import set_rest_context_to_request
+
+from .test_case import PystonTestCase
+
+
+class ContentNegotiationTestCase(PystonTestCase):
+
+    def get_request(self, **headers):
+        request = RequestFactory().get('/', **headers)
+        set_rest_context_to_request(request, BaseResource.DEFAULT_REST_CONTEXT_MAPPING)
+        return request
+
+    def get_accept_data(self):
+        return (
+            ('text/csv', 'csv'),
+            ('text/xml', 'xml'),
+            ('application/json', 'json'),
+            ('text/csv;q=0.5, text/xml', 'xml'),
+            ('*/*', get_default_converter_name()),
+            ('application/unknown', get_default_converter_name()),
+            ('invalid', get_default_converter_name()),
+        )
+
+    @data_provider(get_accept_data)
+    def test_converter_should_be_negotiated_from_accept_header(self, accept, converter_name):
+        self.assert_equal(get_converter_name_from_request(self.get_request(HTTP_ACCEPT=accept)), converter_name)
+
+    def test_converter_without_accept_header_should_be_default(self):
+        self.assert_equal(get_converter_name_from_request(self.get_request()), get_default_converter_name())
+
+    def test_negotiated_converter_should_be_cached(self):
+        request = self.get_request(HTTP_ACCEPT='text/csv', CONTENT_TYPE='text/xml')
+        get_converter_name_from_mime_types.cache_clear()
+        self.assert_equal(get_converter_name_from_request(request), 'csv')
+        self.assert_equal(get_converter_name_from_request(request, True), 'xml')
+        self.assert_equal(get_converter_name_from_request(request), 'csv')
+        self.assert_equal(get_converter_name_from_mime_types.cache_info().misses, 2)
+        self.assert_equal(get_converter_name_from_mime_types.cache_info().hits, 0)
+
+        self.assert_equal(get_converter_name_from_request(self.get_request(HTTP_ACCEPT='text/csv')), 'csv')
+        self.assert_equal(get_converter_name_from_mime_types.cache_info().hits, 1)
@@ -1,3 +1,5 @@
+import warnings
+
 from six.moves.urllib.parse import urlencode
 
 from django.test import TestCase
@@ -9,6 +11,7 @@ from germanium.anotations import data_provider
 from pyston.resource import (ACCESS_CONTROL_ALLOW_ORIGIN, ACCESS_CONTROL_EXPOSE_HEADERS,
                              ACCESS_CONTROL_ALLOW_CREDENTIALS, ACCESS_CONTROL_ALLOW_HEADERS,
                              ACCESS_CONTROL_ALLOW_METHODS, ACCESS_CONTROL_MAX_AGE)
+from pyston.utils import CorsOriginsWhitelist
 
 from .test_case import PystonTestCase
 
@@ -106,11 +109,13 @@ class CorsTestCase(PystonTestCase):
     def test_cors_allow_headers(self, number, data):
         resp = self.options(self.USER_API_URL, headers={'HTTP_ORIGIN': FOO_DOMAIN})
         self.assert_equal(resp[ACCESS_CONTROL_ALLOW_HEADERS],
-                          ', '.join(('X-Base', 'X-Offset', 'X-Fields', 'origin', 'content-type', 'accept')))
+                          ', '.join(('X-Base', 'X-Offset', 'X-Cursor', 'X-Fields', 'X-Total', 'X-Fields-Options',
+                                     'Idempotency-Key', 'origin', 'content-type', 'accept')))
 
         resp = self.options(self.USER_API_URL, headers={'HTTP_ORIGIN': BAR_DOMAIN})
         self.assert_equal(resp[ACCESS_CONTROL_ALLOW_HEADERS],
-                          ', '.join(('X-Base', 'X-Offset', 'X-Fields', 'origin', 'content-type', 'accept')))
+                          ', '.join(('X-Base', 'X-Offset', 'X-Cursor', 'X-Fields', 'X-Total', 'X-Fields-Options',
+                                     'Idempotency-Key', 'origin', 'content-type', 'accept')))
 
         resp = self.options(self.USER_API_URL)
         self.assert_false(ACCESS_CONTROL_ALLOW_HEADERS in resp)
@@ -120,7 +125,8 @@ class CorsTestCase(PystonTestCase):
     def test_cors_allow_exposed_headers(self, number, data):
         resp = self.options(self.USER_API_URL)
         self.assert_equal(resp[ACCESS_CONTROL_EXPOSE_HEADERS],
-                          ', '.join(('X-Total', 'X-Serialization-Format-Options', 'X-Fields-Options')))
+                          ', '.join(('X-Total', 'X-Total-Approximate', 'X-Next-Cursor', 'X-Prev-Cursor',
+                                     'X-Serialization-Format-Options', 'X-Fields-Options', 'Idempotent-Replayed')))
 
     @override_settings(PYSTON_CORS=True, PYSTON_CORS_ALLOW_CREDENTIALS=False)
     @data_provider('get_users_data')
@@ -141,3 +147,54 @@ class CorsTestCase(PystonTestCase):
 
         resp = self.options(self.USER_API_URL)
         self.assert_false(ACCESS_CONTROL_ALLOW_METHODS in resp)
+
+    @override_settings(PYSTON_CORS=True, PYSTON_CORS_WHITELIST=[FOO_DOMAIN[7:], r'http://\w+\.pyston\.org'])
+    def test_cors_preflight_should_be_returned_without_database_queries(self):
+        headers = {'HTTP_ORIGIN': FOO_DOMAIN, 'HTTP_ACCESS_CONTROL_REQUEST_METHOD': 'PUT'}
+        with self.assertNumQueries(0):
+            resp = self.options('{}1/'.format(self.USER_API_URL), headers=headers)
+        self.assert_http_ok(resp)
+        self.assert_equal(resp.content, b'')
+        self.assert_equal(resp[ACCESS_CONTROL_ALLOW_ORIGIN], FOO_DOMAIN)
+        self.assert_equal(resp[ACCESS_CONTROL_ALLOW_METHODS], 'PUT')
+        self.assert_true(resp.has_header(ACCESS_CONTROL_ALLOW_HEADERS))
+        self.assert_true(resp.has_header(ACCESS_CONTROL_EXPOSE_HEADERS))
+        self.assert_true(resp.has_header(ACCESS_CONTROL_MAX_AGE))
+        self.assert_false(resp.has_header('Allow'))
+
+        resp = self.options(self.USER_API_URL, headers={'HTTP_ORIGIN': 'http://foo.pyston.org',
+                                                        'HTTP_ACCESS_CONTROL_REQUEST_METHOD': 'POST'})
+        self.assert_equal(resp[ACCESS_CONTROL_ALLOW_ORIGIN], 'http://foo.pyston.org')
+
+        resp = self.options(self.USER_API_URL, headers={'HTTP_ORIGIN': 'http://foo.pyston.com',
+                                                        'HTTP_ACCESS_CONTROL_REQUEST_METHOD': 'POST'})
+        self.assert_false(resp.has_header(ACCESS_CONTROL_ALLOW_ORIGIN))
+
+    def test_invalid_cors_whitelist_pattern_should_be_used_only_as_host(self):
+        with warnings.catch_warnings(record=True) as caught_warnings:
+            warnings.simplefilter('always')
+            whitelist = CorsOriginsWhitelist(('*.pyston.net', FOO_DOMAIN[7:], r'http://\w+\.pyston\.org'))
+        self.assert_equal(len(caught_warnings), 1)
+        self.assert_equal(len(whitelist.patterns), 2)
+        self.assert_true(whitelist.is_allowed(FOO_DOMAIN))
+        self.assert_true(whitelist.is_allowed('http://foo.pyston.org'))
+        self.assert_false(whitelist.is_allowed(BAR_DOMAIN))
+
+    @override_settings(PYSTON_CORS=True, PYSTON_CORS_WHITELIST=['*.pyston.net', FOO_DOMAIN[7:]])
+    def test_cors_with_invalid_whitelist_pattern_should_not_fail(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            resp = self.options(self.USER_API_URL, headers={'HTTP_ORIGIN': FOO_DOMAIN,
+                                                            'HTTP_ACCESS_CONTROL_REQUEST_METHOD': 'POST'})
+            self.assert_equal(resp[ACCESS_CONTROL_ALLOW_ORIGIN], FOO_DOMAIN)
+            resp = self.get(self.USER_API_URL, headers={'HTTP_ORIGIN': BAR_DOMAIN})
+            self.assert_http_ok(resp)
+            self.assert_false(resp.has_header(ACCESS_CONTROL_ALLOW_ORIGIN))
+
+    @override_settings(PYSTON_CORS=True)
+    def test_cors_preflight_headers_should_be_recomputed_after_settings_change(self):
+        headers = {'HTTP_ORIGIN': FOO_DOMAIN, 'HTTP_ACCESS_CONTROL_REQUEST_METHOD': 'GET'}
+        with override_settings(PYSTON_CORS_MAX_AGE=10):
+            self.assert_equal(self.options(self.USER_API_URL, headers=headers)[ACCESS_CONTROL_MAX_AGE], '10')
+        with override_settings(PYSTON_CORS_MAX_AGE=20):
+            self.assert_equal(self.options(self.USER_API_URL, headers=headers)[ACCESS_CONTROL_MAX_AGE], '20')
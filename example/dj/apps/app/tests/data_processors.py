@@ -3,17 +3,24 @@ from __future__ import unicode_literals
 
 import base64
 import os
+import textwrap
 
 from django.conf import settings
+from django.test.client import RequestFactory
 from django.test.utils import override_settings
 
 from germanium.anotations import data_provider
 
 import responses
 
+from pyston.data_processor import (data_preprocessors, data_postprocessors, ModelDataPreprocessor,
+                                   ReverseMultipleDataPreprocessor)
+from pyston.resource import BaseModelResource
+
 from .test_case import PystonTestCase
 
 from app.models import User, Issue
+from app.resource import IssueResource, UserResource
 
 
 class DataProcessorsTestCase(PystonTestCase):
@@ -62,6 +69,45 @@ class DataProcessorsTestCase(PystonTestCase):
         resp = self.post(self.USER_API_URL, data=self.serialize(data))
         self.assert_http_bad_request(resp)
 
+    @override_settings(PYSTON_FILE_MAX_MEMORY_SIZE=10)
+    @data_provider('get_users_data')
+    def test_create_user_with_file_stored_with_accurate_size(self, number, data):
+        content = ('Contract of %s code: šří+áýšé' % data['email']).encode('utf-8') * 1000
+        data['contract'] = {
+            'filename': 'contract.txt',
+            'content': '\n'.join(textwrap.wrap(base64.b64encode(content).decode('utf-8'), 76))
+        }
+        resp = self.post(self.USER_API_URL, data=self.serialize(data))
+        self.assert_valid_JSON_created_response(resp)
+        contract = User.objects.get(pk=self.get_pk(resp)).contract
+        self.assert_equal(contract.size, len(content))
+        self.assert_equal(contract.read(), content)
+
+    @override_settings(PYSTON_FILE_SIZE_LIMIT=100)
+    @data_provider('get_users_data')
+    def test_create_user_with_file_too_large(self, number, data):
+        data['contract'] = {
+            'filename': 'contract.txt',
+            'content': base64.b64encode(b'a' * 101).decode('utf-8')
+        }
+        resp = self.post(self.USER_API_URL, data=self.serialize(data))
+        self.assert_http_bad_request(resp)
+        self.assert_in('contract', self.deserialize(resp).get('messages', {}).get('errors', {}))
+
+        data['contract']['content'] = base64.b64encode(b'a' * 100).decode('utf-8')
+        resp = self.post(self.USER_API_URL, data=self.serialize(data))
+        self.assert_valid_JSON_created_response(resp)
+
+    @data_provider('get_users_data')
+    def test_create_user_with_invalid_base64_file_content(self, number, data):
+        data['contract'] = {
+            'filename': 'contract.txt',
+            'content': 'abcde'
+        }
+        resp = self.post(self.USER_API_URL, data=self.serialize(data))
+        self.assert_http_bad_request(resp)
+        self.assert_in('contract', self.deserialize(resp).get('messages', {}).get('errors', {}))
+
     def serve_file(self, rsps, url, body, status=200):
         rsps.add(responses.GET, url, body=body, status=status, match_querystring=True)
 
@@ -154,6 +200,82 @@ class DataProcessorsTestCase(PystonTestCase):
         self.assert_valid_JSON_response(resp)
         self.assert_equal(issues_before_count, Issue.objects.all().count())
 
+    @data_provider('get_issues_and_users_data')
+    def test_atomic_set_updates_creates_and_deletes_issues_with_reverse(self, number, issue_data, user_data):
+        user_data['created_issues'] = {'add': (self.get_issue_data(), self.get_issue_data(), self.get_issue_data())}
+        resp = self.post(self.USER_API_URL, data=self.serialize(user_data))
+        self.assert_valid_JSON_created_response(resp)
+        user_pk = self.get_pk(resp)
+        issue_pks = list(Issue.objects.filter(created_by=user_pk).order_by('pk').values_list('pk', flat=True))
+
+        user_data['created_issues'] = {'set': (
+            {'id': issue_pks[0], 'name': 'updated issue 1'}, {'id': issue_pks[1], 'name': 'updated issue 2'},
+            self.get_issue_data()
+        )}
+        resp = self.put('%s%s/' % (self.USER_API_URL, user_pk), data=self.serialize(user_data))
+        self.assert_valid_JSON_response(resp)
+        self.assert_equal(
+            list(Issue.objects.filter(created_by=user_pk).order_by('pk').values_list('name', flat=True))[:2],
+            ['updated issue 1', 'updated issue 2']
+        )
+        self.assert_equal(Issue.objects.filter(created_by=user_pk).count(), 3)
+        self.assert_false(Issue.objects.filter(pk=issue_pks[2]).exists())
+
+    @data_provider('get_issues_and_users_data')
+    def test_nested_writes_should_be_batched_only_if_resource_enables_it(self, number, issue_data, user_data):
+        called_methods = []
+
+        def bulk_create_or_update(resource, *args, **kwargs):
+            called_methods.append('_bulk_create_or_update')
+            return BaseModelResource._bulk_create_or_update(resource, *args, **kwargs)
+
+        def bulk_delete(resource, *args, **kwargs):
+            called_methods.append('_bulk_delete')
+            return BaseModelResource._bulk_delete(resource, *args, **kwargs)
+
+        IssueResource._bulk_create_or_update = bulk_create_or_update
+        IssueResource._bulk_delete = bulk_delete
+        try:
+            user_data['created_issues'] = {'add': (self.get_issue_data(), self.get_issue_data())}
+            resp = self.post(self.USER_API_URL, data=self.serialize(user_data))
+            self.assert_valid_JSON_created_response(resp)
+            user_pk = self.get_pk(resp)
+            issue_pks = list(Issue.objects.filter(created_by=user_pk).order_by('pk').values_list('pk', flat=True))
+
+            user_data['created_issues'] = {'set': ({'id': issue_pks[0], 'name': 'updated issue'},
+                                                   self.get_issue_data())}
+            resp = self.put('%s%s/' % (self.USER_API_URL, user_pk), data=self.serialize(user_data))
+            self.assert_valid_JSON_response(resp)
+            self.assert_equal(called_methods, [])
+
+            IssueResource.batch_nested_writes = True
+            user_data['created_issues'] = {'set': ({'id': issue_pks[0], 'name': 'batched issue'},
+                                                   self.get_issue_data())}
+            resp = self.put('%s%s/' % (self.USER_API_URL, user_pk), data=self.serialize(user_data))
+            self.assert_valid_JSON_response(resp)
+            self.assert_equal(called_methods, ['_bulk_create_or_update', '_bulk_delete'])
+        finally:
+            del IssueResource._bulk_create_or_update
+            del IssueResource._bulk_delete
+            IssueResource.batch_nested_writes = False
+
+        self.assert_equal(Issue.objects.get(pk=issue_pks[0]).name, 'batched issue')
+        self.assert_equal(Issue.objects.filter(created_by=user_pk).count(), 2)
+        self.assert_false(Issue.objects.filter(pk=issue_pks[1]).exists())
+
+    @data_provider('get_issues_and_users_data')
+    def test_atomic_set_issues_with_reverse_returns_errors_with_index(self, number, issue_data, user_data):
+        invalid_issue_data = self.get_issue_data()
+        invalid_issue_data['name'] = ''
+        user_data['created_issues'] = {'set': (
+            self.get_issue_data(), invalid_issue_data, self.get_issue_data(), {'name': 'issue without leader'}
+        )}
+        resp = self.post(self.USER_API_URL, data=self.serialize(user_data))
+        self.assert_http_bad_request(resp)
+        errors = self.deserialize(resp)['messages']['errors']['created_issues']['set']
+        self.assert_equal([error['_index'] for error in errors], [1, 3])
+        self.assert_equal(Issue.objects.count(), 0)
+
     @data_provider('get_issues_and_users_data')
     def test_atomic_add_delete_and_set_issues_with_errors(self, number, issue_data, user_data):
         user_data['created_issues'] = {'set': (None, "", None, {}, [None])}
@@ -277,4 +399,21 @@ class DataProcessorsTestCase(PystonTestCase):
         user_data['leading_issue'] = 'bad data'
         resp = self.post(self.USER_API_URL, data=self.serialize(user_data))
         self.assert_http_bad_request(resp)
-        self.assert_in('leading_issue', self.deserialize(resp).get('messages', {}).get('errors'))
\ No newline at end of file
+        self.assert_in('leading_issue', self.deserialize(resp).get('messages', {}).get('errors'))
+
+    def test_data_processors_are_selected_according_to_data_fields(self):
+        resource = IssueResource(RequestFactory().post('/'))
+        form = resource._get_form()
+        self.assert_equal(
+            data_preprocessors.get_data_processors(
+                resource, form, {'name': 'issue', 'created_by': {'email': 'a@b.cz'}}
+            ),
+            [(ModelDataPreprocessor, {'created_by'})]
+        )
+        self.assert_equal(data_postprocessors.get_data_processors(resource, form, {'name': 'issue'}), [])
+
+        resource = UserResource(RequestFactory().post('/'))
+        self.assert_equal(
+            data_postprocessors.get_data_processors(resource, resource._get_form(), {'watched_issues': []}),
+            [(ReverseMultipleDataPreprocessor, {'watched_issues'})]
+        )
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import pickle
+
+from django.test.client import RequestFactory
+from django.utils import translation
+from django.utils.encoding import force_text
+
+from germanium.anotations import data_provider
+
+from pyston.utils.datastructures import Field, FieldsetGenerator
+
+from app.resource import IssueResource
+
+from .test_case import PystonTestCase
+
+
+class ExportsTestCase(PystonTestCase):
+
+    def get_fieldset_generator(self, fields_string):
+        return FieldsetGenerator(IssueResource(RequestFactory().get(self.ISSUE_API_URL)), fields_string)
+
+    def test_fieldset_generator_labels(self):
+        with translation.override('en'):
+            fields = self.get_fieldset_generator(
+                'name,created_by(email,created_issues),watched_by__email,_obj_name'
+            ).generate()
+        self.assert_equal([field.key_path for field in fields], [
+            ('name',), ('created_by', 'email'), ('created_by', 'created_issues'), ('watched_by', 'email'),
+            ('_obj_name',)
+        ])
+        self.assert_equal(list(map(str, fields)), [
+            'Name', 'Created by email', 'Created by issues', 'Watched by email', ''
+        ])
+
+    def test_fieldset_generator_should_be_cached_per_language(self):
+        fields_string = 'name,created_by__email'
+        with translation.override('en'):
+            fields = self.get_fieldset_generator(fields_string).generate()
+            cached_fields = self.get_fieldset_generator(fields_string).generate()
+        self.assert_equal(fields, cached_fields)
+        for field, cached_field in zip(fields, cached_fields):
+            self.assert_true(field is cached_field)
+
+        with translation.override('cs'):
+            other_language_fields = self.get_fieldset_generator(fields_string).generate()
+        self.assert_equal(force_text(fields[0]), 'Name')
+        self.assert_equal(force_text(other_language_fields[0]), 'Název')
+
+    def test_field_is_value_type(self):
+        field = Field(['created_by', 'email'], ['created by', 'email'])
+        self.assert_equal(force_text(field), 'Created by email')
+        self.assert_equal(field, Field(('created_by', 'email'), ('created by', 'email')))
+        self.assert_equal(hash(field), hash(Field(('created_by', 'email'), ('created by', 'email'))))
+        self.assert_equal(hash(field), hash('Created by email'))
+        self.assert_true(field == 'Created by email')
+        self.assert_true(Field([], []) in [''])
+        self.assert_not_equal(field, Field(('name',), ('name',)))
+        with self.assert_raises(AttributeError):
+            field.other = 'value'
+        with self.assert_raises(AttributeError):
+            field.key_path = ('name',)
+        with self.assert_raises(AttributeError):
+            field._str = 'Name'
+        self.assert_equal(pickle.loads(pickle.dumps(field, pickle.HIGHEST_PROTOCOL)).key_path, field.key_path)
+
+    @data_provider('get_issues_data')
+    def test_repeated_csv_export_should_render_same_headers(self, number, data):
+        self.post(self.ISSUE_API_URL, data=self.serialize(data))
+        headers = {'HTTP_ACCEPT': 'text/csv', 'HTTP_X_FIELDS': 'name,created_by__email'}
+        resp = self.get(self.ISSUE_API_URL, headers=headers)
+        self.assert_equal(resp.status_code, 200)
+        self.assert_equal(resp.content, self.get(self.ISSUE_API_URL, headers=headers).content)
+        self.assert_true(resp.content.decode('utf-8').startswith('\ufeff"Název";"Created by email"'))
@@ -1,8 +1,10 @@
+import pickle
+
 from unittest.case import TestCase
 
-from germanium.tools import assert_true, assert_false, assert_equal, assert_is_none
+from germanium.tools import assert_true, assert_false, assert_equal, assert_is_none, assert_is, assert_raises
 
-from pyston.utils import rfs
+from pyston.utils import rfs, frfs, FRFS, RFS, parse_fields_string, LRUCache
 
 
 class FieldsetsTestCase(TestCase):
@@ -75,3 +77,77 @@ class FieldsetsTestCase(TestCase):
         fieldset_b = rfs(('a__i', 'b', 'l'))
 
         assert_equal(str(fieldset_a.intersection(fieldset_b)), 'a(i),b')
+
+    def test_frfs_should_be_interned(self):
+        fieldset = frfs(('a', 'b', 'b__c', 'b__g', ('d', ('e__f',))))
+        assert_equal(str(fieldset), 'a,b(c,g),d(e(f))')
+        assert_is(fieldset, rfs(('a', 'b', 'b__c', 'b__g', ('d', ('e__f',)))).freeze())
+        assert_is(fieldset, FRFS.create_from_string('a,b(c,g),d__e__f'))
+        assert_is(fieldset.get('b').subfieldset, frfs(('c', 'g')))
+        assert_is(pickle.loads(pickle.dumps(fieldset)), fieldset)
+        assert_equal(hash(fieldset), hash(frfs(['a', 'b', 'b__c', 'b__g', ['d', ['e__f']]])))
+
+    def test_frfs_should_be_pickled_with_all_protocols(self):
+        fieldset = frfs(('a', 'b__c'))
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            assert_is(pickle.loads(pickle.dumps(fieldset, protocol)), fieldset)
+
+    def test_frfs_intern_cache_should_evict_least_recently_used_fieldsets(self):
+        fields_a, fields_b, fields_c = frfs(('a',)).fields, frfs(('b',)).fields, frfs(('c',)).fields
+        interned = FRFS._interned
+        FRFS._interned = LRUCache(2)
+        try:
+            fieldset = FRFS.intern(fields_a)
+            FRFS.intern(fields_b)
+            assert_is(FRFS.intern(fields_a), fieldset)
+            FRFS.intern(fields_c)
+            assert_equal(len(FRFS._interned), 2)
+            assert_false(fields_b in FRFS._interned)
+            assert_is(FRFS.intern(fieldset.fields), fieldset)
+        finally:
+            FRFS._interned = interned
+
+    def test_frfs_should_be_immutable(self):
+        fieldset = frfs(('a', 'b__c'))
+        with assert_raises(AttributeError):
+            fieldset.fields = ()
+        with assert_raises(AttributeError):
+            fieldset.get('b').name = 'c'
+        with assert_raises(AttributeError):
+            fieldset.append('d')
+
+    def test_frfs_operations(self):
+        fieldset_a = frfs((('a', ('i', 'j')), 'b', 'b__c', 'b__g', ('d', ('e__f',))))
+        fieldset_b = frfs(('a__i', 'b', 'l'))
+
+        assert_equal(str(fieldset_a.intersection(fieldset_b)), 'a(i),b')
+        assert_equal(str(fieldset_a.join(fieldset_b)), 'a(i,j),b(c,g),d(e(f)),l')
+        assert_equal(str(fieldset_a + ('a__k', 'm')), 'a(i,j,k),b(c,g),d(e(f)),m')
+        assert_equal(str(fieldset_a.subtract(('a', 'd'))), 'b(c,g)')
+        assert_equal(str(fieldset_a), 'a(i,j),b(c,g),d(e(f))')
+        assert_equal(fieldset_a.flat(), {'a', 'b', 'd'})
+        assert_is(fieldset_a.join(fieldset_b), fieldset_a.join(fieldset_b))
+        assert_is(fieldset_a.intersection(fieldset_b), frfs(('a__i', 'b')))
+        assert_true(fieldset_a)
+        assert_false(frfs())
+
+    def test_rfs_should_be_compatible_with_frfs(self):
+        frozen_fieldset = frfs(('a__i', 'l'))
+        fieldset = rfs(('a', 'b', 'b__c'))
+        fieldset.join(frozen_fieldset)
+        assert_equal(str(fieldset), 'a(i),b(c),l')
+
+        fieldset = rfs(frozen_fieldset)
+        fieldset.append('a__j')
+        assert_equal(str(fieldset), 'a(i,j),l')
+        assert_equal(str(frozen_fieldset), 'a(i),l')
+        assert_is(fieldset.freeze(), frfs(('a__i', 'a__j', 'l')))
+
+    def test_parse_fields_string(self):
+        assert_equal(parse_fields_string('a, b(c,g__h),d__e__f'), (
+            ('a', None), ('b', (('c', None), ('g', (('h', None),)))), ('d', (('e', (('f', None),)),))
+        ))
+        assert_equal(parse_fields_string(' , '), ())
+        assert_is(parse_fields_string('a,b(c)'), parse_fields_string('a,b(c)'))
+        assert_equal(str(RFS.create_from_string('a,b(c,g),d__e__f,a__i')), 'a(i),b(c,g),d(e(f))')
+        assert_equal(str(RFS.create_from_string('a(b),c)')), 'a(b),c)')
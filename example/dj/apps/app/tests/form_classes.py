@@ -0,0 +1,55 @@
+from __future__ import unicode_literals
+
+from django.test.client import RequestFactory
+
+from app.models import User
+from app.resource import UserResource
+
+from pyston.resource import generated_form_classes
+
+from .factories import UserFactory
+from .test_case import PystonTestCase
+
+
+class ObjDependentExcludeUserResource(UserResource):
+
+    register = False
+
+    def _get_exclude(self, obj=None):
+        return ('email',) if obj else ()
+
+
+class FormClassesTestCase(PystonTestCase):
+
+    def test_generated_form_class_is_cached(self):
+        resource = UserResource(RequestFactory().post('/'))
+        form_class = resource._generate_form_class(None)
+        self.assert_equal(form_class._meta.model, User)
+        self.assert_true(resource._generate_form_class(UserFactory()) is form_class)
+        self.assert_true(UserResource(RequestFactory().post('/'))._generate_form_class(None) is form_class)
+        self.assert_false(resource._generate_form_class(None, exclude=['email']) is form_class)
+
+    def test_generated_form_class_is_cached_according_to_obj_dependent_exclude(self):
+        resource = ObjDependentExcludeUserResource(RequestFactory().post('/'))
+        form_class = resource._generate_form_class(None)
+        self.assert_in('email', form_class.base_fields)
+        obj_form_class = resource._generate_form_class(UserFactory())
+        self.assert_not_in('email', obj_form_class.base_fields)
+        self.assert_true(resource._generate_form_class(UserFactory()) is obj_form_class)
+        self.assert_false(UserResource(RequestFactory().post('/'))._generate_form_class(None) is form_class)
+
+    def test_generated_form_classes_cache_should_be_bounded(self):
+        max_size = generated_form_classes.max_size
+        generated_form_classes.max_size = 2
+        try:
+            resource = UserResource(RequestFactory().post('/'))
+            form_class = resource._generate_form_class(None)
+            resource._generate_form_class(None, exclude=['email'])
+            self.assert_true(resource._generate_form_class(None) is form_class)
+            resource._generate_form_class(None, exclude=['first_name'])
+            self.assert_equal(len(generated_form_classes), 2)
+            self.assert_true(resource._generate_form_class(None) is form_class)
+            self.assert_false(resource._generate_form_class(None, exclude=['email']) is form_class)
+            self.assert_equal(len(generated_form_classes), 2)
+        finally:
+            generated_form_classes.max_size = max_size
@@ -0,0 +1,43 @@
+from __future__ import unicode_literals
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from germanium.anotations import data_provider
+
+from .test_case import PystonTestCase
+
+
+class HeadRequestsTestCase(PystonTestCase):
+
+    def get_page_queries(self, captured_queries):
+        return [
+            query for query in captured_queries
+            if query['sql'].startswith('SELECT "app_issue"."id"') and 'COUNT' not in query['sql']
+        ]
+
+    @data_provider('get_issues_data')
+    def test_head_list_should_return_get_headers_without_loading_page(self, number, data):
+        self.post(self.ISSUE_API_URL, data=self.serialize(data))
+        get_resp = self.get(self.ISSUE_API_URL)
+        with CaptureQueriesContext(connection) as captured_queries:
+            resp = self.head(self.ISSUE_API_URL)
+        self.assert_http_ok(resp)
+        self.assert_equal(resp.content, b'')
+        for header in ('X-Total', 'ETag', 'Last-Modified', 'Content-Type'):
+            self.assert_equal(resp[header], get_resp[header])
+        self.assert_equal(self.get_page_queries(captured_queries), [])
+
+    @data_provider('get_issues_data')
+    def test_head_detail_should_return_get_headers(self, number, data):
+        pk = self.get_pk(self.post(self.ISSUE_API_URL, data=self.serialize(data)))
+        url = '{}{}/'.format(self.ISSUE_API_URL, pk)
+        get_resp = self.get(url)
+        resp = self.head(url)
+        self.assert_http_ok(resp)
+        self.assert_equal(resp.content, b'')
+        self.assert_equal(resp['ETag'], get_resp['ETag'])
+        self.assert_equal(resp['Content-Type'], get_resp['Content-Type'])
+
+        self.assert_equal(self.head(url, headers={'HTTP_IF_NONE_MATCH': resp['ETag']}).status_code, 304)
+        self.assert_http_not_found(self.head('{}{}/'.format(self.ISSUE_API_URL, pk + 1000)))
@@ -0,0 +1,152 @@
+from __future__ import unicode_literals
+
+import json
+import threading
+import uuid
+
+from importlib import import_module
+
+from django.conf import settings
+from django.http.response import HttpResponse
+from django.test.client import RequestFactory
+
+from germanium.anotations import data_provider
+
+from pyston.resource import BaseModelResource
+
+from app.models import User
+from app.resource import IssueResource, UserResource
+
+from .test_case import PystonTestCase
+
+
+class IdempotencyTestCase(PystonTestCase):
+
+    def setUp(self):
+        super(IdempotencyTestCase, self).setUp()
+        # Idempotency keys of anonymous requests are scoped by the session
+        self.session = self.create_session()
+        self.c.cookies[settings.SESSION_COOKIE_NAME] = self.session.session_key
+
+    def create_session(self):
+        # Empty session cookie is removed by the session middleware
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session['visited'] = True
+        session.save()
+        return session
+
+    def get_idempotency_headers(self):
+        return {'HTTP_IDEMPOTENCY_KEY': uuid.uuid4().hex}
+
+    def get_cache_key(self, headers):
+        request = RequestFactory().post(self.USER_API_URL)
+        request.session = self.session
+        return UserResource.idempotency_cache.get_key(request, headers['HTTP_IDEMPOTENCY_KEY'])
+
+    def test_idempotency_should_be_enabled_only_explicitly(self):
+        self.assert_is_none(BaseModelResource.idempotency_cache)
+        self.assert_is_none(IssueResource.idempotency_cache)
+        self.assert_is_not_none(UserResource.idempotency_cache)
+
+    @data_provider('get_users_data')
+    def test_anonymous_post_without_session_should_not_be_replayed(self, number, data):
+        self.c.cookies.pop(settings.SESSION_COOKIE_NAME, None)
+        headers = self.get_idempotency_headers()
+        self.assert_is_none(
+            UserResource.idempotency_cache.get_key(RequestFactory().post(self.USER_API_URL),
+                                                   headers['HTTP_IDEMPOTENCY_KEY'])
+        )
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        self.assert_valid_JSON_created_response(resp)
+
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        self.assert_http_bad_request(resp)
+        self.assert_false(resp.has_header('Idempotent-Replayed'))
+
+    @data_provider('get_users_data')
+    def test_idempotency_key_should_be_scoped_by_session(self, number, data):
+        headers = self.get_idempotency_headers()
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        self.assert_valid_JSON_created_response(resp)
+
+        self.c.cookies[settings.SESSION_COOKIE_NAME] = self.create_session().session_key
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        self.assert_http_bad_request(resp)
+        self.assert_false(resp.has_header('Idempotent-Replayed'))
+
+    @data_provider('get_users_data')
+    def test_repeated_post_with_idempotency_key_should_be_replayed(self, number, data):
+        headers = self.get_idempotency_headers()
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        self.assert_valid_JSON_created_response(resp)
+        self.assert_false(resp.has_header('Idempotent-Replayed'))
+
+        replayed_resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        self.assert_valid_JSON_created_response(replayed_resp)
+        self.assert_equal(replayed_resp['Idempotent-Replayed'], 'true')
+        self.assert_equal(replayed_resp.content, resp.content)
+        self.assert_equal(User.objects.filter(email=data['email']).count(), 1)
+
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=self.get_idempotency_headers())
+        self.assert_http_bad_request(resp)
+
+    @data_provider('get_users_data')
+    def test_repeated_invalid_post_with_idempotency_key_should_be_replayed(self, number, data):
+        headers = self.get_idempotency_headers()
+        data['email'] = 'invalid'
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        self.assert_http_bad_request(resp)
+
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        self.assert_http_bad_request(resp)
+        self.assert_equal(resp['Idempotent-Replayed'], 'true')
+
+    @data_provider('get_users_data')
+    def test_idempotency_key_reused_with_different_data_should_return_conflict(self, number, data):
+        headers = self.get_idempotency_headers()
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        self.assert_valid_JSON_created_response(resp)
+
+        data['email'] = 'other_{}'.format(data['email'])
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        self.assert_equal(resp.status_code, 409)
+        self.assert_false(User.objects.filter(email=data['email']).exists())
+
+    @data_provider('get_users_data')
+    def test_concurrent_post_with_idempotency_key_should_wait_for_response(self, number, data):
+        headers = self.get_idempotency_headers()
+        key = self.get_cache_key(headers)
+        idempotency_cache = UserResource.idempotency_cache
+        self.assert_true(idempotency_cache.acquire(key))
+
+        response = HttpResponse(json.dumps({'id': 1}), status=201, content_type='application/json')
+
+        def finish_request():
+            request = RequestFactory().post(self.USER_API_URL, data=self.serialize(data),
+                                            content_type='application/json')
+            idempotency_cache.store_response(key, idempotency_cache.get_fingerprint(request), response)
+            idempotency_cache.release(key)
+
+        timer = threading.Timer(0.1, finish_request)
+        timer.start()
+        resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+        timer.join()
+        self.assert_valid_JSON_created_response(resp)
+        self.assert_equal(resp['Idempotent-Replayed'], 'true')
+        self.assert_false(User.objects.filter(email=data['email']).exists())
+
+    @data_provider('get_users_data')
+    def test_concurrent_post_with_idempotency_key_should_return_conflict_after_timeout(self, number, data):
+        headers = self.get_idempotency_headers()
+        key = self.get_cache_key(headers)
+        idempotency_cache = UserResource.idempotency_cache
+        self.assert_true(idempotency_cache.acquire(key))
+        wait_timeout = idempotency_cache.wait_timeout
+        idempotency_cache.wait_timeout = 0.1
+        try:
+            resp = self.post(self.USER_API_URL, data=self.serialize(data), headers=headers)
+            self.assert_equal(resp.status_code, 409)
+        finally:
+            idempotency_cache.wait_timeout = wait_timeout
+            idempotency_cache.release(key)
+        self.assert_false(User.objects.filter(email=data['email']).exists())
@@ -0,0 +1,53 @@
+from __future__ import unicode_literals
+
+from django.db import connection
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from pyston.exception import ConflictException
+
+from app.resource import IssueResource
+
+from .factories import IssueFactory
+from .test_case import PystonTestCase
+
+
+class VisibleIssueResource(IssueResource):
+
+    register = False
+
+    def _get_queryset(self):
+        return super(VisibleIssueResource, self)._get_queryset().filter(name__startswith='visible')
+
+
+class InstanceResolutionTestCase(PystonTestCase):
+
+    def test_instance_should_be_loaded_from_resource_queryset(self):
+        visible_issue = IssueFactory(name='visible issue')
+        hidden_issue = IssueFactory(name='hidden issue')
+
+        for resource in (IssueResource(RequestFactory().put('/')), VisibleIssueResource(RequestFactory().put('/'))):
+            with CaptureQueriesContext(connection) as queries:
+                self.assert_equal(resource._get_instance({'id': str(visible_issue.pk)}), visible_issue)
+                self.assert_is_none(resource._get_instance({'id': 'invalid'}))
+            self.assert_equal(len(queries.captured_queries), 1)
+            self.assert_not_in('CASE', queries.captured_queries[0]['sql'])
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assert_is_none(IssueResource(RequestFactory().put('/'))._get_instance({'id': hidden_issue.pk + 100}))
+        self.assert_equal(len(queries.captured_queries), 1)
+
+        self.assert_equal(IssueResource(RequestFactory().put('/'))._get_instance({'id': hidden_issue.pk}),
+                          hidden_issue)
+
+    def test_not_visible_existing_instance_should_raise_conflict(self):
+        hidden_issue = IssueFactory(name='hidden issue')
+        resource = VisibleIssueResource(RequestFactory().put('/'))
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.assert_raises(ConflictException):
+                resource._get_instance({'id': hidden_issue.pk})
+            self.assert_is_none(resource._get_instance({'id': hidden_issue.pk + 100}))
+        # Existence of the object is checked only if it is not in the resource queryset
+        self.assert_equal(len(queries.captured_queries), 4)
+        self.assert_true(all('CASE' not in query['sql'] for query in queries.captured_queries))
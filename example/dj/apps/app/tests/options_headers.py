@@ -0,0 +1,53 @@
+from __future__ import unicode_literals
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from germanium.anotations import data_provider
+
+from pyston.resource import BaseResource
+
+from app.resource import IssueResource
+
+from .test_case import PystonTestCase
+
+
+class OptionsHeadersTestCase(PystonTestCase):
+
+    @data_provider('get_users_data')
+    def test_options_headers_should_not_be_returned_by_default(self, number, data):
+        pk = self.get_pk(self.post(self.USER_API_URL, data=self.serialize(data)))
+        with CaptureQueriesContext(connection) as captured_queries:
+            resp = self.get('{}{}/'.format(self.USER_API_URL, pk))
+        self.assert_valid_JSON_response(resp)
+        self.assert_false(resp.has_header('Allow'))
+        self.assert_false(resp.has_header('X-Fields-Options'))
+        self.assert_equal(
+            len([query for query in captured_queries if 'FROM "app_user"' in query['sql']]), 1
+        )
+
+    @data_provider('get_users_data')
+    def test_options_headers_should_be_returned_when_requested(self, number, data):
+        pk = self.get_pk(self.post(self.USER_API_URL, data=self.serialize(data)))
+        for resp in (self.get('{}{}/'.format(self.USER_API_URL, pk), headers={'HTTP_X_FIELDS_OPTIONS': '1'}),
+                     self.get('{}{}/?_fields_options=1'.format(self.USER_API_URL, pk)),
+                     self.options('{}{}/'.format(self.USER_API_URL, pk))):
+            self.assert_equal(set(resp['Allow'].split(',')), {'PUT', 'PATCH', 'HEAD', 'GET', 'OPTIONS', 'DELETE'})
+            self.assert_in('email', resp['X-Fields-Options'].split(','))
+
+    @data_provider('get_users_data')
+    def test_allow_header_should_be_returned_for_not_allowed_method(self, number, data):
+        pk = self.get_pk(self.post(self.USER_API_URL, data=self.serialize(data)))
+        resp = self.post('{}{}/'.format(self.USER_API_URL, pk), data=self.serialize(data))
+        self.assert_http_method_not_allowed(resp)
+        self.assert_equal(set(resp['Allow'].split(',')), {'PUT', 'PATCH', 'HEAD', 'GET', 'OPTIONS', 'DELETE'})
+        self.assert_false(resp.has_header('X-Fields-Options'))
+
+    @data_provider('get_issues_data')
+    def test_options_headers_should_be_always_returned_if_not_on_demand(self, number, data):
+        self.assert_false(BaseResource.options_headers_on_demand)
+        self.assert_false(IssueResource.options_headers_on_demand)
+        pk = self.get_pk(self.post(self.ISSUE_API_URL, data=self.serialize(data)))
+        resp = self.get('{}{}/'.format(self.ISSUE_API_URL, pk))
+        self.assert_true(resp.has_header('Allow'))
+        self.assert_true(resp.has_header('X-Fields-Options'))
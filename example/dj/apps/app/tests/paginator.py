@@ -0,0 +1,194 @@
+from __future__ import unicode_literals
+
+import base64
+import json
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.query import QuerySet
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from pyston.exception import RESTException
+from pyston.paginator import Paginator, CursorPaginator
+
+from app.models import Issue
+
+from .factories import IssueFactory
+from .test_case import PystonTestCase
+
+
+class CachedTotalPaginator(Paginator):
+
+    total_cache_timeout = 60
+
+
+class ApproximateTotalPaginator(Paginator):
+
+    approximate_total_threshold = 2
+
+
+class OnDemandTotalPaginator(Paginator):
+
+    total_on_demand = True
+
+
+class SmallPagesCursorPaginator(CursorPaginator):
+
+    default_base = 4
+    max_base = 6
+
+
+class PaginatorTestCase(PystonTestCase):
+
+    def setUp(self):
+        super(PaginatorTestCase, self).setUp()
+        cache.clear()
+        for _ in range(self.DATA_AMOUNT):
+            IssueFactory()
+
+    def get_request(self, **rest_context):
+        request = RequestFactory().get('/')
+        request._rest_context = rest_context
+        return request
+
+    def test_cached_total_is_counted_once_per_filter(self):
+        request = self.get_request()
+        self.assert_equal(CachedTotalPaginator(Issue.objects.all(), request).total, self.DATA_AMOUNT)
+
+        IssueFactory()
+        with CaptureQueriesContext(connection) as queries:
+            paginator = CachedTotalPaginator(Issue.objects.order_by('-pk'), request)
+        self.assert_equal(paginator.total, self.DATA_AMOUNT)
+        self.assert_equal(len(queries.captured_queries), 0)
+
+        paginator = CachedTotalPaginator(Issue.objects.filter(name__startswith=''), request)
+        self.assert_equal(paginator.total, self.DATA_AMOUNT + 1)
+
+    def test_cached_total_of_empty_queryset_is_zero(self):
+        request = self.get_request()
+        for qs in (Issue.objects.none(), Issue.objects.filter(pk__in=[])):
+            with CaptureQueriesContext(connection) as queries:
+                paginator = CachedTotalPaginator(qs, request)
+            self.assert_equal(paginator.total, 0)
+            self.assert_false(paginator.total_approximate)
+            self.assert_equal(len(queries.captured_queries), 0)
+
+    def test_total_above_threshold_is_approximate(self):
+        paginator = ApproximateTotalPaginator(Issue.objects.all(), self.get_request())
+        self.assert_true(paginator.total > ApproximateTotalPaginator.approximate_total_threshold)
+        self.assert_true(paginator.total_approximate)
+        self.assert_equal(paginator.headers['X-Total-Approximate'], 'true')
+
+        paginator = ApproximateTotalPaginator(Issue.objects.all()[:2], self.get_request())
+        self.assert_equal(paginator.total, 2)
+        self.assert_false(paginator.total_approximate)
+        self.assert_not_in('X-Total-Approximate', paginator.headers)
+
+    def test_total_is_counted_only_on_demand(self):
+        with CaptureQueriesContext(connection) as queries:
+            paginator = OnDemandTotalPaginator(Issue.objects.all(), self.get_request())
+        self.assert_is_none(paginator.total)
+        self.assert_equal(paginator.headers, {})
+        self.assert_equal(len(queries.captured_queries), 0)
+
+        paginator = OnDemandTotalPaginator(Issue.objects.all(), self.get_request(total='1'))
+        self.assert_equal(paginator.headers, {'X-Total': self.DATA_AMOUNT})
+
+    def get_cursor_pages(self, qs, cursor_header='X-Next-Cursor', **rest_context):
+        pages = []
+        paginator = CursorPaginator(qs, self.get_request(base='3', **rest_context))
+        pages.append([obj.pk for obj in paginator.page_qs])
+        while cursor_header in paginator.headers:
+            paginator = CursorPaginator(qs, self.get_request(base='3', cursor=paginator.headers[cursor_header]))
+            pages.append([obj.pk for obj in paginator.page_qs])
+        return pages
+
+    def test_cursor_paginator_returns_all_objects_in_queryset_order(self):
+        Issue.objects.filter(pk__in=Issue.objects.order_by('pk').values('pk')[:5]).update(name='same name')
+        qs = Issue.objects.order_by('name', '-created_at')
+
+        pages = self.get_cursor_pages(qs)
+        self.assert_equal([len(page) for page in pages], [3, 3, 3, 1])
+        self.assert_equal(sum(pages, []), list(qs.values_list('pk', flat=True)))
+
+    def test_cursor_paginator_returns_previous_pages(self):
+        qs = Issue.objects.order_by('-pk')
+        paginator = CursorPaginator(qs, self.get_request(base='3'))
+        self.assert_not_in('X-Prev-Cursor', paginator.headers)
+        while 'X-Next-Cursor' in paginator.headers:
+            paginator = CursorPaginator(qs, self.get_request(base='3', cursor=paginator.headers['X-Next-Cursor']))
+
+        pages = self.get_cursor_pages(qs, 'X-Prev-Cursor', cursor=paginator.headers['X-Prev-Cursor'])
+        self.assert_equal(sum(reversed(pages), []), list(qs.values_list('pk', flat=True))[:-1])
+
+    def test_cursor_paginator_rejects_invalid_cursor(self):
+        with self.assert_raises(RESTException):
+            CursorPaginator(Issue.objects.all(), self.get_request(cursor='invalid'))
+
+    def test_cursor_paginator_rejects_ordering_by_related_fields(self):
+        with self.assert_raises(RESTException):
+            CursorPaginator(Issue.objects.order_by('created_by__email'), self.get_request())
+
+    def test_cursor_paginator_rejects_ordering_by_nullable_fields(self):
+        with self.assert_raises(RESTException):
+            CursorPaginator(Issue.objects.order_by('description'), self.get_request())
+
+    def test_cursor_paginator_rejects_cursor_with_null_value(self):
+        cursor = base64.urlsafe_b64encode(json.dumps({'v': [None, 1], 'r': False}).encode('utf-8')).decode('ascii')
+        with self.assert_raises(RESTException):
+            CursorPaginator(Issue.objects.order_by('name'), self.get_request(cursor=cursor))
+
+    def test_cursor_paginator_page_is_lazy_queryset(self):
+        paginator = CursorPaginator(Issue.objects.order_by('pk'), self.get_request(base='3'))
+        self.assert_true(isinstance(paginator.page_qs, QuerySet))
+
+    def test_cursor_paginator_page_size_is_limited(self):
+        qs = Issue.objects.order_by('pk')
+        self.assert_equal(len(SmallPagesCursorPaginator(qs, self.get_request()).page_qs), 4)
+        self.assert_equal(len(SmallPagesCursorPaginator(qs, self.get_request(base='100')).page_qs), 6)
+
+    def test_cursor_paginator_page_is_selected_with_keyset_filter_and_slice(self):
+        qs = Issue.objects.order_by('pk')
+        paginator = CursorPaginator(qs, self.get_request(base='3'))
+        paginator = CursorPaginator(qs, self.get_request(base='3', cursor=paginator.headers['X-Next-Cursor']))
+        for page_qs in (paginator.page_qs,
+                        CursorPaginator(qs, self.get_request(base='3',
+                                                             cursor=paginator.headers['X-Prev-Cursor'])).page_qs):
+            with CaptureQueriesContext(connection) as captured_queries:
+                list(page_qs)
+            self.assert_equal(len(captured_queries), 1)
+            self.assert_in('LIMIT 3', captured_queries[0]['sql'])
+            self.assert_not_in(' IN (', captured_queries[0]['sql'])
+
+    def get_cursor_resource_pages(self, cursor_header='X-Next-Cursor', **headers):
+        pages = []
+        headers['HTTP_X_BASE'] = '3'
+        while True:
+            resp = self.get(self.CURSOR_ISSUE_API_URL, headers=headers)
+            self.assert_valid_JSON_response(resp)
+            pages.append([issue['id'] for issue in self.deserialize(resp)])
+            if not resp.has_header(cursor_header):
+                return pages, resp
+            headers['HTTP_X_CURSOR'] = resp[cursor_header]
+
+    def test_cursor_resource_returns_pages_with_cursors(self):
+        pages, resp = self.get_cursor_resource_pages()
+        self.assert_equal([len(page) for page in pages], [3, 3, 3, 1])
+        self.assert_equal(sum(pages, []), list(Issue.objects.order_by('pk').values_list('pk', flat=True)))
+        self.assert_true(resp.has_header('X-Prev-Cursor'))
+
+        prev_pages, _ = self.get_cursor_resource_pages('X-Prev-Cursor', HTTP_X_CURSOR=resp['X-Prev-Cursor'])
+        self.assert_equal(sum(reversed(prev_pages), []), sum(pages[:-1], []))
+
+    def test_cursor_resource_returns_bad_request_for_invalid_cursor(self):
+        self.assert_http_bad_request(self.get(self.CURSOR_ISSUE_API_URL, headers={'HTTP_X_CURSOR': 'invalid'}))
+
+    def test_cursor_resource_head_loads_only_ordering_fields(self):
+        with CaptureQueriesContext(connection) as captured_queries:
+            resp = self.head(self.CURSOR_ISSUE_API_URL, headers={'HTTP_X_BASE': '3'})
+        self.assert_http_ok(resp)
+        self.assert_true(resp.has_header('X-Next-Cursor'))
+        self.assert_equal(
+            [query['sql'] for query in captured_queries if '"app_issue"."name"' in query['sql']], []
+        )
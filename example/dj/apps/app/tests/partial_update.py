@@ -0,0 +1,84 @@
+from __future__ import unicode_literals
+
+from django.db import connection
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from germanium.anotations import data_provider
+
+from pyston.resource import BaseModelResource
+
+from app.models import Issue, User
+
+from .test_case import PystonTestCase
+
+
+class NotPatchableUserResource(BaseModelResource):
+
+    register = False
+    model = User
+
+
+class PartialUpdateTestCase(PystonTestCase):
+
+    @data_provider('get_issues_data')
+    def test_patch_issue_updates_only_sent_fields(self, number, data):
+        resp = self.post(self.ISSUE_API_URL, data=self.serialize(data))
+        pk = self.get_pk(resp)
+        issue = Issue.objects.get(pk=pk)
+
+        resp = self.patch('%s%s/' % (self.ISSUE_API_URL, pk), data=self.serialize({'description': 'new description'}))
+        self.assert_valid_JSON_response(resp)
+
+        patched_issue = Issue.objects.get(pk=pk)
+        self.assert_equal(patched_issue.description, 'new description')
+        self.assert_equal(patched_issue.name, issue.name)
+        self.assert_equal(patched_issue.created_by_id, issue.created_by_id)
+        self.assert_true(patched_issue.updated_at > issue.updated_at)
+
+    @data_provider('get_users_data')
+    def test_patch_user_saves_only_changed_fields(self, number, data):
+        resp = self.post(self.USER_API_URL, data=self.serialize(data))
+        pk = self.get_pk(resp)
+
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.patch('%s%s/' % (self.USER_API_URL, pk), data=self.serialize({'first_name': 'John'}))
+        self.assert_valid_JSON_response(resp)
+        self.assert_equal(User.objects.get(pk=pk).first_name, 'John')
+
+        sql_list = [query['sql'] for query in queries.captured_queries]
+        # Uniqueness of not changed email is not validated and only changed column is saved
+        self.assert_false(any('"email" =' in sql for sql in sql_list))
+        update_sql_list = [sql for sql in sql_list if sql.startswith('UPDATE')]
+        self.assert_equal(len(update_sql_list), 1)
+        self.assert_not_in('"email"', update_sql_list[0])
+
+    @data_provider('get_users_data')
+    def test_patch_user_validates_changed_unique_field(self, number, data):
+        resp = self.post(self.USER_API_URL, data=self.serialize(data))
+        pk = self.get_pk(resp)
+        another_user_email = self.get_user_data()['email']
+        self.post(self.USER_API_URL, data=self.serialize({'email': another_user_email}))
+
+        resp = self.patch('%s%s/' % (self.USER_API_URL, pk), data=self.serialize({'email': another_user_email}))
+        self.assert_http_bad_request(resp)
+        self.assert_in('email', self.deserialize(resp)['messages']['errors'])
+
+        resp = self.patch('%s%s/' % (self.USER_API_URL, pk), data=self.serialize({'email': 'invalid'}))
+        self.assert_http_bad_request(resp)
+
+    def test_patch_not_existing_user_returns_not_found(self):
+        resp = self.patch('%s%s/' % (self.USER_API_URL, 1), data=self.serialize({'first_name': 'John'}))
+        self.assert_http_not_found(resp)
+
+    @data_provider('get_users_data')
+    def test_patch_should_be_allowed_only_for_resources_which_opt_in(self, number, data):
+        user = User.objects.create(**data)
+        self.assert_not_in('patch', BaseModelResource.allowed_methods)
+        resp = NotPatchableUserResource.as_view()(
+            RequestFactory().patch('%s%s/' % (self.USER_API_URL, user.pk), data=self.serialize({'first_name': 'John'}),
+                                   content_type='application/json'),
+            pk=user.pk
+        )
+        self.assert_http_method_not_allowed(resp)
+        self.assert_not_equal(User.objects.get(pk=user.pk).first_name, 'John')
@@ -0,0 +1,67 @@
+from __future__ import unicode_literals
+
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from pyston.exception import NotAllowedException
+from pyston.resource import BaseResource
+
+from app.resource import IssueResource
+
+from .test_case import PystonTestCase
+
+
+class ArchiveResource(BaseResource):
+
+    allowed_methods = ('get', 'head', 'options')
+
+    def get(self):
+        return {}
+
+    def has_archive_permission(self, obj=None, **kwargs):
+        return obj == 'allowed'
+
+    def _check_options_permission(self, **kwargs):
+        return 'explicit'
+
+
+class PermissionsTestCase(PystonTestCase):
+
+    def get_resource(self, resource_class):
+        return resource_class(RequestFactory().get('/'))
+
+    def test_permission_methods_should_be_generated_for_allowed_methods(self):
+        for method in IssueResource.allowed_methods:
+            self.assert_in('_check_{}_permission'.format(method), IssueResource.__dict__)
+            self.assert_in('can_call_{}'.format(method), IssueResource.__dict__)
+
+    def test_permission_methods_should_be_generated_for_implemented_has_permission_methods(self):
+        resource = self.get_resource(ArchiveResource)
+        self.assert_in('_check_archive_permission', ArchiveResource.__dict__)
+        self.assert_true(resource.can_call_archive(obj='allowed'))
+        self.assert_false(resource.can_call_archive(obj='denied'))
+        resource._check_archive_permission(obj='allowed')
+        with self.assert_raises(NotAllowedException):
+            resource._check_archive_permission(obj='denied')
+
+    def test_explicit_permission_methods_should_not_be_overridden(self):
+        self.assert_equal(self.get_resource(ArchiveResource)._check_options_permission(), 'explicit')
+
+    def test_permission_methods_should_check_allowed_methods(self):
+        resource = self.get_resource(ArchiveResource)
+        self.assert_true(resource.can_call_get())
+        self.assert_false(resource.can_call_post())
+        resource._check_get_permission()
+        with self.assert_raises(NotAllowedException):
+            resource._check_post_permission()
+
+    def test_missing_permission_methods_should_be_generated_lazily(self):
+        resource = self.get_resource(ArchiveResource)
+        self.assert_not_in('can_call_export', ArchiveResource.__dict__)
+        with override_settings(DEBUG=True):
+            with self.assert_raises(NotImplementedError):
+                resource.can_call_export()
+        self.assert_false(resource.can_call_export())
+        self.assert_in('can_call_export', ArchiveResource.__dict__)
+        with self.assert_raises(AttributeError):
+            resource.unknown_method
@@ -0,0 +1,60 @@
+from __future__ import unicode_literals
+
+from django.db import connection
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from germanium.anotations import data_provider
+
+from app.models import User
+from app.resource import UserResource
+
+from .test_case import PystonTestCase
+
+
+class RequestCacheTestCase(PystonTestCase):
+
+    def get_resource(self, pk):
+        resource = UserResource(RequestFactory().get(self.USER_API_URL))
+        resource.kwargs = {'pk': pk}
+        return resource
+
+    @data_provider('get_users_data')
+    def test_obj_should_be_loaded_once_per_request(self, number, data):
+        pk = self.get_pk(self.post(self.USER_API_URL, data=self.serialize(data)))
+        with CaptureQueriesContext(connection) as captured_queries:
+            resp = self.get('{}{}/'.format(self.USER_API_URL, pk))
+        self.assert_valid_JSON_response(resp)
+        self.assert_equal(
+            len([query for query in captured_queries if 'FROM "app_user"' in query['sql']]), 1
+        )
+
+    @data_provider('get_users_data')
+    def test_obj_and_allowed_values_should_be_memoized_on_resource(self, number, data):
+        user = User.objects.create(**data)
+        resource = self.get_resource(user.pk)
+        obj = resource._get_request_obj_or_none()
+        self.assert_equal(obj, user)
+        self.assert_true(resource._get_obj_or_404() is obj)
+        self.assert_true(resource._get_request_allowed_methods() is resource._get_request_allowed_methods())
+        self.assert_true(resource._get_request_allowed_fields_rfs() is resource._get_request_allowed_fields_rfs())
+
+        resource._clear_request_cache()
+        self.assert_false(resource._get_request_obj_or_none() is obj)
+
+    @data_provider('get_users_data')
+    def test_request_cache_should_be_invalidated_after_delete(self, number, data):
+        user = User.objects.create(**data)
+        resource = self.get_resource(user.pk)
+        self.assert_equal(resource._get_request_obj_or_none(), user)
+        resource._delete(user.pk)
+        self.assert_is_none(resource._get_request_obj_or_none())
+
+    @data_provider('get_users_data')
+    def test_allow_header_should_be_returned_after_update(self, number, data):
+        pk = self.get_pk(self.post(self.USER_API_URL, data=self.serialize(data)))
+        resp = self.put('{}{}/'.format(self.USER_API_URL, pk), data=self.serialize({'email': 'updated@test.cz'}),
+                        headers={'HTTP_X_FIELDS_OPTIONS': '1'})
+        self.assert_valid_JSON_response(resp)
+        self.assert_equal(set(resp['Allow'].split(',')), {'GET', 'PUT', 'PATCH', 'DELETE', 'HEAD', 'OPTIONS'})
+        self.assert_equal(self.deserialize(resp)['email'], 'updated@test.cz')
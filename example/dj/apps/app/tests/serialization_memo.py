@@ -0,0 +1,53 @@
+from __future__ import unicode_literals
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .factories import IssueFactory, UserFactory
+from .test_case import PystonTestCase
+
+
+class SerializationMemoTestCase(PystonTestCase):
+
+    def get_issues_queries_count(self, offset):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.get(self.ISSUE_API_URL, headers={
+                'HTTP_X_FIELDS': 'id,created_by(id,watched_issues(id))', 'HTTP_X_OFFSET': offset
+            })
+        self.assert_valid_JSON_response(resp)
+        return len(queries.captured_queries), self.deserialize(resp)
+
+    def test_repeated_related_object_is_serialized_once_per_request(self):
+        user = UserFactory()
+        watched_issues = [IssueFactory(), IssueFactory()]
+        user.watched_issues.add(*watched_issues)
+
+        IssueFactory(created_by=user)
+        offset = str(len(watched_issues))
+        single_issue_queries_count, _ = self.get_issues_queries_count(offset)
+
+        for _ in range(self.DATA_AMOUNT):
+            IssueFactory(created_by=user)
+        queries_count, resp_data = self.get_issues_queries_count(offset)
+
+        # Every issue loads its creator, but watched issues of the creator are loaded only once
+        self.assert_equal(queries_count, single_issue_queries_count + self.DATA_AMOUNT)
+        self.assert_equal(len(resp_data), self.DATA_AMOUNT + 1)
+        for issue_data in resp_data:
+            self.assert_equal(issue_data['created_by'], {
+                'id': user.pk, 'watched_issues': [{'id': issue.pk} for issue in watched_issues]
+            })
+
+    def test_related_object_serialization_depends_on_serialization_chain(self):
+        user = UserFactory()
+        issues = [IssueFactory(created_by=user) for _ in range(self.DATA_AMOUNT)]
+        user.watched_issues.add(*issues)
+
+        resp = self.get(self.ISSUE_API_URL, headers={'HTTP_X_FIELDS': 'id,created_by(id,watched_issues(id,name))'})
+        self.assert_valid_JSON_response(resp)
+        for issue_data in self.deserialize(resp):
+            # Issue which is already serialized in the chain is returned only with primary key
+            self.assert_equal(issue_data['created_by']['watched_issues'], [
+                {'id': issue.pk} if issue.pk == issue_data['id'] else {'id': issue.pk, 'name': issue.name}
+                for issue in issues
+            ])
@@ -0,0 +1,58 @@
+from __future__ import unicode_literals
+
+from django.core.cache import cache
+
+from app.models import Issue, User
+
+from .factories import IssueFactory
+from .test_case import PystonTestCase
+
+
+class SerializedObjCacheTestCase(PystonTestCase):
+
+    def setUp(self):
+        super(SerializedObjCacheTestCase, self).setUp()
+        cache.clear()
+
+    def test_issues_are_read_from_fragment_cache_until_version_is_changed(self):
+        issues = [IssueFactory() for _ in range(self.DATA_AMOUNT)]
+
+        resp = self.get(self.CACHED_ISSUE_API_URL)
+        self.assert_valid_JSON_response(resp)
+        self.assert_equal(self.deserialize(resp), self.deserialize(self.get(self.ISSUE_API_URL)))
+
+        # Related objects are not versioned by the issue, therefore cached fragment is still returned
+        User.objects.filter(pk=issues[0].created_by.pk).update(email='changed@test.cz')
+        resp_data = {
+            issue_data['id']: issue_data for issue_data in self.deserialize(self.get(self.CACHED_ISSUE_API_URL))
+        }
+        self.assert_not_equal(resp_data[issues[0].pk]['created_by']['email'], 'changed@test.cz')
+
+        Issue.objects.get(pk=issues[0].pk).save()
+        resp_data = {
+            issue_data['id']: issue_data for issue_data in self.deserialize(self.get(self.CACHED_ISSUE_API_URL))
+        }
+        self.assert_equal(resp_data[issues[0].pk]['created_by']['email'], 'changed@test.cz')
+
+    def test_fragment_cache_key_depends_on_requested_fields(self):
+        issue = IssueFactory()
+
+        resp = self.get('%s%s/' % (self.CACHED_ISSUE_API_URL, issue.pk))
+        self.assert_equal(self.deserialize(resp)['name'], issue.name)
+
+        resp = self.get('%s%s/' % (self.CACHED_ISSUE_API_URL, issue.pk), headers={'HTTP_X_FIELDS': 'id'})
+        self.assert_equal(set(self.deserialize(resp).keys()), {'id'})
+
+        resp = self.get('%s%s/' % (self.CACHED_ISSUE_API_URL, issue.pk),
+                        headers={'HTTP_X_SERIALIZATION_FORMAT': 'VERBOSE'})
+        self.assert_valid_JSON_response(resp)
+
+    def test_fragment_cache_key_depends_on_requested_related_fields(self):
+        issue = IssueFactory()
+
+        resp = self.get('%s%s/' % (self.CACHED_ISSUE_API_URL, issue.pk), headers={'HTTP_X_FIELDS': 'created_by'})
+        self.assert_not_equal(set(self.deserialize(resp)['created_by'].keys()), {'email'})
+
+        resp = self.get('%s%s/' % (self.CACHED_ISSUE_API_URL, issue.pk),
+                        headers={'HTTP_X_FIELDS': 'created_by(email)'})
+        self.assert_equal(set(self.deserialize(resp)['created_by'].keys()), {'email'})
@@ -4,6 +4,8 @@ from germanium.rest import RESTTestCase
 class PystonTestCase(RESTTestCase):
     USER_API_URL = '/api/user/'
     ISSUE_API_URL = '/api/issue/'
+    CACHED_ISSUE_API_URL = '/api/cached-issue/'
+    CURSOR_ISSUE_API_URL = '/api/cursor-issue/'
     EXTRA_API_URL = '/api/extra/'
     COUNT_ISSUES_PER_USER = '/api/count-issues-per-user/'
     COUNT_WATCHERS_PER_ISSUE = '/api/count-watchers-per-issue/'
@@ -0,0 +1,176 @@
+from __future__ import unicode_literals
+
+import threading
+import time
+
+from six.moves import socketserver
+from six.moves.BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+from django.test.client import RequestFactory
+from django.test.utils import override_settings
+
+from pyston.utils import files
+from pyston.utils.files import (get_files_content_from_urls, get_url_file_items, host_connection_limit,
+                                RequestDataTooBig)
+
+from app.models import User
+from app.resource import UserResource
+
+from .test_case import PystonTestCase
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+
+class FileRequestHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requested_paths.append(self.path)
+            server.active_requests += 1
+            server.max_active_requests = max(server.max_active_requests, server.active_requests)
+        try:
+            time.sleep(server.delay)
+            content = ('content of %s' % self.path).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        finally:
+            with server.lock:
+                server.active_requests -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+class URLFilesTestCase(PystonTestCase):
+
+    def setUp(self):
+        super(URLFilesTestCase, self).setUp()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), FileRequestHandler)
+        self.server.lock = threading.Lock()
+        self.server.requested_paths = []
+        self.server.active_requests = 0
+        self.server.max_active_requests = 0
+        self.server.delay = 0
+        threading.Thread(target=self.server.serve_forever).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super(URLFilesTestCase, self).tearDown()
+
+    def get_url(self, path):
+        return 'http://127.0.0.1:{}/{}'.format(self.server.server_address[1], path)
+
+    def get_user_data_with_contract(self, email, path):
+        return {'email': email, 'contract': {'filename': 'contract.txt', 'url': self.get_url(path)}}
+
+    def test_url_file_items_should_be_found_only_in_file_fields(self):
+        data = [
+            {'email': 'a@test.cz', 'contract': {'filename': 'a.txt', 'url': 'http://foo.bar/a.txt'}},
+            {'issue': {'created_by': {'contract': {'filename': 'b.txt', 'url': 'http://foo.bar/b.txt'}}}},
+            {'contract': {'filename': 'c.txt', 'content': 'YWJj', 'url': 'http://foo.bar/c.txt'}},
+            {'email': {'filename': 'd.txt', 'url': 'http://foo.bar/d.txt'}},
+        ]
+        self.assert_equal(get_url_file_items(data, ('contract',)), ['http://foo.bar/a.txt'])
+        self.assert_equal(get_url_file_items(data), ['http://foo.bar/a.txt', 'http://foo.bar/d.txt'])
+
+    def test_only_files_of_resource_form_file_fields_should_be_prefetched(self):
+        resource = UserResource(RequestFactory().post(self.USER_API_URL))
+        resource._prefetch_url_files({
+            'email': 'user@test.cz', 'contract': {'filename': 'contract.txt', 'url': self.get_url('contract.txt')},
+            'unknown': {'filename': 'unknown.txt', 'url': self.get_url('unknown.txt')}
+        })
+        self.assert_equal(list(resource.request._prefetched_url_files.keys()), [self.get_url('contract.txt')])
+        self.assert_equal(self.server.requested_paths, ['/contract.txt'])
+
+        file_content, _ = resource.request._prefetched_url_files[self.get_url('contract.txt')]
+        resource._close_prefetched_url_files()
+        self.assert_true(file_content.closed)
+        self.assert_equal(resource.request._prefetched_url_files, {})
+
+    def test_files_of_object_which_cannot_be_changed_should_not_be_prefetched(self):
+        user = User.objects.create(email='user@test.cz')
+
+        class NotChangeableUserResource(UserResource):
+
+            register = False
+
+            def has_put_permission(self, obj=None, **kwargs):
+                return obj is None
+
+        resource = NotChangeableUserResource(RequestFactory().put(self.USER_API_URL))
+        resource._prefetch_url_files(self.get_user_data_with_contract('user@test.cz', 'contract.txt'), user.pk)
+        self.assert_false(hasattr(resource.request, '_prefetched_url_files'))
+        self.assert_equal(self.server.requested_paths, [])
+
+    @override_settings(PYSTON_FILE_URL_PREFETCH_MAX_COUNT=2)
+    def test_number_of_prefetched_files_should_be_limited(self):
+        resource = UserResource(RequestFactory().post(self.USER_API_URL))
+        resource._prefetch_url_files([
+            self.get_user_data_with_contract('user_{}@test.cz'.format(i), 'contract{}.txt'.format(i)) for i in range(4)
+        ])
+        self.assert_equal(sorted(self.server.requested_paths), ['/contract0.txt', '/contract1.txt'])
+        resource._close_prefetched_url_files()
+
+    def test_number_of_host_semaphores_should_be_limited(self):
+        files._host_semaphores.clear()
+        with host_connection_limit('http://used.test/file.txt'):
+            for i in range(files.MAX_HOST_SEMAPHORES + 10):
+                with host_connection_limit('http://host{}.test/file.txt'.format(i)):
+                    pass
+            self.assert_equal(len(files._host_semaphores), files.MAX_HOST_SEMAPHORES)
+            # Semaphore which is in use is not discarded, per host limit cannot be exceeded
+            self.assert_in('used.test', files._host_semaphores)
+            self.assert_not_in('host0.test', files._host_semaphores)
+        self.assert_equal(files._host_semaphores['used.test'].users, 0)
+
+    def test_files_should_be_downloaded_concurrently_with_per_host_limit(self):
+        self.server.delay = 0.2
+        urls = [self.get_url('file{}.txt'.format(i)) for i in range(4)]
+        results = get_files_content_from_urls(urls, 1000)
+
+        self.assert_equal(self.server.max_active_requests, 2)
+        self.assert_true(files.get_pool() is files.get_pool())
+        for i, url in enumerate(urls):
+            file_content, size = results[url]
+            content = ('content of /file{}.txt'.format(i)).encode('utf-8')
+            self.assert_equal(file_content.read(), content)
+            self.assert_equal(size, len(content))
+
+    def test_too_large_file_should_be_returned_as_exception(self):
+        url = self.get_url('file.txt')
+        self.assert_true(isinstance(get_files_content_from_urls([url], 5)[url], RequestDataTooBig))
+
+    def test_bulk_create_users_with_url_files_should_download_each_file_once(self):
+        data = [
+            self.get_user_data_with_contract('user_{}@test.cz'.format(i), 'contract{}.txt'.format(i)) for i in range(3)
+        ]
+        resp = self.post(self.USER_API_URL, data=self.serialize(data))
+        self.assert_valid_JSON_created_response(resp)
+        self.assert_equal(sorted(self.server.requested_paths), ['/contract0.txt', '/contract1.txt', '/contract2.txt'])
+        for i, user in enumerate(User.objects.filter(email__in=[user_data['email'] for user_data in data])
+                                            .order_by('email')):
+            self.assert_equal(user.contract.read(), ('content of /contract{}.txt'.format(i)).encode('utf-8'))
+
+    @override_settings(PYSTON_FILE_SIZE_LIMIT=5)
+    def test_create_user_with_too_large_url_file(self):
+        data = {'email': 'user@test.cz', 'contract': {'filename': 'contract.txt', 'url': self.get_url('contract.txt')}}
+        resp = self.post(self.USER_API_URL, data=self.serialize(data))
+        self.assert_http_bad_request(resp)
+        self.assert_in('contract', self.deserialize(resp).get('messages', {}).get('errors', {}))
+        self.assert_equal(self.server.requested_paths, ['/contract.txt'])
+
+    @override_settings(PYSTON_FILE_URL_PREFETCH_MAX_COUNT=1)
+    def test_files_which_are_not_prefetched_should_be_downloaded_when_data_are_processed(self):
+        data = [
+            self.get_user_data_with_contract('user_{}@test.cz'.format(i), 'contract{}.txt'.format(i)) for i in range(3)
+        ]
+        resp = self.post(self.USER_API_URL, data=self.serialize(data))
+        self.assert_valid_JSON_created_response(resp)
+        self.assert_equal(sorted(self.server.requested_paths), ['/contract0.txt', '/contract1.txt', '/contract2.txt'])
@@ -1,3 +1,8 @@
+import atexit
+import shutil
+import sys
+import tempfile
+
 from dj.settings.base import *
 
 DEBUG = TEMPLATES[0]['OPTIONS']['debug'] = THUMBNAIL_DEBUG = True
@@ -15,3 +20,8 @@ DATABASES = {
         'PASSWORD': '',
     },
 }
+
+if 'test' in sys.argv:
+    # Files uploaded in tests are stored to the temporary directory which is removed after the tests
+    MEDIA_ROOT = tempfile.mkdtemp()
+    atexit.register(shutil.rmtree, MEDIA_ROOT, True)
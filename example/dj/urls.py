@@ -3,14 +3,19 @@ from distutils.version import StrictVersion
 import django
 from django.conf.urls import url
 
-from app.resource import (IssueResource, UserResource, ExtraResource, CountIssuesPerUserResource,
-                          CountWatchersPerIssueResource)
+from app.resource import (IssueResource, CachedIssueResource, CursorIssueResource, UserResource, ExtraResource,
+                          CountIssuesPerUserResource, CountWatchersPerIssueResource)
 
 urlpatterns = [
     url(r'^api/user/$', UserResource.as_view(allowed_methods=('get', 'post', 'head', 'options'))),
-    url(r'^api/user/(?P<pk>\d+)/$', UserResource.as_view(allowed_methods=('get', 'put', 'delete', 'head', 'options'))),
-    url(r'^api/issue/$', IssueResource.as_view(allowed_methods=('get', 'post', 'head', 'options'))),
-    url(r'^api/issue/(?P<pk>\d+)/$', IssueResource.as_view(allowed_methods=('get', 'put', 'delete', 'head', 'options'))),
+    url(r'^api/user/(?P<pk>\d+)/$', UserResource.as_view(allowed_methods=('get', 'put', 'patch', 'delete', 'head',
+                                                                          'options'))),
+    url(r'^api/issue/$', IssueResource.as_view(allowed_methods=('get', 'post', 'put', 'delete', 'head', 'options'))),
+    url(r'^api/issue/(?P<pk>\d+)/$', IssueResource.as_view(allowed_methods=('get', 'put', 'patch', 'delete', 'head',
+                                                                            'options'))),
+    url(r'^api/cached-issue/$', CachedIssueResource.as_view(allowed_methods=('get', 'head', 'options'))),
+    url(r'^api/cached-issue/(?P<pk>\d+)/$', CachedIssueResource.as_view(allowed_methods=('get', 'head', 'options'))),
+    url(r'^api/cursor-issue/$', CursorIssueResource.as_view(allowed_methods=('get', 'head', 'options'))),
     url(r'^api/extra/$', ExtraResource.as_view()),
     url(r'^api/count-issues-per-user/$', CountIssuesPerUserResource.as_view()),
     url(r'^api/count-watchers-per-issue/$', CountWatchersPerIssueResource.as_view()),
@@ -1,4 +1,13 @@
+from __future__ import unicode_literals
+
+import hashlib
+import time
+
 from django.core.cache import cache
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.http.response import HttpResponse
+from django.utils.encoding import force_bytes
+from django.utils.translation import get_language
 
 
 class DefaultRESTCache(object):
@@ -27,3 +36,123 @@ class DefaultRESTCache(object):
 
     def _get_response(self, request):
         return self._get_cache().get(self._get_key(request))
+
+
+class SerializedObjCache(object):
+    """
+    Cache of already serialized model objects (fragments). Fragment is invalidated only with change of the object
+    version field value therefore the version must be changed with every change of the serialized data.
+    """
+
+    def __init__(self, version_field, timeout=DEFAULT_TIMEOUT, batch_size=100):
+        self.version_field = version_field
+        self.timeout = timeout
+        self.batch_size = batch_size
+
+    def _get_cache(self):
+        return cache
+
+    def _get_permission_scope(self, request):
+        return getattr(getattr(request, 'user', None), 'pk', None)
+
+    def get_key(self, request, obj, serialization_state, serialization_format):
+        version = getattr(obj, self.version_field, None)
+        if version is None:
+            return None
+
+        return 'pyston:obj:{}'.format(hashlib.md5(force_bytes('|'.join((
+            obj._meta.db_table, '{}'.format(obj.pk), '{}'.format(version), serialization_state,
+            '{}'.format(serialization_format), '{}'.format(get_language()),
+            '{}'.format(self._get_permission_scope(request))
+        )))).hexdigest())
+
+    def get_many(self, keys):
+        return self._get_cache().get_many(keys) if keys else {}
+
+    def set_many(self, data):
+        self._get_cache().set_many(data, self.timeout)
+
+
+class IdempotencyCache(object):
+    """
+    Cache of responses to the requests sent with Idempotency-Key header. Repeated request with the same key is replayed
+    from the cache, concurrent requests with the same key wait until the first one is finished.
+    """
+
+    def __init__(self, timeout=60 * 60 * 24, lock_timeout=60, wait_timeout=30, poll_interval=0.05,
+                 methods=('POST',)):
+        self.timeout = timeout
+        self.lock_timeout = lock_timeout
+        self.wait_timeout = wait_timeout
+        self.poll_interval = poll_interval
+        self.methods = methods
+
+    def _get_cache(self):
+        return cache
+
+    def _get_permission_scope(self, request):
+        """
+        Returns scope of the stored responses, requests of anonymous users are scoped by the session. None is returned
+        for anonymous requests without session, idempotency keys of these requests are ignored.
+        """
+        user_pk = getattr(getattr(request, 'user', None), 'pk', None)
+        if user_pk is not None:
+            return 'user:{}'.format(user_pk)
+        session_key = getattr(getattr(request, 'session', None), 'session_key', None)
+        return 'session:{}'.format(session_key) if session_key else None
+
+    def _get_lock_key(self, key):
+        return '{}:lock'.format(key)
+
+    def get_key(self, request, idempotency_key):
+        permission_scope = self._get_permission_scope(request)
+        if request.method.upper() not in self.methods or permission_scope is None:
+            return None
+
+        return 'pyston:idempotency:{}'.format(hashlib.md5(force_bytes('|'.join((
+            request.method.upper(), request.path, permission_scope, idempotency_key
+        )))).hexdigest())
+
+    def get_fingerprint(self, request):
+        return hashlib.md5(request.body).hexdigest()
+
+    def acquire(self, key):
+        return self._get_cache().add(self._get_lock_key(key), True, self.lock_timeout)
+
+    def release(self, key):
+        self._get_cache().delete(self._get_lock_key(key))
+
+    def get_response(self, key):
+        return self._get_cache().get(key)
+
+    def wait_for_response(self, key):
+        """
+        Waits until the locked request is finished, returns stored response or None if the lock was released without
+        stored response or the wait timed out
+        """
+        timeout = time.time() + self.wait_timeout
+        while time.time() < timeout:
+            stored_response = self.get_response(key)
+            if stored_response is not None or self._get_cache().get(self._get_lock_key(key)) is None:
+                return stored_response
+            time.sleep(self.poll_interval)
+        return None
+
+    def store_response(self, key, fingerprint, response):
+        """
+        Only complete responses are stored, server errors are not stored to allow the client retry the request
+        """
+        if isinstance(response, HttpResponse) and response.status_code < 500:
+            self._get_cache().set(key, {
+                'fingerprint': fingerprint,
+                'status_code': response.status_code,
+                'headers': list(response.items()),
+                'content': response.content,
+            }, self.timeout)
+
+    def replay_response(self, stored_response):
+        response = HttpResponse(stored_response['content'], status=stored_response['status_code'])
+        for header, value in stored_response['headers']:
+            response[header] = value
+        response['Idempotent-Replayed'] = 'true'
+        return response
@@ -39,6 +39,10 @@ DEFAULTS = {
     },
     'PDF_EXPORT_TEMPLATE': 'default_pdf_table.html',
     'FILE_SIZE_LIMIT': 5000000,
+    'FILE_MAX_MEMORY_SIZE': 2621440,
+    'FILE_URL_FETCH_WORKERS': 4,
+    'FILE_URL_MAX_CONNECTIONS_PER_HOST': 2,
+    'FILE_URL_PREFETCH_MAX_COUNT': 20,
 }
 
 
@@ -7,6 +7,16 @@ from six.moves import cStringIO
 
 from collections import OrderedDict
 
+try:
+    from functools import lru_cache
+except ImportError:
+    from django.utils.lru_cache import lru_cache
+
+try:
+    import mimeparse
+except ImportError:
+    mimeparse = None
+
 from django.core.serializers.json import DateTimeAwareJSONEncoder
 from django.http.response import HttpResponseBase
 from django.template.loader import get_template
@@ -23,6 +33,11 @@ from .file_generators import CSVGenerator, XLSXGenerator, PDFGenerator
 
 
 converters = OrderedDict()
+# Content negotiation tables are rebuilt with every converters registration
+supported_mime_types = []
+converter_names_by_mime_type = {}
+
+NEGOTIATION_CACHE_SIZE = 1000
 
 
 def is_collection(data):
@@ -36,6 +51,23 @@ def register_converters():
     for converter_class_path in settings.CONVERTERS:
         converter_class = import_string(converter_class_path)()
         converters[converter_class.format] = converter_class
+    register_negotiation_tables()
+
+
+def register_negotiation_tables():
+    """
+    Precomputes supported mime types for the content negotiation, media type of the default converter is the last one
+    because mimeparse prefers the last of equally matched mime types.
+    """
+    converter_names_by_mime_type.clear()
+    for name, converter_class in converters.items():
+        converter_names_by_mime_type[converter_class.media_type] = name
+    default_media_type = next(iter(converters.values())).media_type if converters else None
+    supported_mime_types[:] = [
+        mime_type for mime_type in OrderedDict.fromkeys(converter.media_type for converter in converters.values())
+        if mime_type != default_media_type
+    ] + ([default_media_type] if default_media_type else [])
+    get_converter_name_from_mime_types.cache_clear()
 
 
 def get_default_converter_name():
@@ -61,6 +93,17 @@ def get_converter(result_format):
         raise ValueError('No converter found for type {}'.format(result_format))
 
 
+@lru_cache(maxsize=NEGOTIATION_CACHE_SIZE)
+def get_converter_name_from_mime_types(mime_types):
+    """
+    Returns name of the converter that best matches the Accept or Content-Type header value or None
+    """
+    try:
+        return converter_names_by_mime_type.get(mimeparse.best_match(supported_mime_types, mime_types))
+    except ValueError:
+        return None
+
+
 def get_converter_name_from_request(request, input_serialization=False):
     """
     Function for determining which converter name to use
@@ -69,36 +112,17 @@ def get_converter_name_from_request(request, input_serialization=False):
     if not converters:
         register_converters()
 
-    try:
-        import mimeparse
-    except ImportError:
-        mimeparse = None
-
     context_key = 'accept'
     if input_serialization:
         context_key = 'content_type'
 
-    default_converter_name = get_default_converter_name()
-
-    if mimeparse and context_key in request._rest_context:
-        supported_mime_types = set()
-        converter_map = {}
-        preferred_content_type = None
-        for name, converter_class in converters.items():
-            if name == default_converter_name:
-                preferred_content_type = converter_class.media_type
-            supported_mime_types.add(converter_class.media_type)
-            converter_map[converter_class.media_type] = name
-        supported_mime_types = list(supported_mime_types)
-        if preferred_content_type:
-            supported_mime_types.append(preferred_content_type)
-        try:
-            preferred_content_type = mimeparse.best_match(supported_mime_types,
-                                                          request._rest_context[context_key])
-        except ValueError:
-            pass
-        default_converter_name = converter_map.get(preferred_content_type, default_converter_name)
-    return default_converter_name
+    mime_types = request._rest_context.get(context_key) if mimeparse else None
+    negotiated_converter_names = request.__dict__.setdefault('_negotiated_converter_names', {})
+    if (context_key, mime_types) not in negotiated_converter_names:
+        negotiated_converter_names[(context_key, mime_types)] = (
+            mime_types and get_converter_name_from_mime_types(mime_types) or get_default_converter_name()
+        )
+    return negotiated_converter_names[(context_key, mime_types)]
 
 
 def get_converter_from_request(request, input_serialization=False):
@@ -384,13 +408,9 @@ class HTMLConverter(Converter):
         return JSONConverter()
 
     def _get_permissions(self, resource, obj):
+        allowed_methods = resource._get_request_allowed_methods()
         return {
-            'post': resource.has_post_permission(obj=obj),
-            'get': resource.has_get_permission(obj=obj),
-            'put': resource.has_put_permission(obj=obj),
-            'delete': resource.has_delete_permission(obj=obj),
-            'head': resource.has_head_permission(obj=obj),
-            'options': resource.has_options_permission(obj=obj),
+            method: method in allowed_methods for method in ('post', 'get', 'put', 'delete', 'head', 'options')
         }
 
     def _update_headers(self, http_headers, resource, converter):
@@ -419,7 +439,7 @@ class HTMLConverter(Converter):
         http_headers = {} if http_headers is None else http_headers.copy()
         converter = self._get_converter(resource)
         http_headers = self._update_headers(http_headers, resource, converter)
-        obj = resource._get_obj_or_none()
+        obj = resource._get_request_obj_or_none()
 
         kwargs.update({
             'http_headers': http_headers,
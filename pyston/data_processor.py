@@ -1,15 +1,11 @@
 from __future__ import unicode_literals
 
-import sys
-import base64
 import inspect
 import mimetypes
 
-from six import BytesIO
-
 from django.forms.fields import FileField
 from django.utils.translation import ugettext_lazy as _, ugettext
-from django.core.files.uploadedfile import InMemoryUploadedFile
+from django.core.files.uploadedfile import UploadedFile
 
 from django.forms.models import ModelChoiceField, ModelMultipleChoiceField
 from django.http.response import Http404
@@ -18,11 +14,10 @@ from django.utils.encoding import force_text
 from chamber.shortcuts import get_object_or_none
 
 from pyston.conf import settings as pyston_settings
-from pyston.utils.compatibility import (
-    is_reverse_one_to_one, is_reverse_many_to_one, is_reverse_many_to_many,
-    get_reverse_field_name, get_model_from_relation
+from pyston.utils.compatibility import get_field_info, get_reverse_field_name, get_model_from_relation
+from pyston.utils.files import (
+    get_file_content_from_url, get_file_content_from_base64, RequestDataTooBig, InvalidBase64Data
 )
-from pyston.utils.files import get_file_content_from_url, RequestDataTooBig
 
 from .exception import DataInvalidException, RESTException
 from .resource import BaseObjectResource, typemapper, BaseModelResource
@@ -32,21 +27,58 @@ class DataProcessorCollection(object):
 
     def __init__(self):
         self.data_processors_map = {}
+        self._processors_cache = {}
+        self._processed_field_names_cache = {}
 
     def register(self, resource_class):
         def _register(processor_class):
             data_processors = self.data_processors_map.get(resource_class, set())
             data_processors.add(processor_class)
             self.data_processors_map[resource_class] = data_processors
+            self._processors_cache.clear()
+            self._processed_field_names_cache.clear()
             return processor_class
         return _register
 
     def get_processors(self, resource_class):
-        processors = []
-        for obj_class in inspect.getmro(resource_class):
-            processors += list(self.data_processors_map.get(obj_class, set()))
+        processors = self._processors_cache.get(resource_class)
+        if processors is None:
+            processors = []
+            for obj_class in inspect.getmro(resource_class):
+                processors += list(self.data_processors_map.get(obj_class, set()))
+            self._processors_cache[resource_class] = processors
         return processors
 
+    def _get_processed_field_names(self, resource, form):
+        """
+        Returns dispatch table (list of processors with names of fields they can process) compiled for the resource
+        class and form fields
+        """
+        key = (type(resource), type(form), tuple(form.fields.keys()))
+        processed_field_names = self._processed_field_names_cache.get(key)
+        if processed_field_names is None:
+            processed_field_names = [
+                (processor, processor.get_processed_field_names(resource, form))
+                for processor in self.get_processors(type(resource))
+            ]
+            self._processed_field_names_cache[key] = processed_field_names
+        return processed_field_names
+
+    def get_data_processors(self, resource, form, data):
+        """
+        Returns processors with names of data fields which they process, processors without any processed field in
+        the data are skipped. None instead of names means that processor processes all data fields.
+        """
+        data_processors = []
+        for processor, field_names in self._get_processed_field_names(resource, form):
+            if field_names is None:
+                data_processors.append((processor, None))
+            else:
+                data_field_names = field_names.intersection(data.keys())
+                if data_field_names:
+                    data_processors.append((processor, data_field_names))
+        return data_processors
+
 data_preprocessors = DataProcessorCollection()
 data_postprocessors = DataProcessorCollection()
 
@@ -57,18 +89,26 @@ class DataProcessor(object):
         self.request = resource.request
         self.form = form
 
+    @classmethod
+    def get_processed_field_names(cls, resource, form):
+        """
+        Returns set of field names which can be processed by the processor or None if processor can process any field
+        """
+        return None
+
     def _process_field(self, data, files, key, data_item):
         raise NotImplementedError
 
     def _clear_data(self, data, files):
         return data, files
 
-    def process_data(self, data, files):
+    def process_data(self, data, files, field_names=None):
         data, files = self._clear_data(data, files)
 
         self.errors = {}
-        for key, data_item in data.items():
-            self._process_field(data, files, key, data_item)
+        for key, data_item in list(data.items()):
+            if field_names is None or key in field_names:
+                self._process_field(data, files, key, data_item)
 
         if self.errors:
             raise DataInvalidException(self.errors)
@@ -78,6 +118,10 @@ class DataProcessor(object):
 @data_preprocessors.register(BaseObjectResource)
 class FileDataPreprocessor(DataProcessor):
 
+    @classmethod
+    def get_processed_field_names(cls, resource, form):
+        return {key for key, field in form.fields.items() if isinstance(field, FileField)}
+
     def _validate_not_empty(self, data_item, key, item):
         if not data_item.get(item):
             error = self.errors.get(key, {})
@@ -90,37 +134,56 @@ class FileDataPreprocessor(DataProcessor):
     def _get_content_type(self, data_item, filename):
         return data_item.get('content_type') or self._get_mimetype_from_filename(filename)
 
-    def _process_file_data(self, data, files, key, data_item, file_content):
+    def _process_file_data(self, data, files, key, data_item, file_content, size):
         filename = data_item.get('filename')
         content_type = self._get_content_type(data_item, filename)
         if content_type:
             charset = data_item.get('charset')
-            files[key] = InMemoryUploadedFile(
-                file_content, field_name=key, name=filename, content_type=content_type,
-                size=sys.getsizeof(file_content), charset=charset
+            files[key] = UploadedFile(
+                file_content, name=filename, content_type=content_type, size=size, charset=charset
             )
             data[key] = filename
         else:
+            file_content.close()
             self.errors[key] = ugettext('Content type cannot be evaluated from filename, please specify it')
 
     def _process_file_data_field(self, data, files, key, data_item):
         try:
-            file_content = BytesIO(base64.b64decode(data_item.get('content').encode('utf-8')))
-            self._process_file_data(data, files, key, data_item, file_content)
-        except TypeError:
+            file_content, size = get_file_content_from_base64(
+                data_item.get('content'), pyston_settings.FILE_SIZE_LIMIT
+            )
+        except InvalidBase64Data:
             self.errors[key] = ugettext('File content is not in base64 format')
+            return
+        except RequestDataTooBig:
+            self.errors[key] = ugettext('File is too large, maximum size is {} bytes').format(
+                pyston_settings.FILE_SIZE_LIMIT
+            )
+            return
+
+        self._process_file_data(data, files, key, data_item, file_content, size)
+
+    def _get_file_content_from_url(self, url):
+        prefetched_url_files = getattr(self.request, '_prefetched_url_files', {})
+        if url in prefetched_url_files:
+            # Prefetched file object can be used only once
+            result = prefetched_url_files.pop(url)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        return get_file_content_from_url(url, pyston_settings.FILE_SIZE_LIMIT)
 
     def _process_file_data_url_field(self, data, files, key, data_item):
         url = data_item.get('url')
         try:
-            file_content = get_file_content_from_url(url, pyston_settings.FILE_SIZE_LIMIT)
+            file_content, size = self._get_file_content_from_url(url)
         except RequestDataTooBig:
             self.errors[key] = ugettext('Response too large, maximum size is {} bytes').format(
                 pyston_settings.FILE_SIZE_LIMIT
             )
             return
 
-        self._process_file_data(data, files, key, data_item, file_content)
+        self._process_file_data(data, files, key, data_item, file_content, size)
 
     def _process_field(self, data, files, key, data_item):
         field = self.form.fields.get(key)
@@ -166,10 +229,20 @@ class ResourceProcessorMixin(object):
             except (DataInvalidException, RESTException) as ex:
                 raise DataInvalidException(ex.errors)
 
+    def _set_errors_index(self, errors, indexes):
+        for error in errors:
+            error['_index'] = indexes[error['_index']]
+        return errors
+
     def _create_and_return_new_object_pk_list(self, data, model, created_via_inst, created_via_field_name=None):
         resource = self._get_resource(model)
         assert resource is not None
 
+        if resource.batch_nested_writes:
+            return self._bulk_create_and_return_new_object_pk_list(
+                resource, data, created_via_inst, created_via_field_name
+            )
+
         errors = []
         result = []
         i = 0
@@ -199,6 +272,45 @@ class ResourceProcessorMixin(object):
             raise DataInvalidException(errors)
         return result
 
+    def _bulk_create_and_return_new_object_pk_list(self, resource, data, created_via_inst, created_via_field_name):
+        """
+        Objects with data are created or updated together, objects are validated before any of them is saved
+        """
+        errors = []
+        result = []
+        saved_objs_data = []
+        saved_objs_indexes = []
+        i = 0
+        for obj_data in data:
+            if not isinstance(obj_data, dict):
+                obj_data = {resource.pk_field_name: obj_data}
+
+            try:
+                if created_via_field_name:
+                    obj_data[created_via_field_name] = created_via_inst.pk
+
+                if set(obj_data.keys()) ^ {resource.pk_field_name}:
+                    saved_objs_data.append(obj_data)
+                    saved_objs_indexes.append(i)
+                    result.append(None)
+                else:
+                    result.append(obj_data[resource.pk_field_name])
+            except TypeError:
+                errors.append({'error': ugettext('Data must be object'), '_index': i})
+            i += 1
+
+        if saved_objs_data:
+            try:
+                saved_objs = resource._bulk_create_or_update(saved_objs_data, self.via)
+                for index, obj in zip(saved_objs_indexes, saved_objs):
+                    result[index] = obj.pk
+            except DataInvalidException as ex:
+                errors += self._set_errors_index(ex.errors, saved_objs_indexes)
+
+        if errors:
+            raise DataInvalidException(sorted(errors, key=lambda error: error['_index']))
+        return result
+
     def _delete_reverse_object(self, obj_data, model):
         resource = self._get_resource(model)
         assert resource is not None
@@ -214,6 +326,10 @@ class ResourceProcessorMixin(object):
         resource = self._get_resource(model)
         assert resource is not None
 
+        if resource.batch_nested_writes:
+            self._bulk_delete_reverse_objects(resource, data)
+            return
+
         errors = []
         i = 0
         for obj_data in data:
@@ -227,6 +343,35 @@ class ResourceProcessorMixin(object):
         if errors:
             raise DataInvalidException(errors)
 
+    def _bulk_delete_reverse_objects(self, resource, data):
+        """
+        Objects are loaded and removed together
+        """
+        errors = []
+        pks = []
+        pks_indexes = []
+        i = 0
+        for obj_data in data:
+            try:
+                pks.append(self._flat_object_to_pk(resource.pk_field_name, obj_data))
+                pks_indexes.append(i)
+            except DataInvalidException as ex:
+                rel_obj_errors = ex.errors
+                rel_obj_errors['_index'] = i
+                errors.append(rel_obj_errors)
+            i += 1
+
+        if pks:
+            try:
+                resource._bulk_delete(pks, self.via)
+            except DataInvalidException as ex:
+                errors += self._set_errors_index(ex.errors, pks_indexes)
+            except RESTException as ex:
+                raise DataInvalidException(ex.errors)
+
+        if errors:
+            raise DataInvalidException(sorted(errors, key=lambda error: error['_index']))
+
     def _flat_object_to_pk(self, pk_field_name, data):
         i = 0
         if isinstance(data, dict):
@@ -256,6 +401,13 @@ class MultipleDataProcessorMixin(object):
 @data_preprocessors.register(BaseObjectResource)
 class ModelDataPreprocessor(ResourceProcessorMixin, ModelResourceDataProcessor):
 
+    @classmethod
+    def get_processed_field_names(cls, resource, form):
+        return {
+            key for key, field in form.fields.items()
+            if isinstance(field, ModelChoiceField) and not isinstance(field, ModelMultipleChoiceField)
+        }
+
     def _process_field(self, data, files, key, data_item):
         field = self.form.fields.get(key)
         if (field and isinstance(field, ModelChoiceField) and not isinstance(field, ModelMultipleChoiceField) and
@@ -271,6 +423,10 @@ class ModelDataPreprocessor(ResourceProcessorMixin, ModelResourceDataProcessor):
 @data_preprocessors.register(BaseObjectResource)
 class ModelMultipleDataPreprocessor(MultipleDataProcessorMixin, ResourceProcessorMixin, ModelResourceDataProcessor):
 
+    @classmethod
+    def get_processed_field_names(cls, resource, form):
+        return {key for key, field in form.fields.items() if isinstance(field, ModelMultipleChoiceField)}
+
     def _create_or_update_related_objects_set(self, data, key, data_item, model):
         if isinstance(data, (tuple, list)):
             try:
@@ -351,6 +507,13 @@ class ModelMultipleDataPreprocessor(MultipleDataProcessorMixin, ResourceProcesso
 @data_postprocessors.register(BaseModelResource)
 class ReverseMultipleDataPreprocessor(MultipleDataProcessorMixin, ResourceProcessorMixin, ModelResourceDataProcessor):
 
+    @classmethod
+    def get_processed_field_names(cls, resource, form):
+        return {
+            field.name for field in resource.model._meta.get_fields()
+            if field.auto_created and (field.one_to_many or field.many_to_many)
+        }
+
     def _create_or_update_reverse_related_objects_set(self, data, key, data_item):
         model = get_model_from_relation(self.model, key)
         field_name = get_reverse_field_name(self.model, key)
@@ -360,8 +523,8 @@ class ReverseMultipleDataPreprocessor(MultipleDataProcessorMixin, ResourceProces
                 new_object_pks = self._create_and_return_new_object_pk_list(data, model, self.inst, field_name)
                 # This is not optimal solution but is the most universal
                 self._delete_reverse_objects(
-                    resource._get_queryset().filter(**{field_name: self.inst})
-                    .exclude(pk__in=new_object_pks).values_list('pk', flat=True),
+                    list(resource._get_queryset().filter(**{field_name: self.inst})
+                         .exclude(pk__in=new_object_pks).values_list('pk', flat=True)),
                     model)
             except DataInvalidException as ex:
                 self._append_errors(key, 'set', ex.errors)
@@ -410,7 +573,8 @@ class ReverseMultipleDataPreprocessor(MultipleDataProcessorMixin, ResourceProces
                 pass
 
     def _process_field(self, data, files, key, data_item):
-        if ((is_reverse_many_to_many(self.model, key) or is_reverse_many_to_one(self.model, key)) and
+        field_info = get_field_info(self.model, key)
+        if (field_info and (field_info.is_reverse_many_to_many or field_info.is_reverse_many_to_one) and
             ((isinstance(data_item, dict) and set(data_item.keys()).union({'set', 'add', 'remove'})) or
              (isinstance(data_item, list)))):
             self._create_or_update_reverse_related_objects(data, key, data_item)
@@ -419,6 +583,10 @@ class ReverseMultipleDataPreprocessor(MultipleDataProcessorMixin, ResourceProces
 @data_postprocessors.register(BaseModelResource)
 class ReverseDataPostprocessor(ResourceProcessorMixin, ModelResourceDataProcessor):
 
+    @classmethod
+    def get_processed_field_names(cls, resource, form):
+        return {field.name for field in resource.model._meta.get_fields() if field.auto_created and field.one_to_one}
+
     def _create_or_update_reverse_related_object(self, data, key, data_item):
         model_descriptor = getattr(self.model, key)
         model = get_model_from_relation(self.model, key)
@@ -446,5 +614,6 @@ class ReverseDataPostprocessor(ResourceProcessorMixin, ModelResourceDataProcesso
                 self.errors[key] = ex.errors
 
     def _process_field(self, data, files, key, data_item):
-        if is_reverse_one_to_one(self.model, key):
+        field_info = get_field_info(self.model, key)
+        if field_info and field_info.is_reverse_one_to_one:
             self._create_or_update_reverse_related_object(data, key, data_item)
@@ -5,6 +5,17 @@ from django.core.exceptions import ValidationError
 
 
 class RESTFormMixin(object):
+    """
+    Partial form contains only fields which are sent in data or files
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.partial = kwargs.pop('partial', False)
+        super(RESTFormMixin, self).__init__(*args, **kwargs)
+        if self.partial:
+            for field_name in list(self.fields.keys()):
+                if field_name not in self.data and field_name not in self.files:
+                    del self.fields[field_name]
 
     def is_invalid(self):
         '''
@@ -48,9 +59,23 @@ class RESTFormMixin(object):
 
 class AllFieldsUniqueValidationModelForm(forms.ModelForm):
 
+    def _get_unique_validation_exclusions(self):
+        """
+        Partial form validates uniqueness only of changed fields and fields which are unique together with them
+        """
+        if not getattr(self, 'partial', False):
+            return None
+
+        opts = self.instance._meta
+        validated_field_names = set(self.changed_data)
+        for unique_together in opts.unique_together:
+            if validated_field_names & set(unique_together):
+                validated_field_names |= set(unique_together)
+        return [field.name for field in opts.fields if field.name not in validated_field_names]
+
     def validate_unique(self):
         try:
-            self.instance.validate_unique()
+            self.instance.validate_unique(exclude=self._get_unique_validation_exclusions())
         except ValidationError as e:
             self._update_errors(e)
 
@@ -1,13 +1,40 @@
 from __future__ import unicode_literals
 
+import base64
+import hashlib
+import json
+
+import six
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.utils.encoding import force_bytes, force_text
 from django.utils.translation import ugettext
 from django.db.models.query import QuerySet
 
 from .exception import RESTException
+from .utils.compatibility import EmptyResultSet, FieldDoesNotExist
 
 
 class BasePaginator(object):
 
+    MAX_BIG_INT = pow(2, 63) - 1
+
+    def _get_base(self, request):
+        base = request._rest_context.get('base')
+        if not base:
+            return None
+        elif base.isdigit():
+            base_int = int(base)
+            if base_int > self.MAX_BIG_INT:
+                raise RESTException(ugettext('Base must lower or equal to {}').format(self.MAX_BIG_INT))
+            else:
+                return base_int
+        else:
+            raise RESTException(ugettext('Base must be natural number or empty'))
+
     @property
     def page_qs(self):
         raise NotImplementedError
@@ -22,19 +49,81 @@ class Paginator(BasePaginator):
     REST paginator for list and querysets
     """
 
-    MAX_BIG_INT = pow(2, 63) - 1
+    # Number of seconds the exact total of the queryset is cached for, None means no caching
+    total_cache_timeout = None
+    # Total greater than threshold is only estimated and marked with header X-Total-Approximate
+    approximate_total_threshold = None
+    # Total is counted only if client requests it with header X-Total or query parameter _total
+    total_on_demand = False
 
     def __init__(self, qs, request):
         self.qs = qs
         self.offset = self._get_offset(request)
         self.base = self._get_base(request)
-        self.total = self._get_total()
+        self.total_approximate = False
+        self.total = self._get_total() if self._is_total_requested(request) else None
+
+    def _is_total_requested(self, request):
+        return not self.total_on_demand or request._rest_context.get('total', '').lower() in {'1', 'true'}
 
     def _get_total(self):
-        if isinstance(self.qs, QuerySet):
-            return self.qs.count()
-        else:
+        if not isinstance(self.qs, QuerySet):
             return len(self.qs)
+        elif self.total_cache_timeout is None:
+            total, self.total_approximate = self._count_total()
+            return total
+        else:
+            try:
+                cache_key = self._get_total_cache_key()
+            except EmptyResultSet:
+                # Queryset which cannot match any rows cannot be compiled to SQL, its total is known without query
+                return 0
+            cached_total = cache.get(cache_key)
+            if cached_total is None:
+                cached_total = self._count_total()
+                cache.set(cache_key, cached_total, self.total_cache_timeout)
+            total, self.total_approximate = cached_total
+            return total
+
+    def _get_total_cache_key(self):
+        # Ordering has no effect on the total, therefore it is removed from the cache key
+        sql, params = self.qs.order_by().query.sql_with_params()
+        return 'pyston:total:{}'.format(
+            hashlib.md5(force_bytes('{}|{}|{}'.format(self.qs.db, sql, params))).hexdigest()
+        )
+
+    def _count_total(self):
+        """
+        Returns tuple with total and flag whether the total is only approximate
+        """
+        if self.approximate_total_threshold is None:
+            return self.qs.count(), False
+
+        # Cheap bound, the count query is stopped after threshold is exceeded
+        bounded_total = self.qs[:self.approximate_total_threshold + 1].count()
+        if bounded_total <= self.approximate_total_threshold:
+            return bounded_total, False
+        else:
+            return max(bounded_total, self._get_estimated_total() or 0), True
+
+    def _get_estimated_total(self):
+        """
+        Returns number of rows estimated by the database planner or None if estimate is not supported
+        """
+        connection = connections[self.qs.db]
+        if connection.vendor != 'postgresql':
+            return None
+
+        try:
+            sql, params = self.qs.order_by().query.sql_with_params()
+        except EmptyResultSet:
+            return 0
+        with connection.cursor() as cursor:
+            cursor.execute('EXPLAIN (FORMAT JSON) {}'.format(sql), params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, six.string_types):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
 
     def _get_offset(self, request):
         offset = request._rest_context.get('offset', '0')
@@ -47,19 +136,6 @@ class Paginator(BasePaginator):
         else:
             raise RESTException(ugettext('Offset must be natural number'))
 
-    def _get_base(self, request):
-        base = request._rest_context.get('base')
-        if not base:
-            return None
-        elif base.isdigit():
-            base_int = int(base)
-            if base_int > self.MAX_BIG_INT:
-                raise RESTException(ugettext('Base must lower or equal to {}').format(self.MAX_BIG_INT))
-            else:
-                return base_int
-        else:
-            raise RESTException(ugettext('Base must be natural number or empty'))
-
     @property
     def page_qs(self):
         if self.base is not None:
@@ -69,4 +145,149 @@ class Paginator(BasePaginator):
 
     @property
     def headers(self):
-        return {'X-Total': self.total}
+        headers = {}
+        if self.total is not None:
+            headers['X-Total'] = self.total
+        if self.total_approximate:
+            headers['X-Total-Approximate'] = 'true'
+        return headers
+
+
+class CursorPaginator(BasePaginator):
+    """
+    REST keyset paginator for querysets. Page is selected with opaque cursor (header X-Cursor) instead of offset,
+    therefore page is fetched in constant time at any depth. Queryset can be ordered only by not nullable model fields,
+    primary key is always added to the ordering to make it unique. Cursors are resolved with loading only ordering
+    fields, objects of the page are returned as a lazy queryset filtered by the keyset and sliced by the page size.
+    """
+
+    # Page size used if client does not send base, greater base is lowered to max_base
+    default_base = 20
+    max_base = 100
+
+    def __init__(self, qs, request):
+        self.qs = qs
+        self.base = self._get_page_size(request)
+        self.ordering = self._get_ordering()
+        self.cursor_values, self.cursor_reverse = self._get_cursor(request)
+        self._page = None
+        self._has_more_objs = False
+
+    def _get_page_size(self, request):
+        base = self._get_base(request)
+        return self.default_base if base is None else min(base, self.max_base)
+
+    def _get_ordering(self):
+        """
+        Returns list of tuples with ordering model field and flag whether ordering is descending
+        """
+        opts = self.qs.model._meta
+        query = self.qs.query
+        ordering = []
+        for field_name in query.order_by or (opts.ordering if query.default_ordering else ()):
+            if not isinstance(field_name, six.string_types) or field_name == '?' or '__' in field_name:
+                raise RESTException(ugettext('Cursor pagination supports only ordering by model fields'))
+            descending = field_name.startswith('-')
+            field_name = field_name.lstrip('-')
+            try:
+                field = opts.pk if field_name == 'pk' else opts.get_field(field_name)
+            except FieldDoesNotExist:
+                field = None
+            if field is None or not field.concrete or field.many_to_many:
+                raise RESTException(ugettext('Cursor pagination supports only ordering by model fields'))
+            if field.null:
+                raise RESTException(ugettext('Cursor pagination does not support ordering by nullable fields'))
+            ordering.append((field, descending))
+
+        if not any(field.primary_key for field, _ in ordering):
+            ordering.append((opts.pk, False))
+        return ordering
+
+    def _get_cursor(self, request):
+        cursor = request._rest_context.get('cursor')
+        if not cursor:
+            return None, False
+
+        try:
+            cursor_data = json.loads(force_text(base64.urlsafe_b64decode(force_bytes(cursor))))
+            values, reverse = cursor_data['v'], cursor_data['r']
+            if len(values) != len(self.ordering) or None in values:
+                raise ValueError
+            return [field.to_python(value) for (field, _), value in zip(self.ordering, values)], bool(reverse)
+        except (ValueError, TypeError, KeyError, ValidationError):
+            raise RESTException(ugettext('Cursor is invalid'))
+
+    def _encode_cursor(self, obj, reverse):
+        values = [field.value_to_string(obj) for field, _ in self.ordering]
+        return force_text(base64.urlsafe_b64encode(force_bytes(json.dumps({'v': values, 'r': reverse}))))
+
+    def _get_keyset_filter(self, values, reverse, inclusive=False):
+        """
+        Returns filter of objects placed after the values in the ordering (before them if reverse is set), inclusive
+        filter contains the object with the values too
+        """
+        keyset_filter = Q()
+        for i, (field, descending) in enumerate(self.ordering):
+            field_filter = Q(**{'{}__{}'.format(field.attname, 'lt' if descending != reverse else 'gt'): values[i]})
+            for (prev_field, _), prev_value in zip(self.ordering[:i], values):
+                field_filter &= Q(**{prev_field.attname: prev_value})
+            keyset_filter |= field_filter
+        if inclusive:
+            keyset_filter |= Q(**{field.attname: value for (field, _), value in zip(self.ordering, values)})
+        return keyset_filter
+
+    def _get_ordered_qs(self, reverse):
+        return self.qs.order_by(*(
+            '{}{}'.format('-' if descending != reverse else '', field.attname) for field, descending in self.ordering
+        ))
+
+    def _get_page(self):
+        """
+        Returns objects of the page with loaded only ordering fields, they are used for the cursors
+        """
+        if self._page is None:
+            qs = self._get_ordered_qs(self.cursor_reverse).select_related(None).prefetch_related(None).only(
+                *(field.name for field, _ in self.ordering)
+            )
+            if self.cursor_values is not None:
+                qs = qs.filter(self._get_keyset_filter(self.cursor_values, self.cursor_reverse))
+
+            # One object over the base is loaded to find out whether next page exists
+            page = list(qs[:self.base + 1])
+            self._has_more_objs = len(page) > self.base
+            page = page[:self.base]
+            if self.cursor_reverse:
+                page.reverse()
+            self._page = page
+        return self._page
+
+    @property
+    def page_qs(self):
+        qs = self._get_ordered_qs(False)
+        if not self.cursor_reverse:
+            if self.cursor_values is not None:
+                qs = qs.filter(self._get_keyset_filter(self.cursor_values, False))
+            return qs[:self.base]
+
+        # Previous page is sliced from the ordered queryset, therefore it starts with its first object
+        page = self._get_page()
+        if not page:
+            return qs.none()
+        first_obj_values = [field.value_from_object(page[0]) for field, _ in self.ordering]
+        return qs.filter(self._get_keyset_filter(first_obj_values, False, inclusive=True))[:len(page)]
+
+    @property
+    def headers(self):
+        page = self._get_page()
+        headers = {}
+        if page:
+            if self._has_more_objs or self.cursor_reverse:
+                headers['X-Next-Cursor'] = self._encode_cursor(page[-1], False)
+
+            if self.cursor_reverse:
+                has_prev_page = self._has_more_objs
+            else:
+                has_prev_page = self.cursor_values is not None
+            if has_prev_page:
+                headers['X-Prev-Cursor'] = self._encode_cursor(page[0], True)
+        return headers
@@ -1,23 +1,31 @@
 from __future__ import unicode_literals
 
 import re
+import hashlib
 import warnings
 
 import six
 
+from calendar import timegm
+
 from six.moves import reduce
-from six.moves.urllib.parse import urlparse
 
 from django.conf import settings as django_settings
-from django.http.response import HttpResponse, HttpResponseBase
+from django.core.signals import setting_changed
+from django.http.response import HttpResponse, HttpResponseBase, HttpResponseNotModified
 from django.utils.decorators import classonlymethod
-from django.utils.encoding import force_text
+from django.utils.encoding import force_text, force_bytes
+from django.utils.http import http_date, parse_http_date_safe
+from django.db import connections
+from django.db.models import Count, Max
 from django.db.models.base import Model
 from django.db.models.query import QuerySet
 from django.http.response import Http404
 from django.forms.models import modelform_factory
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ValidationError
+from django.utils.translation import ugettext
 
+from collections import OrderedDict
 from functools import update_wrapper
 
 from chamber.shortcuts import get_object_or_none
@@ -29,12 +37,13 @@ from pyston.conf import settings
 
 from .paginator import Paginator
 from .response import (HeadersResponse, RESTErrorResponse, RESTErrorsResponse, RESTCreatedResponse,
-                       RESTNoConetentResponse)
+                       RESTNoConetentResponse, RESTNotModifiedResponse)
 from .exception import (RESTException, ConflictException, NotAllowedException, DataInvalidException,
                         ResourceNotFoundException, NotAllowedMethodException, DuplicateEntryException,
                         UnsupportedMediaTypeException, MimerDataException)
 from .forms import RESTModelForm
-from .utils import coerce_put_post, rc, set_rest_context_to_request, RFS, rfs
+from .utils import (coerce_put_post, rc, set_rest_context_to_request, parse_etags, get_cors_origins_whitelist, RFS,
+                    rfs, FRFS, frfs, LRUCache)
 from .serializer import ResourceSerializer, ModelResourceSerializer
 from .converters import get_converter_name_from_request, get_converter_from_request, get_converter
 
@@ -46,9 +55,21 @@ ACCESS_CONTROL_ALLOW_HEADERS = 'Access-Control-Allow-Headers'
 ACCESS_CONTROL_ALLOW_METHODS = 'Access-Control-Allow-Methods'
 ACCESS_CONTROL_MAX_AGE = 'Access-Control-Max-Age'
 
+GENERATED_FORM_CLASSES_CACHE_SIZE = 1000
+
 
 typemapper = {}
 resource_tracker = []
+generated_form_classes = LRUCache(GENERATED_FORM_CLASSES_CACHE_SIZE)
+cors_preflight_headers = {}
+
+
+def clear_cors_preflight_headers(setting, **kwargs):
+    if setting.startswith('PYSTON_'):
+        cors_preflight_headers.clear()
+
+
+setting_changed.connect(clear_cors_preflight_headers)
 
 
 class ResourceMetaClass(type):
@@ -59,6 +80,7 @@ class ResourceMetaClass(type):
     def __new__(cls, name, bases, attrs):
         abstract = attrs.pop('abstract', False)
         new_cls = type.__new__(cls, name, bases, attrs)
+        new_cls._generate_permission_methods()
         if not abstract and new_cls.register:
             def already_registered(model):
                 return typemapper.get(model)
@@ -76,9 +98,30 @@ class ResourceMetaClass(type):
         return new_cls
 
 
+def generate_check_permission_method(name):
+    def _check_permission(self, *args, **kwargs):
+        return self._check_permission(name, *args, **kwargs)
+    return _check_permission
+
+
+def generate_check_call_method(name):
+    def _check_call(self, *args, **kwargs):
+        return self._check_call(name, *args, **kwargs)
+    return _check_call
+
+
+HAS_PERMISSION_RE = re.compile(r'^has_(\w+)_permission$')
+
+
 class PermissionsResourceMixin(object):
 
+    PERMISSION_METHOD_FACTORIES = (
+        (re.compile(r'^_check_(\w+)_permission$'), generate_check_permission_method),
+        (re.compile(r'^can_call_(\w+)$'), generate_check_call_method),
+    )
+
     allowed_methods = ('get', 'post', 'put', 'delete', 'head', 'options')
+    _has_permission_method_names = {}
 
     def _get_via(self, via=None):
         via = list(via) if via is not None else []
@@ -100,36 +143,71 @@ class PermissionsResourceMixin(object):
                 pass
         return allowed_methods
 
-    def _check_permission(self, name, *args, **kwargs):
-        if not hasattr(self, 'has_{}_permission'.format(name)):
-            if django_settings.DEBUG:
-                raise NotImplementedError('Please implement method has_{}_permission to {}'.format(name, self.__class__))
-            else:
-                raise NotAllowedException
+    def _get_has_permission_method(self, name):
+        method_name = self._has_permission_method_names.get(name) or 'has_{}_permission'.format(name)
+        has_permission = getattr(self, method_name, None)
+        if has_permission is None and django_settings.DEBUG:
+            raise NotImplementedError('Please implement method {} to {}'.format(method_name, self.__class__))
+        return has_permission
 
-        if not getattr(self, 'has_{}_permission'.format(name))(*args, **kwargs):
+    def _check_permission(self, name, *args, **kwargs):
+        has_permission = self._get_has_permission_method(name)
+        if has_permission is None or not has_permission(*args, **kwargs):
             raise NotAllowedException
 
     def _check_call(self, name, *args, **kwargs):
-        if not hasattr(self, 'has_{}_permission'.format(name)):
-            if django_settings.DEBUG:
-                raise NotImplementedError('Please implement method has_{}_permission to {}'.format(name, self.__class__))
-            else:
-                return False
+        has_permission = self._get_has_permission_method(name)
+        if has_permission is None:
+            return False
         try:
-            return getattr(self, 'has_{}_permission'.format(name))(*args, **kwargs)
+            return has_permission(*args, **kwargs)
         except Http404:
             return False
 
-    def __getattr__(self, name):
-        for regex, method in (
-                (r'_check_(\w+)_permission', self._check_permission),
-                (r'can_call_(\w+)', self._check_call)):
-            m = re.match(regex, name)
+    @classmethod
+    def _generate_permission_method(cls, method_name):
+        """
+        Generates the _check_<name>_permission or can_call_<name> method and sets it to the class. Methods that are
+        implemented explicitly are not overridden.
+        """
+        method = getattr(cls, method_name, None)
+        if method is not None and not getattr(method, 'generated_permission_method', False):
+            return method
+
+        for regex, method_factory in cls.PERMISSION_METHOD_FACTORIES:
+            m = regex.match(method_name)
             if m:
-                def _call(*args, **kwargs):
-                    return method(m.group(1), *args, **kwargs)
-                return _call
+                method = method_factory(m.group(1))
+                method.__name__ = str(method_name)
+                method.generated_permission_method = True
+                setattr(cls, method_name, method)
+                return method
+        return None
+
+    @classmethod
+    def _generate_permission_methods(cls):
+        """
+        Generates _check_<name>_permission and can_call_<name> methods for all allowed methods and all implemented
+        has_<name>_permission methods, the names of the has permission methods are stored to the class too.
+        """
+        permission_names = set(cls.allowed_methods or ())
+        for attr_name in dir(cls):
+            m = HAS_PERMISSION_RE.match(attr_name)
+            if m:
+                permission_names.add(m.group(1))
+
+        cls._has_permission_method_names = {
+            name: 'has_{}_permission'.format(name) for name in permission_names
+        }
+        for name in permission_names:
+            cls._generate_permission_method('_check_{}_permission'.format(name))
+            cls._generate_permission_method('can_call_{}'.format(name))
+
+    def __getattr__(self, name):
+        if not name.startswith('__'):
+            method = self.__class__._generate_permission_method(name)
+            if method is not None:
+                return getattr(self, name)
         raise AttributeError('%r object has no attribute %r' % (self.__class__, name))
 
     def has_get_permission(self, **kwargs):
@@ -141,6 +219,9 @@ class PermissionsResourceMixin(object):
     def has_put_permission(self, **kwargs):
         return 'put' in self.allowed_methods and hasattr(self, 'put')
 
+    def has_patch_permission(self, **kwargs):
+        return 'patch' in self.allowed_methods and hasattr(self, 'patch')
+
     def has_delete_permission(self, **kwargs):
         return 'delete' in self.allowed_methods and hasattr(self, 'delete')
 
@@ -162,21 +243,29 @@ class BaseResource(six.with_metaclass(ResourceMetaClass, PermissionsResourceMixi
     resource. Use this for checking `request.user`, etc.
     """
 
+    SAFE_METHODS = {'get', 'head', 'options'}
+
     allowed_methods = ('get', 'post', 'put', 'delete', 'head', 'options')
     serializer = ResourceSerializer
     register = False
     abstract = True
     csrf_exempt = True
     cache = None
+    idempotency_cache = None
     paginator = Paginator
+    # Allow and X-Fields-Options headers are computed only for OPTIONS requests or when requested by client
+    options_headers_on_demand = False
 
     DEFAULT_REST_CONTEXT_MAPPING = {
         'serialization_format': ('HTTP_X_SERIALIZATION_FORMAT', '_serialization_format'),
         'fields': ('HTTP_X_FIELDS', '_fields'),
         'offset': ('HTTP_X_OFFSET', '_offset'),
         'base': ('HTTP_X_BASE', '_base'),
+        'total': ('HTTP_X_TOTAL', '_total'),
+        'cursor': ('HTTP_X_CURSOR', '_cursor'),
         'accept': ('HTTP_ACCEPT', '_accept'),
         'content_type': ('CONTENT_TYPE', '_content_type'),
+        'fields_options': ('HTTP_X_FIELDS_OPTIONS', '_fields_options'),
     }
 
     def __init__(self, request):
@@ -184,6 +273,21 @@ class BaseResource(six.with_metaclass(ResourceMetaClass, PermissionsResourceMixi
         self.args = []
         self.kwargs = {}
 
+    def _get_from_request_cache(self, key, get_value):
+        """
+        Returns value memoized on the resource instance for the duration of the request
+        """
+        request_cache = self.__dict__.setdefault('_request_cache', {})
+        if key not in request_cache:
+            request_cache[key] = get_value()
+        return request_cache[key]
+
+    def _clear_request_cache(self):
+        """
+        Invalidates values memoized for the request, it must be called after every change of the resource data
+        """
+        self.__dict__.setdefault('_request_cache', {}).clear()
+
     def _flatten_dict(self, dct):
         return {str(k): dct.get(k) for k in dct.keys()} if isinstance(dct, dict) else {}
 
@@ -201,28 +305,75 @@ class BaseResource(six.with_metaclass(ResourceMetaClass, PermissionsResourceMixi
         return self.get()
 
     def _get_cors_allowed_headers(self):
-        return ('X-Base', 'X-Offset', 'X-Fields', 'origin', 'content-type', 'accept')
+        """
+        Preflight response headers are cached per resource class, the result must not depend on the request
+        """
+        return ('X-Base', 'X-Offset', 'X-Cursor', 'X-Fields', 'X-Total', 'X-Fields-Options', 'Idempotency-Key',
+                'origin', 'content-type', 'accept')
 
     def _get_cors_allowed_exposed_headers(self):
-        return ('X-Total', 'X-Serialization-Format-Options', 'X-Fields-Options')
+        """
+        Preflight response headers are cached per resource class, the result must not depend on the request
+        """
+        return ('X-Total', 'X-Total-Approximate', 'X-Next-Cursor', 'X-Prev-Cursor', 'X-Serialization-Format-Options',
+                'X-Fields-Options', 'Idempotent-Replayed')
 
     def _get_cors_origins_whitelist(self):
         return settings.CORS_WHITELIST
 
     def _get_cors_max_age(self):
+        """
+        Preflight response headers are cached per resource class, the result must not depend on the request
+        """
         return settings.CORS_MAX_AGE
 
+    def _get_compiled_cors_origins_whitelist(self):
+        return get_cors_origins_whitelist(tuple(self._get_cors_origins_whitelist()))
+
     def _cors_is_origin_in_whitelist(self, origin):
-        if not origin:
-            return False
-        else:
-            url = urlparse(origin)
-            return url.netloc in self._get_cors_origins_whitelist() or self._regex_domain_match(origin)
+        return self._get_compiled_cors_origins_whitelist().is_allowed(origin)
 
     def _regex_domain_match(self, origin):
-        for domain_pattern in self._get_cors_origins_whitelist():
-            if re.match(domain_pattern, origin):
-                return origin
+        if self._get_compiled_cors_origins_whitelist().match_pattern(origin):
+            return origin
+
+    def _is_cors_preflight_request(self):
+        return (
+            settings.CORS and self.request.method.upper() == 'OPTIONS' and 'options' in self.allowed_methods and
+            bool(self.request.META.get('HTTP_ORIGIN')) and
+            'HTTP_ACCESS_CONTROL_REQUEST_METHOD' in self.request.META
+        )
+
+    def _get_cors_preflight_headers(self):
+        """
+        Returns origin independent headers of the CORS preflight response, headers are precomputed per resource class
+        """
+        http_headers = cors_preflight_headers.get(self.__class__)
+        if http_headers is None:
+            http_headers = {
+                ACCESS_CONTROL_ALLOW_CREDENTIALS: 'true' if settings.CORS_ALLOW_CREDENTIALS else 'false',
+                ACCESS_CONTROL_ALLOW_HEADERS: ', '.join(self._get_cors_allowed_headers()),
+                ACCESS_CONTROL_MAX_AGE: str(self._get_cors_max_age()),
+            }
+            cors_allowed_exposed_headers = self._get_cors_allowed_exposed_headers()
+            if cors_allowed_exposed_headers:
+                http_headers[ACCESS_CONTROL_EXPOSE_HEADERS] = ', '.join(cors_allowed_exposed_headers)
+            cors_preflight_headers[self.__class__] = http_headers
+        return http_headers
+
+    def _get_cors_preflight_response(self):
+        """
+        CORS preflight request is sent by browser without credentials, therefore it is answered without request data
+        processing, permissions checks or database queries
+        """
+        origin = self.request.META['HTTP_ORIGIN']
+        http_headers = self._get_cors_preflight_headers().copy()
+        http_headers[ACCESS_CONTROL_ALLOW_METHODS] = self.request.META['HTTP_ACCESS_CONTROL_REQUEST_METHOD']
+        if self._cors_is_origin_in_whitelist(origin):
+            http_headers[ACCESS_CONTROL_ALLOW_ORIGIN] = origin
+        response = HttpResponse()
+        self._set_response_headers(response, http_headers)
+        return response
 
     def options(self):
         if settings.CORS and self.request.META.get('HTTP_ORIGIN'):
@@ -239,6 +390,12 @@ class BaseResource(six.with_metaclass(ResourceMetaClass, PermissionsResourceMixi
             result, self._get_serialization_format(), lazy=True
         )
 
+    def _get_content_type(self):
+        try:
+            return get_converter_from_request(self.request).content_type
+        except ValueError:
+            raise UnsupportedMediaTypeException
+
     def _serialize(self, os, result, status_code, http_headers):
         try:
             converter = get_converter_from_request(self.request)
@@ -256,7 +413,8 @@ class BaseResource(six.with_metaclass(ResourceMetaClass, PermissionsResourceMixi
         if rm == 'PUT':
             coerce_put_post(self.request)
 
-        if rm in {'POST', 'PUT'}:
+        # DELETE request can contain data only for bulk removal
+        if rm in {'POST', 'PUT', 'PATCH'} or (rm == 'DELETE' and self.request.body):
             try:
                 converter = get_converter_from_request(self.request, True)
                 self.request.data = self.serializer(self).deserialize(converter.decode(force_text(self.request.body)))
@@ -293,7 +451,11 @@ class BaseResource(six.with_metaclass(ResourceMetaClass, PermissionsResourceMixi
                 result = self._get_error_response(NotAllowedMethodException())
             else:
                 self._check_permission(rm)
-                result = meth()
+                try:
+                    result = meth()
+                finally:
+                    if rm not in self.SAFE_METHODS:
+                        self._clear_request_cache()
         except (MimerDataException, NotAllowedException, UnsupportedMediaTypeException, Http404, ConflictException) as ex:
             result = self._get_error_response(ex)
             fieldset = False
@@ -318,7 +480,7 @@ class BaseResource(six.with_metaclass(ResourceMetaClass, PermissionsResourceMixi
             return self.cache.get_response(self.request)
 
     def _store_to_cache(self, response):
-        if self.cache and response.status_code < 400:
+        if self.cache and response.status_code < 400 and response.status_code != 304:
             self.cache.cache_response(self.request, response)
 
     def _get_headers_queryset_context_mapping(self):
@@ -332,9 +494,19 @@ class BaseResource(six.with_metaclass(ResourceMetaClass, PermissionsResourceMixi
                 context[key] = val
         return context
 
+    def _render_not_modified_response(self, http_headers):
+        response = HttpResponseNotModified()
+        http_headers = http_headers.copy()
+        http_headers.update(self._get_cache_control_headers())
+        http_headers['Vary'] = 'Accept'
+        self._set_response_headers(response, http_headers)
+        return response
+
     def render_response(self, result, http_headers, status_code, fieldset):
         if isinstance(result, HttpResponseBase):
             return result
+        elif status_code == 304:
+            return self._render_not_modified_response(http_headers)
         else:
             if not fieldset and 'fields' in self.request._rest_context:
                 del self.request._rest_context['fields']
@@ -342,7 +514,11 @@ class BaseResource(six.with_metaclass(ResourceMetaClass, PermissionsResourceMixi
             try:
                 response.status_code = status_code
                 http_headers = self._get_headers(http_headers)
-                self._serialize(response, result, status_code, http_headers)
+                if self.request.method.upper() == 'HEAD':
+                    # Body of the HEAD response is not sent, therefore the result is not serialized
+                    http_headers['Content-Type'] = self._get_content_type()
+                else:
+                    self._serialize(response, result, status_code, http_headers)
             except UnsupportedMediaTypeException:
                 response.status_code = 415
                 http_headers['Content-Type'] = self.request.get('HTTP_ACCEPT')
@@ -351,34 +527,142 @@ class BaseResource(six.with_metaclass(ResourceMetaClass, PermissionsResourceMixi
             return response
 
     def dispatch(self, request, *args, **kwargs):
+        if self._is_cors_preflight_request():
+            return self._get_cors_preflight_response()
+
         set_rest_context_to_request(request, self._get_headers_queryset_context_mapping())
         response = self._get_from_cache()
         if response:
             return response
+
+        idempotency_key = self._get_idempotency_key()
+        if idempotency_key:
+            return self._get_idempotent_response(idempotency_key)
         else:
             response = self.render_response(*self._get_response_data())
             self._store_to_cache(response)
             return response
 
+    def _get_idempotency_key(self):
+        idempotency_key = self.request.META.get('HTTP_IDEMPOTENCY_KEY')
+        if self.idempotency_cache and idempotency_key:
+            return self.idempotency_cache.get_key(self.request, idempotency_key)
+        return None
+
+    def _render_error_response(self, exception):
+        result = self._get_error_response(exception)
+        return self.render_response(result._container, {}, result.status_code, False)
+
+    def _get_idempotent_response(self, key):
+        """
+        Replays stored response of the request with the same idempotency key, otherwise the request is processed
+        under the key lock and its response is stored
+        """
+        idempotency_cache = self.idempotency_cache
+        fingerprint = idempotency_cache.get_fingerprint(self.request)
+
+        stored_response = idempotency_cache.get_response(key)
+        if stored_response is None and not idempotency_cache.acquire(key):
+            stored_response = idempotency_cache.wait_for_response(key)
+            if stored_response is None and not idempotency_cache.acquire(key):
+                return self._render_error_response(ConflictException())
+
+        if stored_response is None:
+            try:
+                # Response could be stored before the lock was acquired
+                stored_response = idempotency_cache.get_response(key)
+                if stored_response is None:
+                    response = self.render_response(*self._get_response_data())
+                    idempotency_cache.store_response(key, fingerprint, response)
+                    return response
+            finally:
+                idempotency_cache.release(key)
+
+        if stored_response['fingerprint'] != fingerprint:
+            # The same idempotency key cannot be reused with a different request data
+            return self._render_error_response(ConflictException())
+        return idempotency_cache.replay_response(stored_response)
+
     def get_name(self):
         return 'resource'
 
     def _get_filename(self):
         return '{}.{}'.format(self.get_name(), get_converter_name_from_request(self.request))
 
+    def _get_request_allowed_methods(self):
+        return self._get_from_request_cache('allowed_methods', self.get_allowed_methods)
+
     def _get_allow_header(self):
-        return ','.join((method.upper() for method in self.get_allowed_methods()))
+        return ','.join((method.upper() for method in self._get_request_allowed_methods()))
+
+    def _is_method_allowed(self):
+        method = self.request.method.lower()
+        return method in self.allowed_methods and hasattr(self, method)
+
+    def _are_options_headers_requested(self):
+        """
+        Returns True if headers that describe resource options (Allow, X-Fields-Options) should be returned, the
+        headers require evaluation of all permissions
+        """
+        return (
+            not self.options_headers_on_demand or self.request.method.upper() == 'OPTIONS' or
+            'fields_options' in self.request._rest_context
+        )
+
+    def _get_cache_control_headers(self):
+        """
+        Returns headers that define cache policy of the resource responses
+        """
+        return {
+            'Cache-Control': 'private, no-cache, no-store, max-age=0',
+            'Pragma': 'no-cache',
+            'Expires': '0',
+        }
+
+    def _get_etag(self, version):
+        """
+        ETag is generated from the resource version and all request values that can change the response content
+        """
+        return '"{}"'.format(hashlib.md5(force_bytes('{}|{}|{}'.format(
+            version, self.request.get_full_path(), sorted(self.request._rest_context.items())
+        ))).hexdigest())
+
+    def _get_validators_headers(self, version=None, last_modified=None):
+        http_headers = {}
+        if version is not None:
+            http_headers['ETag'] = self._get_etag(version)
+        if last_modified is not None:
+            http_headers['Last-Modified'] = http_date(timegm(last_modified.utctimetuple()))
+        return http_headers
+
+    def _is_not_modified(self, validators_headers):
+        """
+        Evaluates request preconditions If-None-Match and If-Modified-Since against the response validators
+        """
+        if self.request.method.upper() not in {'GET', 'HEAD'}:
+            return False
+
+        etag = validators_headers.get('ETag')
+        if_none_match = self.request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            return etag is not None and (if_none_match.strip() == '*' or etag in parse_etags(if_none_match))
+
+        last_modified = validators_headers.get('Last-Modified')
+        if_modified_since = parse_http_date_safe(self.request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return (
+            last_modified is not None and if_modified_since is not None and
+            parse_http_date_safe(last_modified) <= if_modified_since
+        )
 
     def _get_headers(self, default_http_headers):
         origin = self.request.META.get('HTTP_ORIGIN')
 
         http_headers = default_http_headers.copy()
         http_headers['X-Serialization-Format-Options'] = ','.join(self.serializer.SERIALIZATION_TYPES)
-        http_headers['Cache-Control'] = 'private, no-cache, no-store, max-age=0'
-        http_headers['Pragma'] = 'no-cache'
-        http_headers['Expires'] = '0'
+        http_headers.update(self._get_cache_control_headers())
         http_headers['Content-Disposition'] = 'inline; filename="{}"'.format(self._get_filename())
-        http_headers['Allow'] = self._get_allow_header()
+        if self._are_options_headers_requested() or not self._is_method_allowed():
+            http_headers['Allow'] = self._get_allow_header()
         http_headers['Vary'] = 'Accept'
 
         if settings.CORS:
@@ -521,6 +805,12 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
     pk_name = 'pk'
     pk_field_name = 'id'
     abstract = True
+    allow_bulk_create = False
+    allow_bulk_update = False
+    allow_bulk_delete = False
+    # Nested related objects sent in collections are saved and removed together with batch hooks instead of one
+    # by one, all objects are validated before any of them is saved
+    batch_nested_writes = False
 
     def _serialize(self, os, result, status_code, http_headers):
         try:
@@ -542,19 +832,26 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
     def _get_requested_fieldset(self, result):
         requested_fields = self.request._rest_context.get('fields')
         if requested_fields:
-            return RFS.create_from_string(requested_fields)
+            return FRFS.create_from_string(requested_fields)
         elif isinstance(result, Model):
-            return self.get_detailed_fields_rfs(obj=result)
+            return frfs(self.get_detailed_fields_rfs(obj=result))
         elif isinstance(result, QuerySet):
-            return self.get_general_fields_rfs()
+            return frfs(self.get_general_fields_rfs())
         else:
             return None
 
     def _get_obj_or_none(self, pk=None):
         raise NotImplementedError
 
+    def _get_request_obj_or_none(self, pk=None):
+        """
+        Returns object loaded with _get_obj_or_none, the object is memoized for the duration of the request
+        """
+        pk = pk or self._get_pk()
+        return self._get_from_request_cache(('obj', pk), lambda: self._get_obj_or_none(pk))
+
     def _get_obj_or_404(self, pk=None):
-        obj = self._get_obj_or_none(pk)
+        obj = self._get_request_obj_or_none(pk)
         if not obj:
             raise Http404
         return obj
@@ -562,15 +859,23 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
     def render_response(self, result, http_headers, status_code, fieldset):
         return super(BaseObjectResource, self).render_response(result, http_headers, status_code, fieldset)
 
-    def _get_allowed_fields_options_header(self):
-        return ','.join(self.get_allowed_fields_rfs(self._get_obj_or_none()).flat())
+    def _get_request_allowed_fields_rfs(self):
+        return self._get_from_request_cache(
+            'allowed_fields_rfs', lambda: self.get_allowed_fields_rfs(self._get_request_obj_or_none())
+        )
 
-    def _get_allow_header(self):
-        return ','.join((method.upper() for method in self.get_allowed_methods(obj=self._get_obj_or_none())))
+    def _get_request_allowed_methods(self):
+        return self._get_from_request_cache(
+            'allowed_methods', lambda: self.get_allowed_methods(obj=self._get_request_obj_or_none())
+        )
+
+    def _get_allowed_fields_options_header(self):
+        return ','.join(self._get_request_allowed_fields_rfs().flat())
 
     def _get_headers(self, default_http_headers):
         http_headers = super(BaseObjectResource, self)._get_headers(default_http_headers)
-        http_headers['X-Fields-Options'] = self._get_allowed_fields_options_header()
+        if self._are_options_headers_requested():
+            http_headers['X-Fields-Options'] = self._get_allowed_fields_options_header()
         return http_headers
 
     def _get_queryset(self):
@@ -609,15 +914,35 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
         """
         raise NotImplementedError
 
+    def _get_obj_validators(self, obj):
+        """
+        May return cheap object version and last modification datetime used for the conditional GET
+        """
+        return None, None
+
+    def _get_queryset_validators(self, qs):
+        """
+        May return cheap queryset version and last modification datetime used for the conditional GET
+        """
+        return None, None
+
     def _get_pk(self):
         return self.kwargs.get(self.pk_name)
 
+    def _is_bulk_request(self, allow_bulk):
+        return allow_bulk and not self._get_pk() and isinstance(getattr(self.request, 'data', None), list)
+
     def post(self):
+        if self._is_bulk_request(self.allow_bulk_create):
+            return self._post_bulk()
+
         pk = self._get_pk()
         data = self.get_dict_data()
+        # Primary key from the URL is not part of the data, object with this key cannot be created again
         if pk and self._exists_obj(pk=pk):
             raise DuplicateEntryException
         try:
+            self._prefetch_url_files(data)
             return RESTCreatedResponse(self._atomic_create_or_update(data))
         except DataInvalidException as ex:
             return RESTErrorsResponse(ex.errors)
@@ -625,27 +950,54 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
             raise
         except (RESTException, PersistenceException) as ex:
             return RESTErrorResponse(ex.message)
+        finally:
+            self._close_prefetched_url_files()
+
+    def _post_bulk(self):
+        try:
+            self._prefetch_url_files(self.request.data)
+            return RESTCreatedResponse(self._atomic_bulk_create(self.request.data))
+        except DataInvalidException as ex:
+            return RESTErrorsResponse(ex.errors)
+        except NotAllowedException:
+            raise
+        except (RESTException, PersistenceException) as ex:
+            return RESTErrorResponse(ex.message)
+        finally:
+            self._close_prefetched_url_files()
 
     def get(self):
         pk = self._get_pk()
         if pk:
-            return self._get_obj_or_404(pk=pk)
+            obj = self._get_obj_or_404(pk=pk)
+            http_headers = self._get_validators_headers(*self._get_obj_validators(obj))
+            if self._is_not_modified(http_headers):
+                return RESTNotModifiedResponse(http_headers)
+            return HeadersResponse(obj, http_headers)
         try:
             qs = self._preload_queryset(self._get_queryset().all())
             qs = self._filter_queryset(qs)
             qs = self._order_queryset(qs)
+            http_headers = self._get_validators_headers(*self._get_queryset_validators(qs))
+            if self._is_not_modified(http_headers):
+                return RESTNotModifiedResponse(http_headers)
             paginator = self.paginator(qs, self.request)
-            return HeadersResponse(paginator.page_qs, paginator.headers)
+            http_headers.update(paginator.headers)
+            return HeadersResponse(paginator.page_qs, http_headers)
         except (RESTException, PersistenceException) as ex:
             return RESTErrorResponse(ex.message)
         except Http404:
             raise
 
     def put(self):
+        if self._is_bulk_request(self.allow_bulk_update):
+            return self._put_bulk()
+
         pk = self._get_pk()
         data = self.get_dict_data()
         data[self.pk_field_name] = pk
         try:
+            self._prefetch_url_files(data, pk)
             return self._atomic_create_or_update(data)
         except DataInvalidException as ex:
             return RESTErrorsResponse(ex.errors)
@@ -657,8 +1009,47 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
             raise
         except (RESTException, PersistenceException) as ex:
             return RESTErrorResponse(ex.message)
+        finally:
+            self._close_prefetched_url_files()
+
+    def patch(self):
+        """
+        Partial update, only sent fields are validated and saved. Object permissions are checked with PUT permission.
+        """
+        pk = self._get_pk()
+        data = self.get_dict_data()
+        data[self.pk_field_name] = pk
+        try:
+            self._prefetch_url_files(data, pk)
+            return self._atomic_create_or_update(data, partial=True)
+        except DataInvalidException as ex:
+            return RESTErrorsResponse(ex.errors)
+        except ConflictException:
+            raise Http404
+        except NotAllowedException:
+            raise
+        except (RESTException, PersistenceException) as ex:
+            return RESTErrorResponse(ex.message)
+        finally:
+            self._close_prefetched_url_files()
+
+    def _put_bulk(self):
+        try:
+            self._prefetch_url_files(self.request.data)
+            return self._atomic_bulk_update(self.request.data)
+        except DataInvalidException as ex:
+            return RESTErrorsResponse(ex.errors)
+        except NotAllowedException:
+            raise
+        except (RESTException, PersistenceException) as ex:
+            return RESTErrorResponse(ex.message)
+        finally:
+            self._close_prefetched_url_files()
 
     def delete(self):
+        if self._is_bulk_request(self.allow_bulk_delete):
+            return self._delete_bulk()
+
         try:
             pk = self.kwargs.get(self.pk_name)
             self._delete(pk)
@@ -666,6 +1057,85 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
         except (RESTException, PersistenceException) as ex:
             return RESTErrorResponse(ex.message)
 
+    def _delete_bulk(self):
+        try:
+            self._atomic_bulk_delete(self.request.data)
+            return RESTNoConetentResponse()
+        except DataInvalidException as ex:
+            return RESTErrorsResponse(ex.errors)
+        except NotAllowedException:
+            raise
+        except (RESTException, PersistenceException) as ex:
+            return RESTErrorResponse(ex.message)
+
+    def _get_objs_in_bulk(self, pks):
+        """
+        Should contain implementation for loading objects with the given primary keys, returns dict of objects with
+        primary key converted to text as a key
+        """
+        raise NotImplementedError
+
+    def _get_pk_key(self, pk):
+        """
+        Returns primary key in the form of keys of dict returned from _get_objs_in_bulk
+        """
+        return force_text(pk)
+
+    def _get_bulk_obj(self, objs, pk):
+        obj = objs.get(self._get_pk_key(pk)) if pk is not None else None
+        if obj is None:
+            raise DataInvalidException({'error': ugettext('Object does not exist')})
+        return obj
+
+    @transaction.atomic
+    def _atomic_bulk_delete(self, pks):
+        """
+        Atomic bulk objects removal
+        """
+        return self._bulk_delete(pks)
+
+    def _bulk_delete(self, pks, via=None):
+        """
+        Helper for removing more resource objects at once, objects are loaded together and permissions of all objects
+        are checked before removing
+        """
+        via = via or []
+        pks = [pk.get(self.pk_field_name) if isinstance(pk, dict) else pk for pk in pks]
+        loaded_objs = self._get_objs_in_bulk(pks)
+
+        errors = []
+        objs = []
+        for i, pk in enumerate(pks):
+            try:
+                obj = self._get_bulk_obj(loaded_objs, pk)
+                self._check_delete_permission(obj=obj, via=via)
+                objs.append(obj)
+            except NotAllowedException:
+                raise
+            except (DataInvalidException, RESTException) as ex:
+                obj_errors = ex.errors
+                obj_errors['_index'] = i
+                errors.append(obj_errors)
+
+        if errors:
+            raise DataInvalidException(errors)
+
+        self._pre_delete_objs(objs)
+        self._delete_objs(objs)
+        self._post_delete_objs(objs)
+
+    def _pre_delete_objs(self, objs):
+        for obj in objs:
+            self._pre_delete_obj(obj)
+
+    def _delete_objs(self, objs):
+        for obj in objs:
+            self._delete_obj(obj)
+
+    def _post_delete_objs(self, objs):
+        for obj in objs:
+            self._post_delete_obj(obj)
+
     def _delete(self, pk, via=None):
         via = via or []
         obj = self._get_obj_or_404(pk)
@@ -673,6 +1143,7 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
         self._pre_delete_obj(obj)
         self._delete_obj(obj)
         self._post_delete_obj(obj)
+        self._clear_request_cache()
 
     def _pre_delete_obj(self, obj):
         pass
@@ -683,12 +1154,44 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
     def _post_delete_obj(self, obj):
         pass
 
+    def _prefetch_url_files(self, data, pk=None):
+        """
+        Downloads files referenced by URL in the file fields of the request data concurrently before the transaction
+        is started. Files of an existing object are prefetched only if the user has permission to change it. At most
+        FILE_URL_PREFETCH_MAX_COUNT files are prefetched, the rest is downloaded when the data is processed.
+        """
+        from pyston.data_processor import FileDataPreprocessor
+        from pyston.utils.files import get_url_file_items, get_files_content_from_urls
+
+        if not get_url_file_items(data):
+            return
+
+        inst = self._get_request_obj_or_none(pk) if pk else None
+        if inst is not None and not self.can_call_put(obj=inst):
+            return
+
+        urls = get_url_file_items(data, FileDataPreprocessor.get_processed_field_names(self, self._get_form(inst=inst)))
+        urls = list(OrderedDict.fromkeys(urls))[:settings.FILE_URL_PREFETCH_MAX_COUNT]
+        if urls:
+            self.request._prefetched_url_files = get_files_content_from_urls(urls, settings.FILE_SIZE_LIMIT)
+
+    def _close_prefetched_url_files(self):
+        """
+        Closes prefetched files which were not used by any field
+        """
+        prefetched_url_files = getattr(self.request, '_prefetched_url_files', None)
+        if prefetched_url_files:
+            from pyston.utils.files import close_files_content
+
+            close_files_content(prefetched_url_files)
+            self.request._prefetched_url_files = {}
+
     @transaction.atomic
-    def _atomic_create_or_update(self, data):
+    def _atomic_create_or_update(self, data, partial=False):
         """
         Atomic object creation
         """
-        return self._create_or_update(data)
+        return self._create_or_update(data, partial=partial)
 
     def _get_instance(self, data):
         """
@@ -699,7 +1202,7 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
     def _generate_form_class(self, inst, exclude=None):
         return self.form_class
 
-    def _get_form(self, fields=None, inst=None, data=None, files=None, initial=None):
+    def _get_form(self, fields=None, inst=None, data=None, files=None, initial=None, partial=False):
         # When is send PUT (resource instance exists), it is possible send only changed values.
         initial = {} if initial is None else initial
         exclude = []
@@ -710,6 +1213,8 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
         if data is not None:
             kwargs['data'] = data
             kwargs['files'] = files
+        if partial:
+            kwargs['partial'] = True
 
         form_class = self._generate_form_class(inst, exclude)
         return form_class(initial=initial, **kwargs)
@@ -725,31 +1230,46 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
 
         return not change or self.has_put_permission(obj=obj, via=via)
 
-    def _create_or_update(self, data, via=None):
+    def _get_valid_form(self, inst, data, via, partial=False):
         """
-        Helper for creating or updating resource
+        Returns validated form with data and files processed by data preprocessors
         """
-        from pyston.data_processor import data_preprocessors, data_postprocessors
-
-        if via is None:
-            via = []
-
-        inst = self._get_instance(data)
-        change = inst and True or False
+        from pyston.data_processor import data_preprocessors
 
         files = self.request.FILES.copy()
 
-        form = self._get_form(inst=inst, data=data, initial=self._get_form_initial(inst))
+        form = self._get_form(inst=inst, data=data, initial=self._get_form_initial(inst), partial=partial)
 
-        for preprocessor in data_preprocessors.get_processors(type(self)):
-            data, files = preprocessor(self, form, inst, via).process_data(data, files)
+        for preprocessor, field_names in data_preprocessors.get_data_processors(self, form, data):
+            data, files = preprocessor(self, form, inst, via).process_data(data, files, field_names)
 
         form = self._get_form(fields=form.fields.keys(), inst=inst, data=data, files=files,
-                              initial=self._get_form_initial(inst))
+                              initial=self._get_form_initial(inst), partial=partial)
 
         errors = form.is_invalid()
         if errors:
             raise DataInvalidException(errors)
+        return form, data, files
+
+    def _postprocess_data(self, inst, form, data, files, via):
+        from pyston.data_processor import data_postprocessors
+
+        for postprocessor, field_names in data_postprocessors.get_data_processors(self, form, data):
+            data, files = postprocessor(self, form, inst, via).process_data(data, files, field_names)
+
+    def _create_or_update(self, data, via=None, partial=False):
+        """
+        Helper for creating or updating resource, partial update requires existing object
+        """
+        if via is None:
+            via = []
+
+        inst = self._get_instance(data)
+        change = inst and True or False
+        if partial and not change:
+            raise Http404
+
+        form, data, files = self._get_valid_form(inst, data, via, partial)
 
         inst = form.save(commit=False)
 
@@ -761,13 +1281,138 @@ class BaseObjectResource(DefaultRESTObjectResource, BaseResource):
                 form.save_m2m()
 
         if inst.pk:
-            for preprocessor in data_postprocessors.get_processors(type(self)):
-                data, files = preprocessor(self, form, inst, via).process_data(data, files)
+            self._postprocess_data(inst, form, data, files, via)
 
         if can_save_obj:
             self._post_save_obj(inst, form, change)
         return inst
 
+    @transaction.atomic
+    def _atomic_bulk_create(self, data_list):
+        """
+        Atomic bulk objects creation
+        """
+        return self._bulk_create(data_list)
+
+    @transaction.atomic
+    def _atomic_bulk_update(self, data_list):
+        """
+        Atomic bulk objects update
+        """
+        return self._bulk_update(data_list)
+
+    def _bulk_create(self, data_list, via=None):
+        """
+        Helper for creating more resource objects at once
+        """
+        def get_instance(data):
+            if self._get_instance(data):
+                raise DuplicateEntryException
+
+        return self._bulk_save(data_list, get_instance, via)
+
+    def _bulk_update(self, data_list, via=None):
+        """
+        Helper for updating more resource objects at once, objects are loaded together with one query
+        """
+        loaded_objs = self._get_objs_in_bulk([
+            data.get(self.pk_field_name) for data in data_list if isinstance(data, dict)
+        ])
+        return self._bulk_save(
+            data_list, lambda data: self._get_bulk_obj(loaded_objs, data.get(self.pk_field_name)), via
+        )
+
+    def _bulk_create_or_update(self, data_list, via=None):
+        """
+        Helper for creating or updating more resource objects at once (object is updated if data contains its
+        primary key)
+        """
+        return self._bulk_save(data_list, self._get_instance_getter(data_list), via)
+
+    def _get_instance_getter(self, data_list):
+        """
+        Returns function that returns instance according to input data values, it can preload instances for all data
+        """
+        return self._get_instance
+
+    def _bulk_save(self, data_list, get_instance, via=None):
+        """
+        All objects are validated and permissions are checked firstly, errors are returned with index of the invalid
+        object. Valid objects are saved together with batch hooks.
+        """
+        if via is None:
+            via = []
+
+        errors = []
+        prepared_objs = []
+        prepared_indexes = []
+        for i, data in enumerate(data_list):
+            try:
+                if not isinstance(data, dict):
+                    raise DataInvalidException({'error': ugettext('Data must be object')})
+                inst = get_instance(data)
+                change = inst is not None
+                form, data, files = self._get_valid_form(inst, data, via)
+                inst = form.save(commit=False)
+                can_save_obj = self._can_save_obj(change, inst, form, via)
+                prepared_objs.append((inst, form, data, files, change, can_save_obj))
+                prepared_indexes.append(i)
+            except NotAllowedException:
+                raise
+            except (DataInvalidException, RESTException) as ex:
+                obj_errors = ex.errors
+                obj_errors['_index'] = i
+                errors.append(obj_errors)
+
+        unique_errors = self._get_unique_errors_in_bulk([inst for inst, _, _, _, _, _ in prepared_objs])
+        for i, obj_errors in zip(prepared_indexes, unique_errors):
+            if obj_errors:
+                obj_errors['_index'] = i
+                errors.append(obj_errors)
+
+        if errors:
+            raise DataInvalidException(sorted(errors, key=lambda obj_errors: obj_errors['_index']))
+
+        saved_objs_by_change = [
+            (change, [(inst, form) for inst, form, _, _, obj_change, can_save_obj in prepared_objs
+                      if obj_change == change and can_save_obj])
+            for change in (False, True)
+        ]
+        for change, saved_objs in saved_objs_by_change:
+            if saved_objs:
+                objs, forms = zip(*saved_objs)
+                self._pre_save_objs(list(objs), list(forms), change)
+                self._save_objs(list(objs), list(forms), change)
+        for inst, form, data, files, _, can_save_obj in prepared_objs:
+            if can_save_obj and hasattr(form, 'save_m2m'):
+                form.save_m2m()
+            if inst.pk:
+                self._postprocess_data(inst, form, data, files, via)
+        for change, saved_objs in saved_objs_by_change:
+            if saved_objs:
+                objs, forms = zip(*saved_objs)
+                self._post_save_objs(list(objs), list(forms), change)
+        return [inst for inst, _, _, _, _, _ in prepared_objs]
+
+    def _get_unique_errors_in_bulk(self, objs):
+        """
+        Should return list of errors (or None) of objects which are not unique within the saved objects, objects are
+        validated against the stored objects by forms
+        """
+        return [None] * len(objs)
+
+    def _pre_save_objs(self, objs, forms, change):
+        for obj, form in zip(objs, forms):
+            self._pre_save_obj(obj, form, change)
+
+    def _save_objs(self, objs, forms, change):
+        for obj, form in zip(objs, forms):
+            self._save_obj(obj, form, change)
+
+    def _post_save_objs(self, objs, forms, change):
+        for obj, form in zip(objs, forms):
+            self._post_save_obj(obj, form, change)
+
     def _pre_save_obj(self, obj, form, change):
         pass
 
@@ -784,6 +1429,17 @@ class BaseModelResource(DefaultRESTModelResource, BaseObjectResource):
     abstract = True
     form_class = RESTModelForm
     serializer = ModelResourceSerializer
+    last_modified_field = None
+    serialized_obj_cache = None
+    bulk_create_batch_size = 100
+    bulk_update_batch_size = 100
+    # Objects created in bulk are saved with bulk_create, model save method is not called and signals are not sent
+    use_bulk_create = False
+    # Objects updated in bulk are saved with bulk_update (Django 2.2 or higher), model save method is not called and
+    # signals are not sent
+    use_bulk_update = False
+    # Objects removed in bulk are deleted with one queryset delete, model delete method is not called
+    use_queryset_delete = False
 
     def _get_queryset(self):
         return self.model.objects.all()
@@ -797,11 +1453,177 @@ class BaseModelResource(DefaultRESTModelResource, BaseObjectResource):
     def _exists_obj(self, **kwargs):
         return self.model.objects.filter(**kwargs).exists()
 
+    def _get_obj_validators(self, obj):
+        if self.last_modified_field:
+            last_modified = getattr(obj, self.last_modified_field)
+            return '{}:{}'.format(obj.pk, last_modified.isoformat() if last_modified else None), last_modified
+        else:
+            return None, None
+
+    def _get_queryset_validators(self, qs):
+        if self.last_modified_field:
+            aggregation = qs.aggregate(last_modified=Max(self.last_modified_field), count=Count('pk'))
+            last_modified = aggregation['last_modified']
+            return (
+                '{}:{}'.format(aggregation['count'], last_modified.isoformat() if last_modified else None),
+                last_modified
+            )
+        else:
+            return None, None
+
     def _delete_obj(self, obj):
         obj.delete()
 
+    def _get_update_fields(self, obj, form, change):
+        """
+        Returns names of saved fields, partial update saves only changed fields. Override it if fields changed in
+        _pre_save_obj should be saved too.
+        """
+        if not change or not getattr(form, 'partial', False):
+            return None
+
+        changed_field_names = set(form.changed_data)
+        concrete_fields = [field for field in obj._meta.concrete_fields if not field.primary_key]
+        update_fields = [field.name for field in concrete_fields if field.name in changed_field_names]
+        if update_fields:
+            update_fields += [
+                field.name for field in concrete_fields
+                if getattr(field, 'auto_now', False) and field.name not in changed_field_names
+            ]
+        return update_fields
+
     def _save_obj(self, obj, form, change):
-        obj.save()
+        obj.save(update_fields=self._get_update_fields(obj, form, change))
+
+    def _has_default_hook(self, name):
+        return six.get_unbound_function(getattr(type(self), name)) is six.get_unbound_function(
+            getattr(BaseModelResource, name)
+        )
+
+    def _can_bulk_create_objs(self):
+        # Primary keys of created objects are required for serialization, related objects and post-processing
+        return (
+            self.use_bulk_create and self._has_default_hook('_save_obj') and not self.model._meta.parents and
+            getattr(connections[self.model._default_manager.db].features, 'can_return_ids_from_bulk_insert', False)
+        )
+
+    def _can_bulk_update_objs(self):
+        # Only bulk_update of Django queryset is used, methods of third party managers can have another signature
+        return (
+            self.use_bulk_update and self._has_default_hook('_save_obj') and not self.model._meta.parents and
+            hasattr(QuerySet, 'bulk_update')
+        )
+
+    def _bulk_update_objs(self, objs, forms):
+        changed_field_names = {field_name for form in forms for field_name in form.changed_data}
+        update_fields = [
+            field for field in self.model._meta.concrete_fields
+            if not field.primary_key and (field.name in changed_field_names or getattr(field, 'auto_now', False))
+        ]
+        for obj in objs:
+            for field in update_fields:
+                # Fields with auto_now are updated by pre_save, bulk update does not call it
+                if getattr(field, 'auto_now', False):
+                    field.pre_save(obj, False)
+        if update_fields:
+            self.model._default_manager.all().bulk_update(objs, [field.name for field in update_fields],
+                                                          batch_size=self.bulk_update_batch_size)
+
+    def _save_objs(self, objs, forms, change):
+        """
+        Objects are saved with bulk_create/bulk_update (model save method and signals are not called) if it is enabled,
+        database and Django support it and _save_obj is not overridden, otherwise objects are saved one by one
+        """
+        if not change and self._can_bulk_create_objs():
+            self.model._default_manager.bulk_create(objs, batch_size=self.bulk_create_batch_size)
+        elif change and self._can_bulk_update_objs():
+            self._bulk_update_objs(objs, forms)
+        else:
+            super(BaseModelResource, self)._save_objs(objs, forms, change)
+
+    def _get_unique_errors_in_bulk(self, objs):
+        errors = []
+        unique_values = set()
+        for obj in objs:
+            obj_errors = None
+            for model_class, unique_check in obj._get_unique_checks()[0]:
+                values = tuple(getattr(obj, obj._meta.get_field(field_name).attname) for field_name in unique_check)
+                if None in values:
+                    continue
+                key = (model_class, unique_check, values)
+                if key in unique_values:
+                    message = force_text(obj.unique_error_message(model_class, unique_check).messages[0])
+                    obj_errors = obj_errors or {}
+                    if len(unique_check) == 1:
+                        obj_errors[unique_check[0]] = message
+                    else:
+                        obj_errors.setdefault('non-field-errors', []).append(message)
+                else:
+                    unique_values.add(key)
+            errors.append(obj_errors)
+        return errors
+
+    def _get_valid_pks(self, pks):
+        valid_pks = []
+        for pk in pks:
+            try:
+                valid_pks.append(self.model._meta.pk.to_python(pk))
+            except ValidationError:
+                pass
+        return valid_pks
+
+    def _get_pk_key(self, pk):
+        try:
+            return force_text(self.model._meta.pk.to_python(pk))
+        except ValidationError:
+            return None
+
+    def _get_objs_in_bulk(self, pks):
+        return {force_text(obj.pk): obj for obj in self._get_queryset().filter(pk__in=self._get_valid_pks(pks))}
+
+    def _resolve_objs_in_bulk(self, pks):
+        """
+        Returns tuple with dict of objects visible in the resource queryset and set of primary keys of objects which
+        exist but are not visible. Objects are loaded from the resource queryset, existence of the missing objects is
+        checked with the second query only if the resource queryset is filtered.
+        """
+        valid_pks = self._get_valid_pks(pks)
+        if not valid_pks:
+            return {}, set()
+
+        qs = self._get_queryset()
+        visible_objs = {force_text(obj.pk): obj for obj in qs.filter(pk__in=valid_pks)}
+        missing_pks = [pk for pk in valid_pks if force_text(pk) not in visible_objs]
+        if not missing_pks or not qs.query.has_filters():
+            return visible_objs, set()
+
+        hidden_pks = {
+            force_text(pk) for pk in self.model._default_manager.filter(pk__in=missing_pks).values_list('pk', flat=True)
+        }
+        return visible_objs, hidden_pks
+
+    def _get_instance_getter(self, data_list):
+        pks = [data.get(self.pk_field_name) for data in data_list if isinstance(data, dict)]
+        visible_objs, hidden_pks = self._resolve_objs_in_bulk([pk for pk in pks if pk])
+
+        def get_instance(data):
+            pk = data.get(self.pk_field_name)
+            if not pk:
+                return None
+            elif self._get_pk_key(pk) in hidden_pks:
+                raise ConflictException
+            else:
+                return visible_objs.get(self._get_pk_key(pk))
+        return get_instance
+
+    def _delete_objs(self, objs):
+        """
+        Objects are removed with one queryset delete if it is enabled and _delete_obj is not overridden
+        """
+        if self.use_queryset_delete and self._has_default_hook('_delete_obj'):
+            self.model._default_manager.filter(pk__in=[obj.pk for obj in objs]).delete()
+        else:
+            super(BaseModelResource, self)._delete_objs(objs)
 
     def _get_exclude(self, obj=None):
         return []
@@ -814,22 +1636,27 @@ class BaseModelResource(DefaultRESTModelResource, BaseObjectResource):
 
     def _get_instance(self, data):
         # If data contains id this method is update otherwise create
-        inst = None
         pk = data.get(self.pk_field_name)
         if pk:
-            try:
-                try:
-                    inst = self._get_queryset().get(pk=pk)
-                except (ObjectDoesNotExist, ValueError):
-                    if self.model.objects.filter(pk=pk).exists():
-                        raise ConflictException
-            except ValueError:
-                pass
-        return inst
+            visible_objs, hidden_pks = self._resolve_objs_in_bulk([pk])
+            if self._get_pk_key(pk) in hidden_pks:
+                raise ConflictException
+            return visible_objs.get(self._get_pk_key(pk))
+        return None
 
     def _get_form_fields(self, obj=None):
         return None
 
+    def _get_generated_form_class_key(self, inst, form_class, exclude, fields):
+        """
+        Returns key of the generated form class cache. Generated form class depends on the object only through form
+        class, exclude and fields by default. Resource which generates form class according to the object in another
+        way should return key which contains this dependency or None if form class should not be cached.
+        """
+        return (
+            type(self), self.model, form_class, tuple(exclude), tuple(fields) if fields is not None else None
+        )
+
     def _generate_form_class(self, inst, exclude=None):
         exclude = [] if exclude is None else exclude
         exclude = list(self._get_exclude(inst)) + exclude
@@ -837,4 +1664,11 @@ class BaseModelResource(DefaultRESTModelResource, BaseObjectResource):
         fields = self._get_form_fields(inst)
         if hasattr(form_class, '_meta') and form_class._meta.exclude:
             exclude.extend(form_class._meta.exclude)
-        return modelform_factory(self.model, form=form_class, exclude=exclude, fields=fields)
+
+        key = self._get_generated_form_class_key(inst, form_class, exclude, fields)
+        generated_form_class = generated_form_classes.get(key) if key is not None else None
+        if generated_form_class is None:
+            generated_form_class = modelform_factory(self.model, form=form_class, exclude=exclude, fields=fields)
+            if key is not None:
+                generated_form_class = generated_form_classes.setdefault(key, generated_form_class)
+        return generated_form_class
@@ -57,3 +57,10 @@ class RESTErrorResponse(NoFieldsetResponse):
         http_headers = {} if http_headers is None else http_headers
         super(RESTErrorResponse, self).__init__(result={'messages': {'error': msg}}, http_headers=http_headers,
                                                 code=code)
+
+
+class RESTNotModifiedResponse(NoFieldsetResponse):
+
+    def __init__(self, http_headers=None, code=304):
+        http_headers = {} if http_headers is None else http_headers
+        super(RESTNotModifiedResponse, self).__init__(result='', http_headers=http_headers, code=code)
@@ -7,7 +7,7 @@ import inspect
 import six
 import mimetypes
 
-from collections import OrderedDict
+from collections import OrderedDict, namedtuple
 
 from django.db.models import Model
 from django.db.models.query import QuerySet
@@ -28,7 +28,7 @@ from chamber.utils.datastructures import Enum
 from chamber.utils import get_class_method
 
 from .exception import UnsupportedMediaTypeException
-from .utils import rfs
+from .utils import frfs
 from .utils.compatibility import get_reverse_field_name, get_last_parent_pk_field_name
 from .utils.helpers import QuerysetIteratorHelper, UniversalBytesIO, serialized_data_to_python
 from .converters import get_converter
@@ -120,6 +120,51 @@ class LazySerializedData(object):
         return self.serializer.serialize(self.data, self.serialization_format, **self.kwargs)
 
 
+SerializedFragment = namedtuple('SerializedFragment', ('data', 'obj_names', 'chain_obj_names'))
+
+
+class SerializationMemo(object):
+    """
+    Request scoped memo of serialized objects. Objects which are already in the serialization chain are serialized only
+    with primary key, therefore serialized fragment can be reused only if all objects serialized inside the fragment
+    have the same presence in the current chain.
+    """
+
+    def __init__(self):
+        self.fragments = {}
+        self.recorders = []
+
+    def record(self, obj_names):
+        for recorder in self.recorders:
+            recorder.update(obj_names)
+
+    def record_serialization(self, serialize):
+        recorder = set()
+        self.recorders.append(recorder)
+        try:
+            return serialize(), frozenset(recorder)
+        finally:
+            self.recorders.pop()
+
+    def get_valid_fragment(self, fragment, serialized_objects):
+        if fragment is not None and serialized_objects & fragment.obj_names == fragment.chain_obj_names:
+            self.record(fragment.obj_names)
+            return fragment
+        else:
+            return None
+
+    def get(self, key, serialized_objects):
+        for fragment in self.fragments.get(key, ()):
+            if self.get_valid_fragment(fragment, serialized_objects) is not None:
+                return fragment
+        return None
+
+    def set(self, key, fragment):
+        fragments = self.fragments.setdefault(key, [])
+        if fragment not in fragments:
+            fragments.append(fragment)
+
+
 class Serializer(object):
     """
     REST serializer and deserializer, firstly is data serialized to standard python data types and after that is
@@ -415,13 +460,13 @@ class ModelSerializer(Serializer):
             return model_resource.get_allowed_fields_rfs(obj)
 
     def _get_direct_serialization_fields(self, obj):
-        return rfs(obj._rest_meta.direct_serialization_fields).join(rfs(obj._rest_meta.default_fields))
+        return frfs(obj._rest_meta.direct_serialization_fields).join(obj._rest_meta.default_fields)
 
     def _get_fieldset(self, obj, extended_fieldset, requested_fieldset, exclude_fields, via, direct_serialization,
                       serialized_objects):
 
         if self._get_obj_serialization_name(obj) in serialized_objects:
-            return rfs((get_last_parent_pk_field_name(obj),))
+            return frfs((get_last_parent_pk_field_name(obj),))
 
         model_resource = self._get_model_resource(obj)
 
@@ -429,51 +474,182 @@ class ModelSerializer(Serializer):
             has_get_permission = (model_resource.has_get_permission(obj=obj, via=via) or
                                   model_resource.has_post_permission(obj=obj, via=via) or
                                   model_resource.has_put_permission(obj=obj, via=via))
-            default_fieldset = self._get_fieldset_from_resource(model_resource, obj, via, has_get_permission)
-            allowed_fieldset = self._get_allowed_fieldset_from_resource(model_resource, obj, via, has_get_permission)
+            default_fieldset = frfs(
+                self._get_fieldset_from_resource(model_resource, obj, via, has_get_permission)
+            )
+            allowed_fieldset = frfs(
+                self._get_allowed_fieldset_from_resource(model_resource, obj, via, has_get_permission)
+            )
         else:
-            direct_serialization_fields = self._get_direct_serialization_fields(obj)
-            allowed_fieldset = rfs(
-                requested_fieldset if requested_fieldset else (
-                    direct_serialization_fields if direct_serialization else obj._rest_meta.guest_fields
-                )
+            default_fieldset = (
+                self._get_direct_serialization_fields(obj) if direct_serialization
+                else frfs(obj._rest_meta.guest_fields)
             )
-            default_fieldset = rfs(direct_serialization_fields if direct_serialization else obj._rest_meta.guest_fields)
+            allowed_fieldset = frfs(requested_fieldset) if requested_fieldset else default_fieldset
 
+        # Fieldsets are immutable and interned, all following operations are memoized
         if extended_fieldset:
-            default_fieldset.join(extended_fieldset)
-            allowed_fieldset.join(extended_fieldset)
+            default_fieldset = default_fieldset.join(extended_fieldset)
+            allowed_fieldset = allowed_fieldset.join(extended_fieldset)
 
         if requested_fieldset:
-            # requested_fieldset must be cloned because RFS is not immutable and intersection change it
-            fieldset = rfs(requested_fieldset).intersection(allowed_fieldset)
+            fieldset = frfs(requested_fieldset).intersection(allowed_fieldset)
         else:
             fieldset = default_fieldset.intersection(allowed_fieldset)
 
         if exclude_fields:
-            fieldset.subtract(exclude_fields)
+            fieldset = fieldset.subtract(exclude_fields)
         return fieldset
 
     def _get_obj_serialization_name(self, obj):
         return '{}__{}'.format(obj._meta.db_table, obj.pk)
 
-    def _obj_to_python(self, obj, serialization_format, requested_fieldset=None, extended_fieldset=None,
-                       exclude_fields=None, allow_tags=False, direct_serialization=False,
-                       serialized_objects=None, **kwargs):
+    def _get_serialization_memo(self):
+        if self.request is None:
+            return None
+
+        memo = getattr(self.request, '_serialization_memo', None)
+        if memo is None:
+            memo = self.request._serialization_memo = SerializationMemo()
+        return memo
+
+    def _prepare_obj_serialization(self, obj, requested_fieldset=None, extended_fieldset=None, exclude_fields=None,
+                                   allow_tags=False, direct_serialization=False, serialized_objects=None, **kwargs):
         exclude_fields = [] if exclude_fields is None else exclude_fields
         serialized_objects = set() if serialized_objects is None else set(serialized_objects)
+        requested_fieldset = frfs(requested_fieldset) if requested_fieldset is not None else None
         fieldset = self._get_fieldset(obj, extended_fieldset, requested_fieldset, exclude_fields,
                                       kwargs.get('via'), direct_serialization, serialized_objects)
-        serialized_objects.add(self._get_obj_serialization_name(obj))
-        return self._fields_to_python(obj, serialization_format, fieldset, requested_fieldset,
-                                      serialized_objects=serialized_objects,
-                                      direct_serialization=direct_serialization, **kwargs)
+        obj_serialization_name = self._get_obj_serialization_name(obj)
+        memo = self._get_serialization_memo()
+        if memo is not None:
+            memo.record((obj_serialization_name,))
+        serialized_objects.add(obj_serialization_name)
+        kwargs.update({
+            'requested_fieldset': requested_fieldset,
+            'serialized_objects': serialized_objects,
+            'direct_serialization': direct_serialization,
+        })
+        return fieldset, kwargs
+
+    def _get_serialized_obj_cache(self, obj):
+        return getattr(self._get_model_resource(obj), 'serialized_obj_cache', None)
+
+    def _get_obj_serialization_state(self, fieldset, requested_fieldset=None, via=None, **kwargs):
+        """
+        Returns string that contains all input values (except serialization chain) which can change serialized data
+        of the object
+        """
+        return '{}|{}|{}'.format(
+            fieldset, requested_fieldset if requested_fieldset is not None else '',
+            ','.join(resource.__class__.__name__ for resource in via or ())
+        )
+
+    def _get_serialized_obj_cache_key(self, obj_cache, obj, fieldset, serialization_format, fields_kwargs):
+        return obj_cache.get_key(
+            self.request, obj, self._get_obj_serialization_state(fieldset, **fields_kwargs), serialization_format
+        )
+
+    def _get_obj_memo_key(self, obj, fieldset, serialization_format, fields_kwargs):
+        return (self._get_obj_serialization_name(obj), serialization_format,
+                self._get_obj_serialization_state(fieldset, **fields_kwargs))
+
+    def _fields_to_python_fragment(self, memo, obj, serialization_format, fieldset, **kwargs):
+        # Fragment must contain only python data types, lazy values are therefore serialized immediately
+        data, obj_names = memo.record_serialization(
+            lambda: serialized_data_to_python(self._fields_to_python(obj, serialization_format, fieldset, **kwargs))
+        )
+        return SerializedFragment(data, obj_names, frozenset(kwargs['serialized_objects'] & obj_names))
+
+    def _obj_to_python(self, obj, serialization_format, serialized_objects=None, **kwargs):
+        # Only related objects are memoized, objects on the top level are not repeated inside one response
+        is_related_obj = bool(serialized_objects)
+        fieldset, fields_kwargs = self._prepare_obj_serialization(obj, serialized_objects=serialized_objects,
+                                                                  **kwargs)
+        memo = self._get_serialization_memo()
+        if memo is None:
+            return self._fields_to_python(obj, serialization_format, fieldset, **fields_kwargs)
+
+        obj_cache = self._get_serialized_obj_cache(obj)
+        cache_key = (
+            self._get_serialized_obj_cache_key(obj_cache, obj, fieldset, serialization_format, fields_kwargs)
+            if obj_cache else None
+        )
+        memo_key = (
+            self._get_obj_memo_key(obj, fieldset, serialization_format, fields_kwargs) if is_related_obj else None
+        )
+        if cache_key is None and memo_key is None:
+            return self._fields_to_python(obj, serialization_format, fieldset, **fields_kwargs)
+
+        fragment = memo.get(memo_key, fields_kwargs['serialized_objects']) if memo_key else None
+        if fragment is None and cache_key is not None:
+            fragment = memo.get_valid_fragment(
+                obj_cache.get_many([cache_key]).get(cache_key), fields_kwargs['serialized_objects']
+            )
+            if fragment is None:
+                fragment = self._fields_to_python_fragment(memo, obj, serialization_format, fieldset, **fields_kwargs)
+                obj_cache.set_many({cache_key: fragment})
+        elif fragment is None:
+            fragment = self._fields_to_python_fragment(memo, obj, serialization_format, fieldset, **fields_kwargs)
+
+        if memo_key:
+            memo.set(memo_key, fragment)
+        return fragment.data
+
+    def _cached_objs_batch_to_python(self, obj_cache, objs, serialization_format, **kwargs):
+        memo = self._get_serialization_memo()
+        prepared_objs = []
+        for obj in objs:
+            fieldset, fields_kwargs = self._prepare_obj_serialization(obj, **kwargs)
+            key = self._get_serialized_obj_cache_key(obj_cache, obj, fieldset, serialization_format, fields_kwargs)
+            prepared_objs.append((obj, fieldset, fields_kwargs, key))
+
+        cached_fragments = obj_cache.get_many([key for _, _, _, key in prepared_objs if key is not None])
+        missing_fragments = {}
+        result = []
+        for obj, fieldset, fields_kwargs, key in prepared_objs:
+            fragment = (
+                memo.get_valid_fragment(cached_fragments.get(key), fields_kwargs['serialized_objects'])
+                if key is not None else None
+            )
+            if key is None:
+                result.append(self._fields_to_python(obj, serialization_format, fieldset, **fields_kwargs))
+            elif fragment is not None:
+                result.append(fragment.data)
+            else:
+                fragment = self._fields_to_python_fragment(memo, obj, serialization_format, fieldset, **fields_kwargs)
+                missing_fragments[key] = fragment
+                result.append(fragment.data)
+
+        if missing_fragments:
+            obj_cache.set_many(missing_fragments)
+        return result
+
+    def _cached_objs_to_python(self, obj_cache, objs, serialization_format, **kwargs):
+        batch = []
+        for obj in objs:
+            batch.append(obj)
+            if len(batch) >= obj_cache.batch_size:
+                for data in self._cached_objs_batch_to_python(obj_cache, batch, serialization_format, **kwargs):
+                    yield data
+                batch = []
+
+        for data in self._cached_objs_batch_to_python(obj_cache, batch, serialization_format, **kwargs):
+            yield data
+
+    def _objs_to_python(self, objs, model, serialization_format, **kwargs):
+        obj_cache = self._get_serialized_obj_cache(model)
+        if obj_cache and self._get_serialization_memo() is not None:
+            return self._cached_objs_to_python(obj_cache, objs, serialization_format, **kwargs)
+        else:
+            return (self._obj_to_python(obj, serialization_format, **kwargs) for obj in objs)
 
     def serialize(self, data, serialization_format, **kwargs):
-        if isinstance(data, QuerysetIteratorHelper):
-            return (self._obj_to_python(obj, serialization_format, **kwargs) for obj in data.iterator())
-        elif isinstance(data, QuerySet):
-            return (self._obj_to_python(obj, serialization_format, **kwargs) for obj in data)
+        if isinstance(data, (QuerysetIteratorHelper, QuerySet)):
+            return self._objs_to_python(
+                data.iterator() if isinstance(data, QuerysetIteratorHelper) else data, data.model,
+                serialization_format, **kwargs
+            )
         elif isinstance(data, Model):
             return self._obj_to_python(data, serialization_format, **kwargs)
         else:
@@ -497,7 +673,7 @@ def serialize(data, requested_fieldset=None, serialization_format=Serializer.SER
     from pyston.converters import get_default_converter_name
 
     converter_name = converter_name if converter_name is not None else get_default_converter_name()
-    requested_fieldset = rfs(requested_fieldset) if requested_fieldset is not None else None
+    requested_fieldset = frfs(requested_fieldset) if requested_fieldset is not None else None
     converted_dict = get_serializer(data).serialize(
         data, serialization_format, requested_fieldset=requested_fieldset, direct_serialization=True
     )
@@ -1,11 +1,15 @@
 from __future__ import unicode_literals
 
 import re
+import threading
+import warnings
 
 import six
 
 from collections import OrderedDict
 
+from six.moves.urllib.parse import urlparse
+
 from django.http import HttpResponse
 from django.utils.translation import ugettext_lazy as _
 from django.template.defaultfilters import lower
@@ -14,6 +18,11 @@ from django.utils.encoding import force_text
 
 from copy import deepcopy
 
+try:
+    from functools import lru_cache
+except ImportError:
+    from django.utils.lru_cache import lru_cache
+
 from chamber.utils.decorators import classproperty
 
 from pyston.utils.compatibility import is_related_descriptor, get_model_from_relation_or_none
@@ -155,6 +164,99 @@ def set_rest_context_to_request(request, mapping):
     request._rest_context = context
 
 
+def parse_etags(etags_string):
+    """
+    Returns list of quoted entity tags from If-None-Match header value, weak tags are compared as strong
+    """
+    etags = []
+    for etag in etags_string.split(','):
+        etag = etag.strip()
+        if etag.startswith('W/'):
+            etag = etag[2:]
+        if etag:
+            etags.append(etag)
+    return etags
+
+
+class LRUCache(object):
+    """
+    Thread safe dictionary limited to max_size items, the least recently used item is removed when it is full.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            try:
+                value = self._data.pop(key)
+            except KeyError:
+                return default
+            self._data[key] = value
+            return value
+
+    def setdefault(self, key, value):
+        """
+        Stores value to the cache if the key is not cached yet and returns the cached value.
+        """
+        with self._lock:
+            if key in self._data:
+                value = self._data.pop(key)
+            while len(self._data) >= self.max_size:
+                self._data.popitem(last=False)
+            self._data[key] = value
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __len__(self):
+        return len(self._data)
+
+
+CORS_ORIGINS_CACHE_SIZE = 1000
+
+
+class CorsOriginsWhitelist(object):
+    """
+    CORS origins whitelist with precompiled patterns. Origin is allowed if its host is in the whitelist or if it
+    matches one of the whitelist patterns, decisions are cached per origin. Entries which are not valid regular
+    expressions are used only as hosts.
+    """
+
+    def __init__(self, whitelist):
+        self.hosts = frozenset(whitelist)
+        self.patterns = self._compile_patterns(whitelist)
+        self.is_allowed = lru_cache(maxsize=CORS_ORIGINS_CACHE_SIZE)(self._is_allowed)
+
+    def _compile_patterns(self, whitelist):
+        patterns = []
+        for domain_pattern in whitelist:
+            try:
+                patterns.append(re.compile(domain_pattern))
+            except re.error:
+                warnings.warn('CORS whitelist entry {} is not a valid regular expression, '
+                              'it is used only as a host.'.format(domain_pattern))
+        return tuple(patterns)
+
+    def match_pattern(self, origin):
+        return any(pattern.match(origin) for pattern in self.patterns)
+
+    def _is_allowed(self, origin):
+        return bool(origin) and (urlparse(origin).netloc in self.hosts or self.match_pattern(origin))
+
+
+@lru_cache(maxsize=100)
+def get_cors_origins_whitelist(whitelist):
+    return CorsOriginsWhitelist(whitelist)
+
+
 def is_match(regex, text):
     pattern = re.compile(regex)
     return pattern.search(text) is not None
@@ -164,32 +266,51 @@ def get_model_from_descriptor(model, field_name):
     return get_model_from_relation_or_none(model, field_name) if model else None
 
 
-def split_fields(fields_string):
-
-    brackets = 0
+FIELDS_SEPARATORS_RE = re.compile(r'[(),]')
+SUBFIELDS_RE = re.compile(r'^[^\(\)]+\(.+\)$')
+FIELDS_STRING_CACHE_SIZE = 1000
 
-    field = ''
-    for char in fields_string:
-        if char == ',' and not brackets:
-            field = field.strip()
-            if field:
-                yield field
-            field = ''
-            continue
 
+def split_fields(fields_string):
+    brackets = 0
+    start = 0
+    for separator in FIELDS_SEPARATORS_RE.finditer(fields_string):
+        char = separator.group()
         if char == '(':
             brackets += 1
-
-        if char == ')':
+        elif char == ')':
             brackets -= 1
+        elif not brackets:
+            field = fields_string[start:separator.start()].strip()
+            if field:
+                yield field
+            start = separator.end()
 
-        field += char
-
-    field = field.strip()
+    field = fields_string[start:].strip()
     if field:
         yield field
 
 
+def _parse_field(field):
+    if SUBFIELDS_RE.match(field):
+        field_name, subfields_string = field[:len(field) - 1].split('(', 1)
+    else:
+        field_name, subfields_string = field, None
+
+    if '__' in field_name:
+        field_name, subfields_string = field.split('__', 1)
+    return field_name, parse_fields_string(subfields_string) if subfields_string else None
+
+
+@lru_cache(maxsize=FIELDS_STRING_CACHE_SIZE)
+def parse_fields_string(fields_string):
+    """
+    Parses fields string (e.g. "a,b(c,d__e)") to the tuple of pairs (field name, parsed subfields or None). Results
+    are cached because the same fields strings are parsed again with every request.
+    """
+    return tuple(_parse_field(field) for field in split_fields(fields_string))
+
+
 class RESTField(object):
 
     def __init__(self, name, subfieldset=None):
@@ -210,6 +331,9 @@ class RESTField(object):
         self.subfieldset = self.subfieldset.intersection(rest_field.subfieldset)
         return self
 
+    def freeze(self):
+        return FrozenRESTField(self.name, self.subfieldset.freeze())
+
     def __str__(self):
         if self.subfieldset:
             return '{}({})'.format(self.name, self.subfieldset)
@@ -219,24 +343,15 @@ class RESTField(object):
 class RESTFieldset(object):
 
     @classmethod
-    def create_from_string(cls, fields_string):
-        fields = []
-        for field in split_fields(fields_string):
-            if is_match('^[^\(\)]+\(.+\)$', field):
-                field_name, subfields_string = field[:len(field) - 1].split('(', 1)
-                if '__' in field_name:
-                    field_name, subfields_string = field.split('__', 1)
+    def _create_from_parsed_fields(cls, parsed_fields):
+        return RESTFieldset(*(
+            RESTField(field_name, cls._create_from_parsed_fields(parsed_subfields) if parsed_subfields else None)
+            for field_name, parsed_subfields in parsed_fields
+        ))
 
-                subfieldset = RFS.create_from_string(subfields_string)
-            else:
-                field_name = field
-                subfieldset = None
-                if '__' in field_name:
-                    field_name, subfields_string = field.split('__', 1)
-                    subfieldset = RFS.create_from_string(subfields_string)
-
-            fields.append(RESTField(field_name, subfieldset))
-        return RESTFieldset(*fields)
+    @classmethod
+    def create_from_string(cls, fields_string):
+        return cls._create_from_parsed_fields(parse_fields_string(fields_string))
 
     @classmethod
     def _create_field_from_list(cls, field):
@@ -256,6 +371,8 @@ class RESTFieldset(object):
     def create_from_list(cls, fields_list=None):
         if isinstance(fields_list, RESTFieldset):
             return deepcopy(fields_list)
+        elif isinstance(fields_list, FrozenRESTFieldset):
+            return fields_list.thaw()
 
         fields = []
         for field in fields_list or ():
@@ -280,7 +397,7 @@ class RESTFieldset(object):
         return self.fields_map.values()
 
     def join(self, rest_fieldset):
-        if isinstance(rest_fieldset, (list, tuple, set)):
+        if isinstance(rest_fieldset, (list, tuple, set, FrozenRESTFieldset)):
             rest_fieldset = self.create_from_list(rest_fieldset)
 
         assert isinstance(rest_fieldset, RESTFieldset)
@@ -294,6 +411,9 @@ class RESTFieldset(object):
         return self
 
     def intersection(self, rest_fieldset):
+        if isinstance(rest_fieldset, FrozenRESTFieldset):
+            rest_fieldset = rest_fieldset.thaw()
+
         assert isinstance(rest_fieldset, RESTFieldset)
 
         fields_map = self.fields_map
@@ -308,6 +428,8 @@ class RESTFieldset(object):
     def subtract(self, rest_fieldset):
         if isinstance(rest_fieldset, (list, tuple, set)):
             rest_fieldset = RFS(*rest_fieldset)
+        elif isinstance(rest_fieldset, FrozenRESTFieldset):
+            rest_fieldset = rest_fieldset.thaw()
 
         assert isinstance(rest_fieldset, RESTFieldset)
 
@@ -340,6 +462,8 @@ class RESTFieldset(object):
     def append(self, field):
         if isinstance(field, RESTField):
             rest_field = field
+        elif isinstance(field, FrozenRESTField):
+            rest_field = field.thaw()
         elif isinstance(field, six.string_types):
             rest_field = self._create_field_from_string(field)
         elif isinstance(field, (list, tuple)):
@@ -354,7 +478,7 @@ class RESTFieldset(object):
         return self
 
     def update(self, rest_fieldset):
-        if isinstance(rest_fieldset, (list, tuple, set)):
+        if isinstance(rest_fieldset, (list, tuple, set, FrozenRESTFieldset)):
             rest_fieldset = self.create_from_list(rest_fieldset)
 
         assert isinstance(rest_fieldset, RESTFieldset)
@@ -371,7 +495,207 @@ class RESTFieldset(object):
     def flat(self):
         return set(self.fields_map.keys())
 
+    def freeze(self):
+        return FrozenRESTFieldset.intern(rf.freeze() for rf in self.fields)
+
+
+class FrozenRESTField(object):
+    """
+    Immutable version of RESTField
+    """
+
+    __slots__ = ('name', 'subfieldset', '_hash')
+
+    def __init__(self, name, subfieldset):
+        object.__setattr__(self, 'name', name)
+        object.__setattr__(self, 'subfieldset', subfieldset)
+        object.__setattr__(self, '_hash', hash((name, subfieldset)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenRESTField is immutable')
+
+    def __reduce__(self):
+        return self.__class__, (self.name, self.subfieldset)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return self is other or (
+            isinstance(other, FrozenRESTField) and self._hash == other._hash and self.name == other.name and
+            self.subfieldset == other.subfieldset
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def join(self, rest_field):
+        return self.__class__(self.name, self.subfieldset.join(rest_field.subfieldset))
+
+    def intersection(self, rest_field):
+        return self.__class__(self.name, self.subfieldset.intersection(rest_field.subfieldset))
+
+    def freeze(self):
+        return self
+
+    def thaw(self):
+        return RESTField(self.name, self.subfieldset.thaw())
+
+    def __str__(self):
+        if self.subfieldset:
+            return '{}({})'.format(self.name, self.subfieldset)
+        return force_text(self.name)
+
+
+class FrozenRESTFieldset(object):
+    """
+    Immutable version of RESTFieldset. Instances are interned (structurally equal fieldsets are represented with the
+    same object) therefore results of join, intersection and subtract are memoized.
+    """
+
+    __slots__ = ('fields', 'fields_map', '_hash', '_str', '_flat')
+
+    MAX_CACHE_SIZE = 10000
+
+    _interned = LRUCache(MAX_CACHE_SIZE)
+    _lists_cache = LRUCache(MAX_CACHE_SIZE)
+    _operations_cache = LRUCache(MAX_CACHE_SIZE)
+
+    @classmethod
+    def intern(cls, fields):
+        """
+        Returns fieldset with the fields, fields must have unique names
+        """
+        fields = tuple(fields)
+        fieldset = cls._interned.get(fields)
+        if fieldset is None:
+            fieldset = cls._interned.setdefault(fields, cls(fields))
+        return fieldset
+
+    @classmethod
+    @lru_cache(maxsize=FIELDS_STRING_CACHE_SIZE)
+    def create_from_string(cls, fields_string):
+        return RESTFieldset.create_from_string(fields_string).freeze()
+
+    @classmethod
+    def create_from_list(cls, fields_list=None):
+        if isinstance(fields_list, FrozenRESTFieldset):
+            return fields_list
+        elif isinstance(fields_list, RESTFieldset):
+            return fields_list.freeze()
+
+        try:
+            key = tuple(fields_list or ())
+            fieldset = cls._lists_cache.get(key)
+        except TypeError:
+            # Unhashable list (contains lists) cannot be cached
+            return RESTFieldset.create_from_list(fields_list).freeze()
+
+        if fieldset is None:
+            fieldset = cls._lists_cache.setdefault(key, RESTFieldset.create_from_list(fields_list).freeze())
+        return fieldset
+
+    def __init__(self, fields):
+        object.__setattr__(self, 'fields', fields)
+        object.__setattr__(self, 'fields_map', OrderedDict((rf.name, rf) for rf in fields))
+        object.__setattr__(self, '_hash', hash(fields))
+        object.__setattr__(self, '_str', ','.join(map(force_text, fields)))
+        object.__setattr__(self, '_flat', frozenset(self.fields_map.keys()))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('FrozenRESTFieldset is immutable')
+
+    def __reduce__(self):
+        return _intern_frozen_rest_fieldset, (self.fields,)
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        return self is other or (
+            isinstance(other, FrozenRESTFieldset) and self._hash == other._hash and self.fields == other.fields
+        )
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __deepcopy__(self, memo):
+        return self
+
+    def _get_operation_result(self, operation, operand, fn):
+        key = (operation, self, operand)
+        result = self._operations_cache.get(key)
+        if result is None:
+            result = self._operations_cache.setdefault(key, fn(operand))
+        return result
+
+    def _join(self, rest_fieldset):
+        if not rest_fieldset or rest_fieldset is self:
+            return self
+
+        fields_map = OrderedDict(self.fields_map)
+        for rf in rest_fieldset.fields:
+            fields_map[rf.name] = fields_map[rf.name].join(rf) if rf.name in fields_map else rf
+        return self.intern(fields_map.values())
+
+    def _intersection(self, rest_fieldset):
+        return self.intern(
+            rf.intersection(rest_fieldset.fields_map[name]) for name, rf in self.fields_map.items()
+            if name in rest_fieldset.fields_map
+        )
+
+    def _subtract(self, field_names):
+        return self.intern(rf for name, rf in self.fields_map.items() if name not in field_names)
+
+    def join(self, rest_fieldset):
+        return self._get_operation_result('join', self.create_from_list(rest_fieldset), self._join)
+
+    def intersection(self, rest_fieldset):
+        return self._get_operation_result('intersection', self.create_from_list(rest_fieldset), self._intersection)
+
+    def subtract(self, rest_fieldset):
+        if isinstance(rest_fieldset, (RESTFieldset, FrozenRESTFieldset)):
+            field_names = frozenset(rest_fieldset.flat())
+        else:
+            field_names = frozenset(rest_fieldset)
+        return self._get_operation_result('subtract', field_names, self._subtract)
+
+    def __add__(self, rest_fieldset):
+        return self.join(rest_fieldset)
+
+    def __str__(self):
+        return self._str
+
+    def __bool__(self):
+        return bool(self.fields)
+    __nonzero__ = __bool__
+
+    def get(self, key):
+        return self.fields_map.get(key)
+
+    def flat(self):
+        return self._flat
+
+    def freeze(self):
+        return self
+
+    def thaw(self):
+        return RESTFieldset(*(rf.thaw() for rf in self.fields))
+
+
+def _intern_frozen_rest_fieldset(fields):
+    """
+    Reconstructs unpickled FrozenRESTFieldset, module level function is used because bound classmethods cannot be
+    pickled with python 2.
+    """
+    return FrozenRESTFieldset.intern(fields)
+
 
 RF = RESTField
 RFS = RESTFieldset
 rfs = RFS.create_from_list
+FRFS = FrozenRESTFieldset
+frfs = FRFS.create_from_list
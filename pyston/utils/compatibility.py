@@ -6,33 +6,139 @@ import django
 from django.template import Context
 from django.template.loader import get_template
 from django.core.exceptions import FieldError
+from django.db.models.signals import class_prepared
 
 try:
     from django.core.exceptions import FieldDoesNotExist
 except ImportError:
     from django.db.models import FieldDoesNotExist
 
+try:
+    from django.core.exceptions import EmptyResultSet
+except ImportError:
+    from django.db.models.sql.datastructures import EmptyResultSet
 
-def get_field_or_none(model, field_name):
+
+IS_DJANGO_1_9_OR_HIGHER = StrictVersion(django.get_version()) >= StrictVersion('1.9')
+
+
+class ModelFieldInfo(object):
+    """
+    Relation metadata of the model field computed only once
+    """
+
+    __slots__ = ('field', 'is_many_to_one', 'is_one_to_one', 'is_many_to_many', 'is_reverse_many_to_one',
+                 'is_reverse_one_to_one', 'is_reverse_many_to_many', 'is_relation', 'related_model',
+                 'reverse_field_name')
+
+    def __init__(self, field):
+        self.field = field
+        self.is_many_to_one = bool(not field.auto_created and field.many_to_one)
+        self.is_one_to_one = bool(not field.auto_created and field.one_to_one)
+        self.is_many_to_many = bool(not field.auto_created and field.many_to_many)
+        self.is_reverse_many_to_one = bool(field.auto_created and field.one_to_many)
+        self.is_reverse_one_to_one = bool(field.auto_created and field.one_to_one)
+        self.is_reverse_many_to_many = bool(field.auto_created and field.many_to_many)
+        self.is_relation = (
+            self.is_many_to_one or self.is_one_to_one or self.is_many_to_many or self.is_reverse_many_to_one or
+            self.is_reverse_one_to_one or self.is_reverse_many_to_many
+        )
+        if not self.is_relation:
+            self.related_model = self.reverse_field_name = None
+        elif self.is_many_to_one or self.is_one_to_one or self.is_many_to_many:
+            self.related_model = field.related_model
+            self.reverse_field_name = field.related_query_name()
+        else:
+            # Reverse relation object, the relation field is defined on the related model
+            self.related_model = field.related_model
+            self.reverse_field_name = field.field.name if hasattr(field, 'field') else field.related_query_name()
+
+
+class ModelIndex(object):
+    """
+    Index of the model fields metadata. Field lookups are cached therefore model meta API is called only once per
+    field.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._field_infos = {}
+        self._concrete_fields = None
+        self._related_objects = None
+        self._related_objects_by_accessor_name = None
+
+    def get_field_info(self, field_name):
+        try:
+            return self._field_infos[field_name]
+        except KeyError:
+            try:
+                field_info = ModelFieldInfo(self.model._meta.get_field(field_name))
+            except FieldDoesNotExist:
+                field_info = None
+            self._field_infos[field_name] = field_info
+            return field_info
+
+    @property
+    def concrete_fields(self):
+        if self._concrete_fields is None:
+            self._concrete_fields = {
+                f.name: f for f in self.model._meta.get_fields()
+                if f.concrete and (not f.is_relation or f.one_to_one or (f.many_to_one and f.related_model))
+            }
+        return self._concrete_fields
+
+    @property
+    def related_objects(self):
+        if self._related_objects is None:
+            self._related_objects = self.model._meta.get_all_related_objects() if not IS_DJANGO_1_9_OR_HIGHER else [
+                f for f in self.model._meta.get_fields()
+                if (f.one_to_many or f.one_to_one) and f.auto_created and not f.concrete
+            ]
+        return self._related_objects
+
+    def get_related_object(self, accessor_name):
+        if self._related_objects_by_accessor_name is None:
+            self._related_objects_by_accessor_name = {
+                rel.get_accessor_name(): rel for rel in self.related_objects
+            }
+        return self._related_objects_by_accessor_name.get(accessor_name)
+
+
+model_indexes = {}
+
+
+def get_model_index(model):
     try:
-        return model._meta.get_field(field_name)
-    except FieldDoesNotExist:
-        return None
+        return model_indexes[model]
+    except KeyError:
+        return model_indexes.setdefault(model, ModelIndex(model))
+
+
+def clear_model_indexes(**kwargs):
+    """
+    New model can add reverse relations to the already indexed models therefore all indexes are dropped
+    """
+    model_indexes.clear()
+
+
+class_prepared.connect(clear_model_indexes)
+
+
+def get_field_info(model, field_name):
+    return get_model_index(model).get_field_info(field_name)
+
+
+def get_field_or_none(model, field_name):
+    field_info = get_field_info(model, field_name)
+    return field_info.field if field_info else None
 
 
 def get_all_related_objects_from_model(model):
-    return model._meta.get_all_related_objects() if StrictVersion(django.get_version()) < StrictVersion('1.9') else [
-        f for f in model._meta.get_fields()
-        if (f.one_to_many or f.one_to_one) and f.auto_created and not f.concrete
-    ]
+    return get_model_index(model).related_objects
 
 
 def get_concrete_field(model, field_name):
-    field = {f.name: f for f in model._meta.get_fields()
-        if f.concrete and (
-            not f.is_relation or f.one_to_one or (f.many_to_one and f.related_model)
-        )
-    }.get(field_name)
+    field = get_model_index(model).concrete_fields.get(field_name)
     if not field:
         raise FieldDoesNotExist
     else:
@@ -40,50 +146,47 @@ def get_concrete_field(model, field_name):
 
 
 def is_reverse_many_to_one(model, field_name):
-    field = get_field_or_none(model, field_name)
-    return field and field.auto_created and field.one_to_many
+    field_info = get_field_info(model, field_name)
+    return field_info is not None and field_info.is_reverse_many_to_one
 
 
 def is_reverse_one_to_one(model, field_name):
-    field = get_field_or_none(model, field_name)
-    return field and field.auto_created and field.one_to_one
+    field_info = get_field_info(model, field_name)
+    return field_info is not None and field_info.is_reverse_one_to_one
 
 
 def is_reverse_many_to_many(model, field_name):
-    field = get_field_or_none(model, field_name)
-    return field and field.auto_created and field.many_to_many
+    field_info = get_field_info(model, field_name)
+    return field_info is not None and field_info.is_reverse_many_to_many
 
 
 def is_many_to_one(model, field_name):
-    field = get_field_or_none(model, field_name)
-    return field and not field.auto_created and field.many_to_one
+    field_info = get_field_info(model, field_name)
+    return field_info is not None and field_info.is_many_to_one
 
 
 def is_one_to_one(model, field_name):
-    field = get_field_or_none(model, field_name)
-    return field and not field.auto_created and field.one_to_one
+    field_info = get_field_info(model, field_name)
+    return field_info is not None and field_info.is_one_to_one
 
 
 def is_many_to_many(model, field_name):
-    field = get_field_or_none(model, field_name)
-    return field and not field.auto_created and field.many_to_many
+    field_info = get_field_info(model, field_name)
+    return field_info is not None and field_info.is_many_to_many
 
 
 def is_relation(model, field_name):
-    return (
-        is_one_to_one(model, field_name) or is_many_to_one(model, field_name) or is_many_to_many(model, field_name) or
-        is_reverse_one_to_one(model, field_name) or is_reverse_many_to_one(model, field_name) or
-        is_reverse_many_to_many(model, field_name)
-    )
+    field_info = get_field_info(model, field_name)
+    return field_info is not None and field_info.is_relation
 
 
 def is_single_related_descriptor(model, field_name):
-    field = get_field_or_none(model, field_name)
-    return field and field.auto_created and field.one_to_one
+    return is_reverse_one_to_one(model, field_name)
 
 
 def is_multiple_related_descriptor(model, field_name):
-    return field and field.auto_created and (field.many_to_many or field.one_to_many)
+    field_info = get_field_info(model, field_name)
+    return field_info is not None and (field_info.is_reverse_many_to_many or field_info.is_reverse_many_to_one)
 
 
 def is_related_descriptor(model, field_name):
@@ -91,47 +194,26 @@ def is_related_descriptor(model, field_name):
 
 
 def get_model_from_relation(model, field_name):
-    if is_many_to_many(model, field_name) or is_one_to_one(model, field_name) or is_many_to_one(model, field_name):
-        return getattr(model, field_name).field.rel.to
-    elif StrictVersion(django.get_version()) >= StrictVersion('1.9') and is_reverse_many_to_many(model, field_name):
-        return getattr(model, field_name).field.model
-    elif StrictVersion(django.get_version()) >= StrictVersion('1.9') and is_reverse_many_to_one(model, field_name):
-        return getattr(model, field_name).field.model
-    elif (is_reverse_many_to_many(model, field_name) or is_reverse_one_to_one(model, field_name) or
-            is_reverse_many_to_one(model, field_name)):
-        return getattr(model, field_name).related.related_model
-    elif (is_reverse_many_to_many(model, field_name) or is_reverse_one_to_one(model, field_name) or
-            is_reverse_many_to_one(model, field_name)):
-        return getattr(model, field_name).related.model
-    else:
+    field_info = get_field_info(model, field_name)
+    if field_info is None or not field_info.is_relation:
         raise FieldError('field {} is not relation'.format(field_name))
+    return field_info.related_model
 
 
 def get_model_from_relation_or_none(model, field_name):
-    try:
-        return get_model_from_relation(model, field_name)
-    except FieldError:
-        return None
+    field_info = get_field_info(model, field_name)
+    return field_info.related_model if field_info is not None else None
 
 
 def get_reverse_field_name(model, field_name):
-    if is_many_to_many(model, field_name) or is_one_to_one(model, field_name) or is_many_to_one(model, field_name):
-        return getattr(model, field_name).field.related_query_name()
-    elif StrictVersion(django.get_version()) >= StrictVersion('1.9') and is_reverse_many_to_many(model, field_name):
-        return getattr(model, field_name).field.name
-    elif StrictVersion(django.get_version()) >= StrictVersion('1.9') and is_reverse_many_to_one(model, field_name):
-        return getattr(model, field_name).field.name
-    elif is_reverse_one_to_one(model, field_name):
-        return getattr(model, field_name).related.field.name
-    elif (is_reverse_many_to_many(model, field_name) or is_reverse_one_to_one(model, field_name) or
-            is_reverse_many_to_one(model, field_name)):
-        return getattr(model, field_name).related.field.name
-    else:
+    field_info = get_field_info(model, field_name)
+    if field_info is None or not field_info.is_relation:
         raise FieldError('field {} is not relation'.format(field_name))
+    return field_info.reverse_field_name
 
 
 def render_template(template_name, context):
-    if StrictVersion(django.get_version()) < StrictVersion('1.9'):
+    if not IS_DJANGO_1_9_OR_HIGHER:
         context = Context(context)
     return get_template(template_name).render(context)
 
@@ -7,30 +7,46 @@ from django.core.exceptions import ObjectDoesNotExist
 from django.template.defaultfilters import capfirst
 from django.forms.forms import pretty_name
 from django.utils.encoding import python_2_unicode_compatible
+from django.utils.translation import get_language
 
 from chamber.utils import get_class_method
 
 from collections import OrderedDict
 
-from pyston.utils import split_fields, is_match, get_model_from_descriptor
-from pyston.utils.compatibility import get_all_related_objects_from_model, get_concrete_field, get_model_from_relation
+from pyston.utils import parse_fields_string, get_model_from_descriptor
+from pyston.utils.compatibility import get_model_index, get_concrete_field, get_model_from_relation
 
 
 @python_2_unicode_compatible
 class Field(object):
+    """
+    Immutable exported field, string representation (header label) and hash are computed only once. Fields are
+    compared and hashed according to the header label.
+    """
+
+    __slots__ = ('key_path', 'label_path', '_str', '_hash')
 
     def __init__(self, key_path, label_path):
-        self.key_path = key_path
-        self.label_path = label_path
+        label = capfirst(' '.join(map(force_text, label_path))).strip()
+        object.__setattr__(self, 'key_path', tuple(key_path))
+        object.__setattr__(self, 'label_path', tuple(label_path))
+        object.__setattr__(self, '_str', label)
+        object.__setattr__(self, '_hash', hash(label))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('Field is immutable')
+
+    def __reduce__(self):
+        return Field, (self.key_path, self.label_path)
 
     def __str__(self):
-        return capfirst(' '.join(map(force_text, self.label_path))).strip()
+        return self._str
 
     def __hash__(self):
-        return hash('__'.join(self.key_path))
+        return self._hash
 
     def __eq__(self, other):
-        return self.__str__() == other.__str__()
+        return self._str == (other._str if isinstance(other, Field) else other.__str__())
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -38,6 +54,12 @@ class Field(object):
 
 class FieldsetGenerator(object):
 
+    MAX_CACHE_SIZE = 1000
+
+    # Labels and generated fields depend only on models, resources and language, they are cached between exports
+    labels_cache = {}
+    generated_fields_cache = {}
+
     def __init__(self, resource=None, fields_string=None):
         self.resource = resource
         self.fields_string = fields_string
@@ -50,14 +72,13 @@ class FieldsetGenerator(object):
             return resource_class
 
     def _get_field_label_from_model_related_objects(self, model, field_name):
-        for rel in get_all_related_objects_from_model(model):
-            reverse_name = rel.get_accessor_name()
-            if field_name == reverse_name:
-                model = get_model_from_relation(model, field_name)
-                if isinstance(rel.field, models.OneToOneField):
-                    return model._meta.verbose_name
-                else:
-                    return model._meta.verbose_name_plural
+        rel = get_model_index(model).get_related_object(field_name)
+        if rel is not None:
+            model = get_model_from_relation(model, field_name)
+            if isinstance(rel.field, models.OneToOneField):
+                return model._meta.verbose_name
+            else:
+                return model._meta.verbose_name_plural
         return None
 
     def _get_field_label_from_resource_or_model_method(self, resource_or_model, field_name):
@@ -83,40 +104,51 @@ class FieldsetGenerator(object):
 
             return self._get_field_label_from_model_related_objects(model, field_name) or pretty_name(field_name)
 
+    def _set_to_cache(self, cache, key, value):
+        if len(cache) >= self.MAX_CACHE_SIZE:
+            cache.clear()
+        cache[key] = value
+        return value
+
     def _get_label(self, field_name, model):
         if model:
-            return (
-                self._get_field_label_from_model(model, self._get_resource_class(model), field_name)
-                if field_name != '_obj_name' and field_name else ''
-            )
+            if field_name == '_obj_name' or not field_name:
+                return ''
+
+            resource_class = self._get_resource_class(model)
+            key = (self.__class__, model, resource_class, field_name, get_language())
+            try:
+                return self.labels_cache[key]
+            except KeyError:
+                return self._set_to_cache(
+                    self.labels_cache, key,
+                    force_text(self._get_field_label_from_model(model, resource_class, field_name))
+                )
         else:
             return field_name
 
-    def _recursive_generator(self, fields, fields_string, model=None, key_path=None, label_path=None):
+    def _recursive_generator(self, fields, parsed_fields, model=None, key_path=None, label_path=None):
         key_path = key_path or []
         label_path = label_path or []
 
-        if not fields_string:
+        if parsed_fields is None:
             fields.append(Field(key_path, label_path))
         else:
-            for field in split_fields(fields_string):
-                if is_match('^[^\(\)]+\(.+\)$', field):
-                    field_name, subfields_string = field[:len(field) - 1].split('(', 1)
-                else:
-                    field_name = field
-                    subfields_string = None
-
-                if '__' in field_name:
-                    field_name, subfields_string = field.split('__', 1)
-
-                self._recursive_generator(fields, subfields_string, get_model_from_descriptor(model, field_name),
+            for field_name, parsed_subfields in parsed_fields:
+                self._recursive_generator(fields, parsed_subfields, get_model_from_descriptor(model, field_name),
                                           key_path + [field_name],
                                           label_path + [self._get_label(field_name, model)])
 
     def generate(self):
-        fields = []
-        self._recursive_generator(fields, self.fields_string, getattr(self.resource, 'model', None))
-        return fields
+        key = (self.__class__, self.resource.__class__ if self.resource is not None else None, self.fields_string,
+               get_language())
+        fields = self.generated_fields_cache.get(key)
+        if fields is None:
+            fields = []
+            self._recursive_generator(fields, parse_fields_string(self.fields_string) if self.fields_string else None,
+                                      getattr(self.resource, 'model', None))
+            fields = self._set_to_cache(self.generated_fields_cache, key, tuple(fields))
+        return list(fields)
 
 
 class DataFieldset(object):
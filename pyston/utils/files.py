@@ -1,25 +1,248 @@
+import binascii
+import re
+import threading
+
 import requests
 
-from six import BytesIO
+import six
+
+from collections import OrderedDict
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+from tempfile import SpooledTemporaryFile
+
+from six.moves.urllib.parse import urlparse
 
 from django.core.exceptions import SuspiciousOperation
 
+from pyston.conf import settings as pyston_settings
+
+
+BASE64_CHUNK_SIZE = 64 * 1024  # must be multiple of 4
+WHITESPACE_RE = re.compile(r'\s+')
+URL_CHUNK_SIZE = 64 * 1024
+MAX_HOST_SEMAPHORES = 100
+
+_session = None
+_pool = None
+_host_semaphores = OrderedDict()
+_lock = threading.Lock()
+
 
 class RequestDataTooBig(SuspiciousOperation):
     pass
 
 
-def get_file_content_from_url(url, limit, timeout=1):
-    resp = requests.get(url, timeout=timeout, stream=True)
+class InvalidBase64Data(ValueError):
+    pass
 
-    content = BytesIO()
-    length = 0
 
-    for chunk in resp.iter_content(2048):
-        content.write(chunk)
-        length += len(chunk)
-        if length > limit:
-            resp.close()
+def create_spooled_file():
+    return SpooledTemporaryFile(max_size=pyston_settings.FILE_MAX_MEMORY_SIZE)
+
+
+class SizeLimitedFileWriter(object):
+    """
+    Writes chunks into spooled temporary file and raises RequestDataTooBig as soon as the limit is exceeded
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.file = create_spooled_file()
+        self.size = 0
+
+    def write(self, chunk):
+        self.size += len(chunk)
+        if self.limit is not None and self.size > self.limit:
+            self.file.close()
             raise RequestDataTooBig('Requested file is too big')
+        self.file.write(chunk)
+
+    def finish(self):
+        self.file.seek(0)
+        return self.file, self.size
+
+
+def get_session():
+    """
+    Returns process-wide requests session, connections to the file hosts are reused between downloads
+    """
+    global _session
+
+    if _session is None:
+        with _lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_maxsize=max(pyston_settings.FILE_URL_MAX_CONNECTIONS_PER_HOST,
+                                     pyston_settings.FILE_URL_FETCH_WORKERS)
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def get_pool():
+    """
+    Returns process-wide thread pool with FILE_URL_FETCH_WORKERS threads used for concurrent downloads
+    """
+    global _pool
+
+    if _pool is None:
+        with _lock:
+            if _pool is None:
+                _pool = ThreadPool(pyston_settings.FILE_URL_FETCH_WORKERS)
+    return _pool
+
+
+class HostSemaphore(object):
+    """
+    Semaphore which limits concurrent downloads from one host, number of its users is counted to not discard
+    semaphore that is in use
+    """
+
+    def __init__(self):
+        self.semaphore = threading.BoundedSemaphore(pyston_settings.FILE_URL_MAX_CONNECTIONS_PER_HOST)
+        self.users = 0
+
+
+def _discard_unused_host_semaphores():
+    """
+    Discards semaphores of the least recently used hosts if there is more than MAX_HOST_SEMAPHORES of them,
+    semaphores which are in use are kept
+    """
+    for host in [host for host, host_semaphore in _host_semaphores.items() if not host_semaphore.users]:
+        if len(_host_semaphores) < MAX_HOST_SEMAPHORES:
+            break
+        del _host_semaphores[host]
+
+
+@contextmanager
+def host_connection_limit(url):
+    """
+    Limits concurrent downloads from the URL host to FILE_URL_MAX_CONNECTIONS_PER_HOST
+    """
+    host = urlparse(url).netloc
+    with _lock:
+        host_semaphore = _host_semaphores.pop(host, None)
+        if host_semaphore is None:
+            _discard_unused_host_semaphores()
+            host_semaphore = HostSemaphore()
+        _host_semaphores[host] = host_semaphore
+        host_semaphore.users += 1
+    try:
+        with host_semaphore.semaphore:
+            yield
+    finally:
+        with _lock:
+            host_semaphore.users -= 1
+
+
+def get_file_content_from_url(url, limit, timeout=1):
+    """
+    Returns tuple of file object with the downloaded content and its size in bytes
+    """
+    with host_connection_limit(url):
+        resp = get_session().get(url, timeout=timeout, stream=True)
+        try:
+            writer = SizeLimitedFileWriter(limit)
+            for chunk in resp.iter_content(URL_CHUNK_SIZE):
+                writer.write(chunk)
+            return writer.finish()
+        finally:
+            resp.close()
+
+
+def _get_file_content_from_url_or_exception(args):
+    try:
+        return get_file_content_from_url(*args)
+    except Exception as ex:
+        return ex
+
+
+def get_files_content_from_urls(urls, limit, timeout=1):
+    """
+    Downloads files concurrently, returns dict where key is URL and value is tuple of file object and size or
+    exception raised during the download
+    """
+    urls = list(OrderedDict.fromkeys(urls))
+    args = [(url, limit, timeout) for url in urls]
+    if len(urls) > 1:
+        results = get_pool().map(_get_file_content_from_url_or_exception, args)
+    else:
+        results = list(map(_get_file_content_from_url_or_exception, args))
+    return dict(zip(urls, results))
+
+
+def is_url_file_item(data_item):
+    """
+    Returns True if data item is a file defined by URL (dict with filename and url without content)
+    """
+    return (
+        isinstance(data_item, dict) and {'filename', 'url'}.issubset(data_item.keys()) and 'content' not in data_item
+        and data_item['filename'] and data_item['url'] and isinstance(data_item['url'], six.string_types)
+    )
+
+
+def get_url_file_items(data, field_names=None):
+    """
+    Returns URLs of file items (dicts with filename and url) of the fields in the deserialized request data, data
+    can be an object or a list of objects. All fields are searched if field names are not set.
+    """
+    data_list = data if isinstance(data, (list, tuple)) else [data]
+    return [
+        obj_data[field_name]['url'] for obj_data in data_list if isinstance(obj_data, dict)
+        for field_name in (obj_data.keys() if field_names is None else field_names)
+        if is_url_file_item(obj_data.get(field_name))
+    ]
+
+
+def close_files_content(files_content):
+    """
+    Closes file objects of the downloaded files (result of get_files_content_from_urls)
+    """
+    for result in files_content.values():
+        if not isinstance(result, Exception):
+            result[0].close()
+
+
+def get_decoded_base64_size(content):
+    """
+    Returns size of the decoded base64 content without decoding it (whitespace characters are ignored)
+    """
+    length = len(content) - sum(content.count(char) for char in ' \t\r\n')
+    padding = 0
+    if content.rstrip().endswith('=='):
+        padding = 2
+    elif content.rstrip().endswith('='):
+        padding = 1
+    return length * 3 // 4 - padding
+
+
+def get_file_content_from_base64(content, limit):
+    """
+    Decodes base64 content incrementally to the spooled temporary file, returns tuple of file object and its size.
+    Content that cannot fit to the limit is rejected before decoding.
+    """
+    if not isinstance(content, six.string_types):
+        raise InvalidBase64Data('File content is not in base64 format')
+
+    if limit is not None and get_decoded_base64_size(content) > limit:
+        raise RequestDataTooBig('Requested file is too big')
 
-    return content
+    writer = SizeLimitedFileWriter(limit)
+    rest = ''
+    try:
+        for i in range(0, len(content), BASE64_CHUNK_SIZE):
+            chunk = rest + WHITESPACE_RE.sub('', content[i:i + BASE64_CHUNK_SIZE])
+            decode_length = len(chunk) - len(chunk) % 4
+            chunk, rest = chunk[:decode_length], chunk[decode_length:]
+            if chunk:
+                writer.write(binascii.a2b_base64(chunk.encode('ascii')))
+        if rest:
+            writer.write(binascii.a2b_base64(rest.encode('ascii')))
+    except (binascii.Error, TypeError, UnicodeError):
+        writer.file.close()
+        raise InvalidBase64Data('File content is not in base64 format')
+    return writer.finish()